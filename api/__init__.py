@@ -0,0 +1 @@
+# API HTTP sem interface gráfica sobre os mesmos módulos de nucleo/
@@ -0,0 +1,582 @@
+"""API HTTP assíncrona (tornado) para listagem, estatísticas, busca e relatórios.
+
+Usa os mesmos carregadores e caches de nucleo/ que as páginas do Streamlit e
+pode rodar em processos separados do aplicativo. Com `--processos N` o socket
+é aberto uma vez e compartilhado por N processos filhos.
+
+Uso:
+    python -m api.servidor [--porta 8600] [--endereco 127.0.0.1] [--processos 1] [--diretorio saidas] [--pre-gerar]
+
+A API não tem autenticação e as rotas de IA gastam a chave do Gemini, por
+isso ela só escuta em 127.0.0.1. Para aceitar conexões da rede, informe o
+endereço em `--endereco` (ex.: 0.0.0.0) e proteja o acesso na frente dela.
+
+Rotas:
+    GET  /api/saude
+    GET  /api/projetos
+    GET  /api/reunioes
+    GET  /api/reunioes/{nome}/estatisticas[?bins=10&metrica=falas]
+    GET  /api/reunioes/{nome}/transcricao[?pagina=1&tamanho=100]
+    GET  /api/reunioes/{nome}/intervalos?t=00:42:10 | ?inicio=30&fim=40  (horário ou minutos)
+    GET  /api/reunioes/{nome}/arquivos/{formato}  (html | excel; ETag, Last-Modified e Range)
+    GET  /api/transcricoes.zip  (todos os arquivos do diretório; ETag, Last-Modified e Range)
+    GET  /api/estatisticas
+    GET  /api/busca?q=termos[&reuniao=nome&limite=50]
+    GET  /api/termos[?reuniao=nome|locutor=nome&n=20]
+    GET  /api/termos/tendencia?termos=termo1,termo2
+    POST /api/reunioes/{nome}/relatorios/{tipo}
+    POST /api/reunioes/{nome}/relatorios  {"tipos": ["resumo", "ata", ...]}  (uma só chamada)
+    GET  /api/relatorios/uso
+    GET  /api/serie  (visão geral consolidada; incorpora as reuniões novas)
+    POST /api/chat  {"pergunta": "...", "contexto": "automatico" | "resumos" | "transcricoes",
+                     "roteador": true, "frasear": false}
+    GET  /api/roteador
+    GET  /api/acoes[?locutor=nome&status=aberta&reuniao=nome]
+    GET  /api/decisoes[?reuniao=nome]
+    POST /api/extracoes[?limite=N]
+    GET  /api/consultas
+    GET  /api/consultas/{nome}[?parametro=valor...]
+    POST /api/sql  {"sql": "SELECT ...", "parametros": {...}}
+
+Todas as rotas aceitam o projeto em `?projeto=nome` ou no cabeçalho
+`X-Projeto` (nucleo/projetos.py); sem projeto, vale o diretório do servidor.
+Os projetos são carregados no primeiro uso e os ociosos são descartados a cada
+INTERVALO_DESCARTE segundos.
+
+As rotas de IA usam a chave do cabeçalho `X-Chave-Api` ou da variável
+GEMINI_API_KEY (com SARA_LLM_FALSO=1 nenhuma chave é necessária). Os
+relatórios passam pelo cache de nucleo/pre_geracao.py; com `--pre-gerar` (ou
+SARA_PRE_GERACAO=1) as reuniões que chegam em saidas/ são verificadas a cada
+INTERVALO_PRE_GERACAO segundos e os tipos mais usados são pré-gerados com a
+chave de GEMINI_API_KEY.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import time
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+from tornado import httpserver, ioloop, netutil, process, web
+
+from nucleo.banco import CONSULTAS, consultar_sql, executar_consulta
+from nucleo.busca import busca_corpus
+from nucleo.dados import DIRETORIO_SAIDAS, carregar_falas
+from nucleo.estatisticas import COLUNAS_ESTATISTICAS, metricas_reuniao, resumo_corpus, resumo_por_locutor
+from nucleo.exportacao import obter_exportacao, obter_pacote_transcricoes
+from nucleo.extracao import STATUS_ACAO, consultar_acoes, consultar_decisoes, extrair_pendentes
+from nucleo.intervalos import indice_intervalos, interpretar_horario
+from nucleo.llm import MODELO_PADRAO, llm_falso_ativo, obter_genai
+from nucleo.participacao import METRICAS_PARTICIPACAO, participacao_por_bins
+from nucleo.pre_geracao import pre_geracao_ativa, pre_gerador
+from nucleo.projetos import PROJETO_PADRAO, gerenciador_projetos
+from nucleo.prompts import PROMPTS_RELATORIO, responder_pergunta
+from nucleo.repositorio import (
+    EXTENSOES, caminho_fonte, documentos_reunioes, listar_reunioes, textos_falas, texto_reuniao
+)
+from nucleo.roteador import ESTATISTICAS_ROTEADOR, frasear, rotear
+from nucleo.sentimento import serie_sentimento
+from nucleo.serie import pergunta_sobre_serie, resumo_serie
+from nucleo.termos import indice_termos
+from nucleo.turnos import turnos_reuniao
+
+PORTA_PADRAO = 8600
+
+# Só conexões locais, a menos que outro endereço seja pedido em --endereco
+ENDERECO_PADRAO = "127.0.0.1"
+TAMANHO_PAGINA = 100
+TAMANHO_PAGINA_MAXIMO = 1000
+LIMITE_BUSCA = 50
+
+# Intervalo (s) entre verificações de reuniões novas para a pré-geração
+INTERVALO_PRE_GERACAO = 60
+
+# Intervalo (s) entre verificações de projetos ociosos
+INTERVALO_DESCARTE = 60
+
+# Colunas de análise incluídas na transcrição quando existem na planilha
+COLUNAS_ANALISE = ['intencao_do_locutor', 'foco_da_fala', 'sentimento_tom']
+
+# Função para converter tipos do numpy/pandas ao serializar em JSON
+def _json_padrao(valor):
+    if isinstance(valor, np.integer):
+        return int(valor)
+    if isinstance(valor, np.floating):
+        return None if np.isnan(valor) else float(valor)
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if valor is pd.NA or valor is pd.NaT:
+        return None
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+# Função para converter um DataFrame indexado em lista de registros
+def _registros(df, nome_indice):
+    df = df.reset_index().rename(columns={df.index.name or "index": nome_indice})
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+class BaseHandler(web.RequestHandler):
+    def initialize(self, diretorio):
+        self.diretorio = diretorio
+
+    # Projeto da requisição (?projeto= ou X-Projeto); o padrão usa o diretório do servidor
+    def prepare(self):
+        nome = self.get_argument("projeto", None) or self.request.headers.get("X-Projeto")
+        if nome and nome != PROJETO_PADRAO:
+            try:
+                self.diretorio = gerenciador_projetos().obter(nome).diretorio
+            except (ValueError, FileNotFoundError) as e:
+                raise web.HTTPError(404, reason=str(e))
+
+    def set_default_headers(self):
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+
+    def responder(self, dados):
+        self.finish(json.dumps(dados, ensure_ascii=False, default=_json_padrao))
+
+    def write_error(self, status_code, **kwargs):
+        self.finish(json.dumps({"erro": self._reason, "status": status_code}, ensure_ascii=False))
+
+    # Executa o trabalho bloqueante (leitura de arquivos, pandas, LLM) fora do loop de eventos
+    async def em_thread(self, funcao, *args):
+        return await ioloop.IOLoop.current().run_in_executor(None, funcao, *args)
+
+    def argumento_inteiro(self, nome, padrao, minimo=1, maximo=None):
+        try:
+            valor = int(self.get_argument(nome, str(padrao)))
+        except ValueError:
+            raise web.HTTPError(400, reason=f"Parâmetro '{nome}' deve ser inteiro")
+        if valor < minimo or (maximo is not None and valor > maximo):
+            raise web.HTTPError(400, reason=f"Parâmetro '{nome}' fora do intervalo permitido")
+        return valor
+
+    def caminho_reuniao(self, nome):
+        artefatos = listar_reunioes(self.diretorio).get(nome)
+        if not artefatos:
+            raise web.HTTPError(404, reason=f"Reunião não encontrada: {nome}")
+        return caminho_fonte(artefatos)
+
+    def corpo_json(self):
+        try:
+            return json.loads(self.request.body or b"{}")
+        except ValueError:
+            raise web.HTTPError(400, reason="Corpo da requisição não é um JSON válido")
+
+    def modelo(self):
+        api_key = self.request.headers.get("X-Chave-Api") or os.environ.get("GEMINI_API_KEY")
+        if not api_key and not llm_falso_ativo():
+            raise web.HTTPError(401, reason="Chave API do Gemini não informada")
+        genai = obter_genai(api_key)
+        if genai is None:
+            raise web.HTTPError(503, reason="Biblioteca google-generativeai não instalada")
+        return genai.GenerativeModel(MODELO_PADRAO)
+
+class SaudeHandler(BaseHandler):
+    def get(self):
+        self.responder({"status": "ok", "pid": os.getpid()})
+
+class ProjetosHandler(BaseHandler):
+    def get(self):
+        self.responder(gerenciador_projetos().resumo())
+
+class ReunioesHandler(BaseHandler):
+    async def get(self):
+        reunioes = await self.em_thread(listar_reunioes, self.diretorio)
+        self.responder({"reunioes": [
+            {"nome": nome, "formatos": [tipo for tipo, caminho in artefatos.items() if caminho]}
+            for nome, artefatos in reunioes.items()
+        ]})
+
+# Função para calcular as estatísticas completas de uma reunião
+def estatisticas_reuniao(file_path, n_bins, metrica):
+    df = carregar_falas(file_path)
+    if not all(col in df.columns for col in COLUNAS_ESTATISTICAS):
+        raise web.HTTPError(422, reason="O arquivo não contém as colunas esperadas")
+    participacao = participacao_por_bins(df, n_bins, metrica)
+    participacao.index.name = "inicio_min"
+    return {
+        "metricas": metricas_reuniao(df),
+        "locutores": _registros(resumo_por_locutor(df), "locutor"),
+        "participacao": {"metrica": metrica, "intervalos": _registros(participacao, "inicio_min")},
+        "turnos": turnos_reuniao(file_path).to_dict(orient="records"),
+        "sentimento": _registros(serie_sentimento(file_path, n_bins), "inicio_min")
+    }
+
+class EstatisticasReuniaoHandler(BaseHandler):
+    async def get(self, nome):
+        file_path = self.caminho_reuniao(nome)
+        n_bins = self.argumento_inteiro("bins", 10, maximo=200)
+        metrica = self.get_argument("metrica", "falas")
+        if metrica not in METRICAS_PARTICIPACAO:
+            raise web.HTTPError(400, reason=f"Métrica inválida: {metrica}")
+        estatisticas = await self.em_thread(estatisticas_reuniao, file_path, n_bins, metrica)
+        self.responder({"reuniao": nome, **estatisticas})
+
+# Função para calcular as estatísticas consolidadas de todas as reuniões
+def estatisticas_corpus(diretorio):
+    reunioes = {
+        nome: carregar_falas(caminho_fonte(artefatos))
+        for nome, artefatos in listar_reunioes(diretorio).items()
+    }
+    metricas, resumo = resumo_corpus(reunioes)
+    return {"reunioes": metricas, "locutores": _registros(resumo, "locutor")}
+
+class EstatisticasCorpusHandler(BaseHandler):
+    async def get(self):
+        self.responder(await self.em_thread(estatisticas_corpus, self.diretorio))
+
+# Função para obter uma página da transcrição
+def pagina_transcricao(file_path, pagina, tamanho):
+    df = carregar_falas(file_path)
+    trecho = df.iloc[(pagina - 1) * tamanho: pagina * tamanho]
+    colunas = ['locutor', 'inicio', 'fim'] + [c for c in COLUNAS_ANALISE if c in df.columns]
+    falas = trecho[colunas].assign(texto=textos_falas(trecho))
+    return len(df), falas.astype(object).where(falas.notna(), None).to_dict(orient="records")
+
+class TranscricaoHandler(BaseHandler):
+    async def get(self, nome):
+        file_path = self.caminho_reuniao(nome)
+        pagina = self.argumento_inteiro("pagina", 1)
+        tamanho = self.argumento_inteiro("tamanho", TAMANHO_PAGINA, maximo=TAMANHO_PAGINA_MAXIMO)
+        total, falas = await self.em_thread(pagina_transcricao, file_path, pagina, tamanho)
+        self.responder({
+            "reuniao": nome,
+            "total": total,
+            "pagina": pagina,
+            "tamanho": tamanho,
+            "paginas": -(-total // tamanho),
+            "falas": falas
+        })
+
+# Função para obter as falas em um instante (fim=None) ou em uma janela, pelo índice de intervalos
+def falas_intervalo(file_path, inicio, fim):
+    df = carregar_falas(file_path)
+    indice = indice_intervalos(file_path)
+    posicoes = indice.no_instante(inicio) if fim is None else indice.na_janela(inicio, fim)
+    trecho = df.iloc[posicoes]
+    colunas = ['locutor', 'inicio', 'fim'] + [c for c in COLUNAS_ANALISE if c in df.columns]
+    falas = trecho[colunas].assign(texto=textos_falas(trecho), posicao=posicoes)
+    return falas.astype(object).where(falas.notna(), None).to_dict(orient="records")
+
+class IntervalosHandler(BaseHandler):
+    async def get(self, nome):
+        file_path = self.caminho_reuniao(nome)
+        instante = self.get_argument("t", None)
+        janela = (self.get_argument("inicio", None), self.get_argument("fim", None))
+        if instante is None and None in janela:
+            raise web.HTTPError(400, reason="Informe o instante em 't' ou a janela em 'inicio' e 'fim'")
+        try:
+            if instante is not None:
+                inicio, fim = interpretar_horario(instante), None
+            else:
+                inicio, fim = (interpretar_horario(v) for v in janela)
+        except ValueError as e:
+            raise web.HTTPError(400, reason=str(e))
+        if fim is not None and fim < inicio:
+            raise web.HTTPError(400, reason="O fim da janela é anterior ao início")
+        falas = await self.em_thread(falas_intervalo, file_path, inicio, fim)
+        self.responder({"reuniao": nome, "inicio": inicio, "fim": fim, "total": len(falas), "falas": falas})
+
+class ArquivoHandler(BaseHandler, web.StaticFileHandler):
+    """Envia um arquivo do disco com ETag, Last-Modified e Range (tornado.web.StaticFileHandler)."""
+
+    async def enviar(self, file_path, nome, include_body=True):
+        self.root, self.default_filename = os.path.dirname(os.path.abspath(file_path)), None
+        self.set_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(nome)}")
+        await web.StaticFileHandler.get(self, os.path.basename(file_path), include_body)
+
+    # ETag pela data e tamanho (o padrão lê o arquivo inteiro e guarda o hash para sempre)
+    def compute_etag(self):
+        stat = os.stat(self.absolute_path)
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+class ArquivoReuniaoHandler(ArquivoHandler):
+    async def get(self, nome, formato, include_body=True):
+        if formato not in EXTENSOES:
+            raise web.HTTPError(404, reason=f"Formato desconhecido: {formato}")
+        self.caminho_reuniao(nome)
+        file_path = await self.em_thread(obter_exportacao, nome, formato, self.diretorio)
+        await self.enviar(file_path, os.path.basename(file_path), include_body)
+
+    def head(self, nome, formato):
+        return self.get(nome, formato, include_body=False)
+
+class PacoteHandler(ArquivoHandler):
+    async def get(self, include_body=True):
+        file_path = await self.em_thread(obter_pacote_transcricoes, self.diretorio)
+        await self.enviar(file_path, "transcricoes.zip", include_body)
+
+    def head(self):
+        return self.get(include_body=False)
+
+class BuscaHandler(BaseHandler):
+    async def get(self):
+        consulta = self.get_argument("q", "").strip()
+        if not consulta:
+            raise web.HTTPError(400, reason="Informe a consulta no parâmetro 'q'")
+        reuniao = self.get_argument("reuniao", None)
+        limite = self.argumento_inteiro("limite", LIMITE_BUSCA, maximo=TAMANHO_PAGINA_MAXIMO)
+        indice = await self.em_thread(busca_corpus, self.diretorio)
+        total, resultados = indice.buscar(consulta, reuniao, limite)
+        self.responder({"consulta": consulta, "total": total, "resultados": resultados})
+
+class TermosHandler(BaseHandler):
+    async def get(self):
+        reuniao = self.get_argument("reuniao", None)
+        locutor = self.get_argument("locutor", None)
+        n = self.argumento_inteiro("n", 20, maximo=TAMANHO_PAGINA_MAXIMO)
+        indice = await self.em_thread(indice_termos, self.diretorio)
+        if reuniao is not None:
+            if reuniao not in indice.reunioes:
+                raise web.HTTPError(404, reason=f"Reunião não encontrada: {reuniao}")
+            termos = indice.termos_reuniao(reuniao, n)
+        elif locutor is not None:
+            termos = indice.termos_locutor(locutor, n)
+        else:
+            termos = indice.termos_recorrentes(n)
+        self.responder({"reuniao": reuniao, "locutor": locutor, "termos": termos.to_dict(orient="records")})
+
+class TendenciaTermosHandler(BaseHandler):
+    async def get(self):
+        termos = [t.strip() for t in self.get_argument("termos", "").split(",") if t.strip()]
+        if not termos:
+            raise web.HTTPError(400, reason="Informe os termos no parâmetro 'termos'")
+        indice = await self.em_thread(indice_termos, self.diretorio)
+        self.responder({"termos": termos, "tendencia": _registros(indice.tendencia_termos(termos), "reuniao")})
+
+class RelatorioHandler(BaseHandler):
+    async def post(self, nome, tipo):
+        if tipo not in PROMPTS_RELATORIO:
+            raise web.HTTPError(404, reason=f"Tipo de relatório desconhecido: {tipo}")
+        file_path = self.caminho_reuniao(nome)
+        model = self.modelo()
+        content = await self.em_thread(lambda: texto_reuniao(carregar_falas(file_path)))
+        inicio = time.perf_counter()
+        try:
+            relatorio, origem = await self.em_thread(pre_gerador(self.diretorio).obter_relatorio, model, content, tipo, nome)
+        except Exception as e:
+            raise web.HTTPError(502, reason=f"Erro ao gerar relatório: {e}")
+        self.responder({"reuniao": nome, "tipo": tipo, "relatorio": relatorio, "cache": origem,
+                        "segundos": time.perf_counter() - inicio})
+
+class RelatoriosCombinadosHandler(BaseHandler):
+    async def post(self, nome):
+        tipos = self.corpo_json().get("tipos") or list(PROMPTS_RELATORIO)
+        desconhecidos = [t for t in tipos if t not in PROMPTS_RELATORIO]
+        if desconhecidos:
+            raise web.HTTPError(400, reason=f"Tipo de relatório desconhecido: {', '.join(map(str, desconhecidos))}")
+        file_path = self.caminho_reuniao(nome)
+        model = self.modelo()
+        content = await self.em_thread(lambda: texto_reuniao(carregar_falas(file_path)))
+        inicio = time.perf_counter()
+        try:
+            relatorios, origens, chamadas = await self.em_thread(pre_gerador(self.diretorio).obter_relatorios, model, content,
+                                                                 tipos, nome)
+        except Exception as e:
+            raise web.HTTPError(502, reason=f"Erro ao gerar relatórios: {e}")
+        self.responder({"reuniao": nome, "relatorios": relatorios, "cache": origens, "chamadas": chamadas,
+                        "segundos": time.perf_counter() - inicio})
+
+class UsoRelatoriosHandler(BaseHandler):
+    def get(self):
+        self.responder(pre_gerador(self.diretorio).resumo())
+
+class ChatHandler(BaseHandler):
+    async def post(self):
+        corpo = self.corpo_json()
+        pergunta = str(corpo.get("pergunta", "")).strip()
+        if not pergunta:
+            raise web.HTTPError(400, reason="Informe a pergunta no campo 'pergunta'")
+        # Perguntas que os dados estruturados resolvem não chegam ao LLM
+        if corpo.get("roteador", True) and not corpo.get("reunioes"):
+            local = await self.em_thread(rotear, pergunta, self.diretorio)
+            if local:
+                resposta = local["texto"]
+                if corpo.get("frasear"):
+                    model = self.modelo()
+                    try:
+                        resposta = await self.em_thread(frasear, model, pergunta, local)
+                    except Exception as e:
+                        raise web.HTTPError(502, reason=f"Erro ao gerar resposta: {e}")
+                tabela = local["tabela"]
+                self.responder({"pergunta": pergunta, "resposta": resposta, "contexto": "local",
+                                "intencao": local["intencao"],
+                                "tabela": tabela.astype(object).where(tabela.notna(), None).to_dict(orient="records"),
+                                "segundos": local["segundos"]})
+                return
+        model = self.modelo()
+        documentos = await self.em_thread(documentos_reunioes, self.diretorio)
+        reunioes = corpo.get("reunioes")
+        if reunioes:
+            documentos = {nome: doc for nome, doc in documentos.items() if nome in reunioes}
+        if not documentos:
+            raise web.HTTPError(404, reason="Nenhuma reunião encontrada")
+        contexto = corpo.get("contexto", "automatico")
+        if contexto not in ("automatico", "resumos", "transcricoes"):
+            raise web.HTTPError(400, reason=f"Contexto desconhecido: {contexto}")
+        # Os resumos consolidados cobrem a série inteira, não um subconjunto de reuniões
+        usar_resumos = not reunioes and (
+            contexto == "resumos" or (contexto == "automatico" and pergunta_sobre_serie(pergunta)))
+        inicio = time.perf_counter()
+        try:
+            if usar_resumos:
+                resposta, _ = await self.em_thread(resumo_serie(self.diretorio).responder, model, pergunta)
+            else:
+                resposta = await self.em_thread(responder_pergunta, model, pergunta, documentos)
+        except Exception as e:
+            raise web.HTTPError(502, reason=f"Erro ao gerar resposta: {e}")
+        ESTATISTICAS_ROTEADOR.registrar_llm(time.perf_counter() - inicio)
+        self.responder({"pergunta": pergunta, "resposta": resposta, "reunioes": list(documentos),
+                        "contexto": "resumos" if usar_resumos else "transcricoes",
+                        "segundos": time.perf_counter() - inicio})
+
+class RoteadorHandler(BaseHandler):
+    def get(self):
+        self.responder(ESTATISTICAS_ROTEADOR.resumo())
+
+class SerieHandler(BaseHandler):
+    async def get(self):
+        model = self.modelo()
+        try:
+            serie = await self.em_thread(resumo_serie(self.diretorio).atualizar, model)
+        except Exception as e:
+            raise web.HTTPError(502, reason=f"Erro ao atualizar a visão geral: {e}")
+        self.responder(serie)
+
+class AcoesHandler(BaseHandler):
+    async def get(self):
+        status = self.get_argument("status", None)
+        if status is not None and status not in STATUS_ACAO:
+            raise web.HTTPError(400, reason=f"Status inválido: {status}")
+        acoes = await self.em_thread(lambda: consultar_acoes(
+            self.get_argument("locutor", None), status, self.get_argument("reuniao", None), self.diretorio
+        ))
+        self.responder({"acoes": acoes.astype(object).where(acoes.notna(), None).to_dict(orient="records")})
+
+class DecisoesHandler(BaseHandler):
+    async def get(self):
+        decisoes = await self.em_thread(consultar_decisoes, self.get_argument("reuniao", None), self.diretorio)
+        self.responder({"decisoes": decisoes.astype(object).where(decisoes.notna(), None).to_dict(orient="records")})
+
+class ExtracoesHandler(BaseHandler):
+    async def post(self):
+        limite = self.argumento_inteiro("limite", 1000)
+        model = self.modelo()
+        inicio = time.perf_counter()
+        resultado = await self.em_thread(lambda: extrair_pendentes(model, self.diretorio, limite=limite))
+        self.responder({**resultado, "segundos": time.perf_counter() - inicio})
+
+# Função para converter o resultado de uma consulta SQL em resposta
+def _resposta_consulta(resultado):
+    df, truncado, segundos = resultado
+    return {
+        "colunas": list(df.columns),
+        "linhas": df.astype(object).where(df.notna(), None).values.tolist(),
+        "truncado": truncado,
+        "segundos": segundos
+    }
+
+class ConsultasHandler(BaseHandler):
+    def get(self):
+        self.responder({"consultas": [
+            {"nome": nome, "descricao": c["descricao"],
+             "parametros": {p: tipo.__name__ for p, tipo in c["parametros"].items()}}
+            for nome, c in CONSULTAS.items()
+        ]})
+
+class ConsultaHandler(BaseHandler):
+    async def get(self, nome):
+        if nome not in CONSULTAS:
+            raise web.HTTPError(404, reason=f"Consulta desconhecida: {nome}")
+        valores = {p: self.get_argument(p, None) for p in CONSULTAS[nome]["parametros"]}
+        try:
+            resultado = await self.em_thread(executar_consulta, nome, valores, self.diretorio)
+        except (ValueError, TimeoutError) as e:
+            raise web.HTTPError(400, reason=str(e))
+        self.responder({"consulta": nome, **_resposta_consulta(resultado)})
+
+class SqlHandler(BaseHandler):
+    async def post(self):
+        corpo = self.corpo_json()
+        sql = str(corpo.get("sql", "")).strip()
+        if not sql:
+            raise web.HTTPError(400, reason="Informe a consulta no campo 'sql'")
+        try:
+            resultado = await self.em_thread(consultar_sql, sql, corpo.get("parametros"), self.diretorio)
+        except (sqlite3.Error, sqlite3.Warning, TimeoutError) as e:
+            raise web.HTTPError(400, reason=f"Erro na consulta: {e}")
+        self.responder(_resposta_consulta(resultado))
+
+# Função para montar a aplicação tornado
+def criar_aplicacao(diretorio=DIRETORIO_SAIDAS):
+    args = {"diretorio": diretorio}
+    return web.Application([
+        (r"/api/saude", SaudeHandler, args),
+        (r"/api/projetos", ProjetosHandler, args),
+        (r"/api/reunioes", ReunioesHandler, args),
+        (r"/api/reunioes/([^/]+)/estatisticas", EstatisticasReuniaoHandler, args),
+        (r"/api/reunioes/([^/]+)/transcricao", TranscricaoHandler, args),
+        (r"/api/reunioes/([^/]+)/intervalos", IntervalosHandler, args),
+        (r"/api/reunioes/([^/]+)/arquivos/([^/]+)", ArquivoReuniaoHandler, args),
+        (r"/api/transcricoes\.zip", PacoteHandler, args),
+        (r"/api/reunioes/([^/]+)/relatorios/([^/]+)", RelatorioHandler, args),
+        (r"/api/reunioes/([^/]+)/relatorios", RelatoriosCombinadosHandler, args),
+        (r"/api/estatisticas", EstatisticasCorpusHandler, args),
+        (r"/api/busca", BuscaHandler, args),
+        (r"/api/termos", TermosHandler, args),
+        (r"/api/termos/tendencia", TendenciaTermosHandler, args),
+        (r"/api/relatorios/uso", UsoRelatoriosHandler, args),
+        (r"/api/serie", SerieHandler, args),
+        (r"/api/chat", ChatHandler, args),
+        (r"/api/roteador", RoteadorHandler, args),
+        (r"/api/acoes", AcoesHandler, args),
+        (r"/api/decisoes", DecisoesHandler, args),
+        (r"/api/extracoes", ExtracoesHandler, args),
+        (r"/api/consultas", ConsultasHandler, args),
+        (r"/api/consultas/([^/]+)", ConsultaHandler, args),
+        (r"/api/sql", SqlHandler, args)
+    ])
+
+# Função para agendar a pré-geração das reuniões que chegaram em saidas/ e nos projetos carregados
+def verificar_reunioes_novas(diretorio):
+    genai = obter_genai(os.environ.get("GEMINI_API_KEY"))
+    if genai is None:
+        return
+    model = genai.GenerativeModel(MODELO_PADRAO)
+    # Projetos ociosos (já descartados) não são verificados até o próximo uso
+    diretorios = dict.fromkeys([diretorio] + [projeto.diretorio for projeto in gerenciador_projetos().carregados()])
+    for atual in diretorios:
+        novas = pre_gerador(atual).agendar_novas(model, atual)
+        if novas:
+            print(f"Pré-geração agendada: {', '.join(novas)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("--endereco", default=ENDERECO_PADRAO,
+                        help="Endereço de escuta (use 0.0.0.0 para expor a API, sem autenticação, na rede)")
+    parser.add_argument("--processos", type=int, default=1,
+                        help="Número de processos servindo a mesma porta (0 = um por CPU)")
+    parser.add_argument("--diretorio", default=DIRETORIO_SAIDAS)
+    parser.add_argument("--pre-gerar", action="store_true", default=pre_geracao_ativa(),
+                        help="Pré-gera os relatórios mais usados das reuniões novas")
+    args = parser.parse_args()
+
+    sockets = netutil.bind_sockets(args.porta, args.endereco)
+    if args.processos != 1:
+        process.fork_processes(args.processos)
+    servidor = httpserver.HTTPServer(criar_aplicacao(args.diretorio))
+    servidor.add_sockets(sockets)
+    print(f"API ouvindo em http://{args.endereco}:{args.porta} (pid {os.getpid()})")
+    if args.endereco not in (ENDERECO_PADRAO, "localhost", "::1"):
+        print("Atenção: a API não tem autenticação e está acessível pela rede neste endereço")
+    ioloop.PeriodicCallback(gerenciador_projetos().descartar_ociosos, INTERVALO_DESCARTE * 1000).start()
+    if args.pre_gerar and (os.environ.get("GEMINI_API_KEY") or llm_falso_ativo()):
+        # Com vários processos, só o primeiro filho verifica (evita gasto em dobro)
+        if process.task_id() in (None, 0):
+            verificar = lambda: ioloop.IOLoop.current().run_in_executor(None, verificar_reunioes_novas,
+                                                                        args.diretorio)
+            ioloop.PeriodicCallback(verificar, INTERVALO_PRE_GERACAO * 1000).start()
+            ioloop.IOLoop.current().add_callback(verificar)
+    ioloop.IOLoop.current().start()
@@ -1,4 +1,5 @@
 import streamlit as st 
+from nucleo.projetos import PROJETO_PADRAO, criar_projeto, listar_projetos
 
 # Configuração da página
 st.set_page_config(
@@ -13,10 +14,31 @@ paginas = {
                 st.Page("paginas/visualizar_transcricoes.py", title="Visualizar Transcrições", icon='📄'),
                 st.Page("paginas/analise_dados.py", title="Análise de Dados", icon='📊'),
                 st.Page("paginas/relatorios.py", title="Relatórios IA", icon='📑'),
-                st.Page("paginas/chat_documentos.py", title="Chat com Documentos", icon='💬')]
+                st.Page("paginas/chat_documentos.py", title="Chat com Documentos", icon='💬'),
+                st.Page("paginas/consultas_sql.py", title="Consultas SQL", icon='🗄️')]
 }
  
 
+# Projeto (cliente/engajamento) usado por todas as páginas
+projetos = listar_projetos()
+if st.session_state.get("projeto") not in projetos:
+    st.session_state.projeto = PROJETO_PADRAO
+
+# Função para descartar o estado das páginas que pertence ao projeto anterior
+def trocar_projeto():
+    for chave in ("conversa", "current_report", "current_meeting_name", "relatorios_combinados"):
+        st.session_state.pop(chave, None)
+
+st.sidebar.selectbox("📁 Projeto", projetos, key="projeto", on_change=trocar_projeto)
+with st.sidebar.expander("➕ Novo projeto"):
+    nome_projeto = st.text_input("Nome", placeholder="cliente-exemplo", key="nome_novo_projeto")
+    if st.button("Criar projeto", disabled=not nome_projeto):
+        try:
+            diretorio = criar_projeto(nome_projeto)
+            st.success(f"Projeto criado. Copie as transcrições para {diretorio}")
+        except ValueError as e:
+            st.error(str(e))
+
 # Configura navegação
 pg = st.navigation(paginas)
 pg.run()
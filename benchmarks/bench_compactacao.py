@@ -0,0 +1,65 @@
+"""Benchmark da compactação do armazém: pickle × zstd por nível × zstd com dicionário.
+
+Serializa as falas de cada arquivo do diretório como a ingestão faz e mede o
+tamanho total, a razão sobre o pickle e a vazão de compressão e
+descompressão (MB/s de pickle). O dicionário é treinado com todos os
+arquivos, como `python -m nucleo.ingestao --dicionario`.
+
+Uso:
+    python -m benchmarks.bench_compactacao [--diretorio saidas] [--niveis 3 12 19]
+"""
+import argparse
+import os
+import pickle
+import time
+
+from nucleo.compactacao import NIVEL_ZSTD, comprimir, treinar_dicionario, zstd_disponivel
+from nucleo.dados import DIRETORIO_SAIDAS, ler_falas_arquivo
+from nucleo.repositorio import listar_reunioes
+
+def medir(conteudos, nivel, dicionario=None):
+    import zstandard
+    inicio = time.perf_counter()
+    comprimidos = [comprimir(c, dicionario, nivel) for c in conteudos]
+    compressao_s = time.perf_counter() - inicio
+
+    dict_data = zstandard.ZstdCompressionDict(dicionario) if dicionario else None
+    descompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+    inicio = time.perf_counter()
+    for c in comprimidos:
+        descompressor.decompress(c)
+    descompressao_s = time.perf_counter() - inicio
+
+    total = sum(len(c) for c in conteudos)
+    return {
+        "bytes": sum(len(c) for c in comprimidos),
+        "compressao_mb_s": total / 1e6 / compressao_s,
+        "descompressao_mb_s": total / 1e6 / descompressao_s
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--diretorio", default=DIRETORIO_SAIDAS)
+    parser.add_argument("--niveis", type=int, nargs="+", default=[3, NIVEL_ZSTD, 19])
+    args = parser.parse_args()
+    if not zstd_disponivel():
+        raise SystemExit("Biblioteca zstandard não instalada. Execute: pip install zstandard")
+
+    arquivos = [c for artefatos in listar_reunioes(args.diretorio).values() for c in artefatos.values() if c]
+    origem = sum(os.path.getsize(f) for f in arquivos)
+    conteudos = [pickle.dumps(ler_falas_arquivo(f), protocol=pickle.HIGHEST_PROTOCOL) for f in arquivos]
+    total = sum(len(c) for c in conteudos)
+    print(f"{len(arquivos)} arquivo(s): origem {origem / 1e6:.2f} MB, pickle {total / 1e6:.2f} MB")
+
+    inicio = time.perf_counter()
+    dicionario = treinar_dicionario(conteudos)
+    print(f"Dicionário: {len(dicionario or b'') / 1024:.0f} KB em {time.perf_counter() - inicio:.2f}s")
+
+    for nivel in args.niveis:
+        for rotulo, d in (("zstd", None), ("zstd+dicionário", dicionario)):
+            if rotulo != "zstd" and d is None:
+                continue
+            r = medir(conteudos, nivel, d)
+            print(f"{rotulo:16s} nível {nivel:2d}: {r['bytes'] / 1e6:6.2f} MB ({total / r['bytes']:4.1f}x o pickle, "
+                  f"{origem / r['bytes']:4.1f}x a origem)  compressão {r['compressao_mb_s']:7.1f} MB/s  "
+                  f"descompressão {r['descompressao_mb_s']:7.1f} MB/s")
@@ -0,0 +1,81 @@
+"""Benchmark da renderização de relatórios em lote.
+
+Compara o caminho antigo (novo conversor Markdown e CSS embutido a cada
+relatório) com o motor de renderização de `nucleo.renderizacao`.
+
+Uso:
+    python -m benchmarks.bench_relatorios --quantidade 500 [--pdf]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import markdown
+
+from nucleo.renderizacao import (
+    TITULOS_RELATORIO, css_relatorio, modelo_relatorio, pdf_disponivel, renderizar_lote,
+    renderizar_relatorio
+)
+
+# Relatório de exemplo no formato devolvido pelo modelo
+RELATORIO_EXEMPLO = """## Principais pontos
+
+- **Leitura dos textos**: o grupo escolheu dois artigos sobre porcentagem.
+- **Tarefa**: elaborar uma tarefa com *diferentes representações*.
+
+### Decisões
+
+1. Ler os textos até a próxima reunião.
+2. Sara apresenta a proposta de tarefa.
+
+| Responsável | Ação | Prazo |
+|---|---|---|
+| Sara | Proposta de tarefa | 16/08 |
+| Dario | Enviar artigos | 12/08 |
+"""
+
+# Função que reproduz a renderização anterior (um conversor e um CSS por relatório)
+def renderizar_legado(report_content, report_type, meeting_name):
+    md = markdown.Markdown(extensions=['extra', 'nl2br'])
+    conteudo = md.convert(report_content)
+    estilo = "<style>\n" + "".join(linha for linha in css_relatorio().splitlines(True)) + "</style>"
+    return modelo_relatorio().template.replace("$estilo", estilo).replace(
+        "$titulo", TITULOS_RELATORIO[report_type]).replace(
+        "$reuniao", meeting_name).replace("$conteudo", conteudo)
+
+# Função para montar o lote de relatórios sintéticos
+def gerar_relatorios(quantidade):
+    tipos = list(TITULOS_RELATORIO)
+    return [(RELATORIO_EXEMPLO * (1 + i % 3), tipos[i % len(tipos)], f"Reunião {i:05d}")
+            for i in range(quantidade)]
+
+def executar(quantidade, pdf=False):
+    relatorios = gerar_relatorios(quantidade)
+    resultados = {}
+
+    # Renderização em memória: caminho antigo x motor
+    for etapa, renderizar in (("legado_html", renderizar_legado), ("motor_html", renderizar_relatorio)):
+        inicio = time.perf_counter()
+        for relatorio in relatorios:
+            renderizar(*relatorio)
+        resultados[etapa] = quantidade / (time.perf_counter() - inicio)
+
+    # Lote gravado em disco com CSS compartilhado
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        resultados["lote_html"] = renderizar_lote(relatorios, diretorio)["relatorios_por_segundo"]
+        if pdf and pdf_disponivel():
+            amostra = relatorios[:max(1, quantidade // 20)]
+            resultados["lote_pdf"] = renderizar_lote(amostra, os.path.join(diretorio, "pdf"),
+                                                     formato="pdf")["relatorios_por_segundo"]
+    return resultados
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quantidade", type=int, default=500)
+    parser.add_argument("--pdf", action="store_true", help="Inclui a geração de PDF (weasyprint)")
+    args = parser.parse_args()
+
+    for etapa, vazao in executar(args.quantidade, args.pdf).items():
+        print(f"{etapa:12s} {vazao:10.1f} relatórios/s")
@@ -0,0 +1,63 @@
+"""Benchmark da geração de relatórios: uma chamada por tipo × chamada combinada.
+
+Mede os tokens de entrada (`count_tokens`) das duas formas para cada reunião
+e, com `--executar`, a latência real das chamadas. Usa a chave de
+GEMINI_API_KEY ou o backend falso (SARA_LLM_FALSO=1, ~4 caracteres por token
+e latência fixa por chamada).
+
+Uso:
+    python -m benchmarks.bench_relatorios_combinados [--reunioes 2] [--executar]
+"""
+import argparse
+import os
+import time
+
+from nucleo.dados import DIRETORIO_SAIDAS
+from nucleo.llm import MODELO_PADRAO, obter_genai
+from nucleo.prompts import PROMPTS_RELATORIO, comparar_entrada, gerar_relatorio, gerar_relatorios
+from nucleo.repositorio import carregar_reuniao, listar_reunioes, texto_reuniao
+
+def executar(model, reunioes, tipos, medir_latencia=False, diretorio=DIRETORIO_SAIDAS):
+    resultados = []
+    for nome in reunioes:
+        content = texto_reuniao(carregar_reuniao(nome, diretorio))
+        resultado = {"reuniao": nome, **comparar_entrada(model, content, tipos)}
+        if medir_latencia:
+            inicio = time.perf_counter()
+            for tipo in tipos:
+                gerar_relatorio(model, content, tipo)
+            resultado["separados_s"] = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            _, resultado["chamadas_combinado"] = gerar_relatorios(model, content, tipos)
+            resultado["combinado_s"] = time.perf_counter() - inicio
+        resultados.append(resultado)
+    return resultados
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reunioes", type=int, default=None, help="Número de reuniões (padrão: todas)")
+    parser.add_argument("--tipos", nargs="+", default=list(PROMPTS_RELATORIO), choices=list(PROMPTS_RELATORIO))
+    parser.add_argument("--executar", action="store_true", help="Chama o modelo e mede a latência")
+    args = parser.parse_args()
+
+    genai = obter_genai(os.environ.get("GEMINI_API_KEY"))
+    if genai is None:
+        raise SystemExit("Biblioteca google-generativeai não instalada. Execute: pip install google-generativeai")
+    model = genai.GenerativeModel(MODELO_PADRAO)
+
+    resultados = executar(model, list(listar_reunioes())[:args.reunioes], args.tipos, args.executar)
+    separados = sum(r["separados"] for r in resultados)
+    combinado = sum(r["combinado"] for r in resultados)
+    for r in resultados:
+        linha = f"{r['reuniao'][:30]:30s} tokens {r['separados']:8d} -> {r['combinado']:8d}"
+        if args.executar:
+            linha += (f"   {r['separados_s']:7.1f}s -> {r['combinado_s']:7.1f}s "
+                      f"({r['chamadas_combinado']} chamada(s))")
+        print(linha)
+    print(f"Tokens de entrada: {separados} -> {combinado} ({100 * (1 - combinado / max(separados, 1)):.0f}% a menos, "
+          f"{len(args.tipos)} tipos)")
+    if args.executar:
+        separados_s = sum(r["separados_s"] for r in resultados)
+        combinado_s = sum(r["combinado_s"] for r in resultados)
+        print(f"Latência: {separados_s:.1f}s -> {combinado_s:.1f}s ({separados_s / max(combinado_s, 1e-9):.1f}x)")
@@ -0,0 +1,69 @@
+"""Casos de regressão do roteador do chat: respostas locais conferidas com os dados.
+
+Cada caso é uma pergunta, a intenção esperada e a conferência da resposta
+com uma varredura direta das falas (sem o índice de intervalos). Perguntas
+com janela ("primeiros 10 minutos", "entre 10 e 20 minutos") devem contar só
+as falas da janela, não a reunião inteira, e as com um instante ("no minuto
+12") respondem quem falava nele. Mede também a latência de cada
+resposta local.
+
+Uso:
+    python -m benchmarks.bench_roteador [--diretorio saidas]
+"""
+import argparse
+import time
+
+from nucleo.dados import DIRETORIO_SAIDAS, carregar_falas
+from nucleo.repositorio import caminho_fonte, listar_reunioes
+from nucleo.roteador import classificar, reuniao_citada, rotear
+
+# Falas de um locutor (ou de todos) que se sobrepõem à janela [inicio, fim), por varredura
+def falas_na_janela(df, inicio, fim, locutor=None):
+    falas = df[(df['fim'] > inicio) & (df['inicio'] < fim)]
+    return falas if locutor is None else falas[falas['locutor'] == locutor]
+
+# Locutor com menos tempo dentro da janela (duração recortada à janela)
+def menos_tempo_na_janela(df, inicio, fim):
+    falas = falas_na_janela(df, inicio, fim)
+    duracao = falas['fim'].clip(upper=fim) - falas['inicio'].clip(lower=inicio)
+    return duracao.groupby(falas['locutor']).sum().idxmin()
+
+# Casos: (pergunta, intenção, função que recebe (falas da reunião citada, tabela) e confere a resposta)
+CASOS = [
+    ("quem falou menos nos primeiros 10 minutos da 2ª reunião", "ranking",
+     lambda df, tabela: tabela.iloc[0]["Participante"] == menos_tempo_na_janela(df, 0, 600)),
+    ("quantas vezes o Dario falou entre 10 e 20 minutos na reunião 1", "falas",
+     lambda df, tabela: tabela.iloc[0]["Falas"] == len(falas_na_janela(df, 600, 1200, tabela.iloc[0]["Participante"]))
+     and tabela.iloc[0]["Falas"] < (df['locutor'] == tabela.iloc[0]["Participante"]).sum()),
+    ("quem estava falando aos 42:10 na 2ª reunião", "instante",
+     lambda df, tabela: set(tabela["Participante"]) == set(falas_na_janela(df, 2530, 2530.000001)['locutor'])),
+    ("quantas vezes o Dario falou no minuto 12 da reunião 1", "instante",
+     lambda df, tabela: set(tabela["Participante"]) == set(falas_na_janela(df, 720, 720.000001)['locutor'])),
+    ("quanto durou a reunião 2 nos primeiros 10 minutos", None, None)
+]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--diretorio", default=DIRETORIO_SAIDAS)
+    args = parser.parse_args()
+
+    reunioes = listar_reunioes(args.diretorio)
+    falhas = 0
+    for pergunta, intencao, conferir in CASOS:
+        inicio = time.perf_counter()
+        resposta = rotear(pergunta, args.diretorio)
+        ms = 1000 * (time.perf_counter() - inicio)
+        ok = classificar(pergunta) == intencao
+        if conferir is not None:
+            reuniao = reuniao_citada(pergunta, reunioes)
+            ok = ok and resposta is not None and reuniao is not None and len(resposta["tabela"]) > 0 and bool(
+                conferir(carregar_falas(caminho_fonte(reunioes[reuniao])), resposta["tabela"]))
+        else:
+            ok = ok and resposta is None
+        falhas += not ok
+        print(f"{'ok   ' if ok else 'FALHA'} {ms:7.1f} ms  {pergunta}")
+        if not ok:
+            print(f"      intenção {classificar(pergunta)!r}; resposta: {resposta and resposta['texto'][:200]!r}")
+    print(f"{len(CASOS) - falhas}/{len(CASOS)} caso(s) ok em {len(reunioes)} reunião(ões)")
+    if falhas:
+        raise SystemExit(1)
@@ -0,0 +1,263 @@
+"""Teste de carga com várias sessões simultâneas do aplicativo multipágina.
+
+Sobe `streamlit run app.py` em modo headless com o backend falso de LLM
+(SARA_LLM_FALSO=1) e conecta N clientes websocket, que falam o mesmo protocolo
+do navegador: cada sessão navega pelas páginas, troca de reunião, gera um
+relatório e faz uma pergunta no chat. O `AppTest` do Streamlit não serve para
+isso porque troca o runtime global a cada execução e não pode rodar sessões em
+paralelo.
+
+Uso:
+    python -m benchmarks.carga --sessoes 8 [--iteracoes 2] [--latencia-llm 0.5]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+from nucleo.dados import DIRETORIO_BASE
+from nucleo.llm import VARIAVEL_LATENCIA_FALSO, VARIAVEL_LLM_FALSO
+
+ARQUIVO_APP = os.path.join(DIRETORIO_BASE, "app.py")
+
+FIM_EXECUCAO = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR)
+
+PERGUNTA_CHAT = "Quais decisões foram tomadas em todas as reuniões?"
+
+# Função para ler a memória residente de um processo (Linux)
+def memoria_residente_mb(pid):
+    try:
+        with open(f"/proc/{pid}/statm", "r") as file:
+            paginas_residentes = int(file.read().split()[1])
+        return paginas_residentes * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return float("nan")
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+# Função para subir o servidor Streamlit com o LLM falso
+def iniciar_servidor(porta, latencia_llm, timeout=60):
+    ambiente = dict(os.environ, **{VARIAVEL_LLM_FALSO: "1", VARIAVEL_LATENCIA_FALSO: str(latencia_llm)})
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", ARQUIVO_APP,
+         "--server.headless", "true", "--server.port", str(porta),
+         "--server.runOnSave", "false", "--browser.gatherUsageStats", "false"],
+        cwd=DIRETORIO_BASE, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    limite = time.time() + timeout
+    while time.time() < limite:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=1)
+            return processo
+        except OSError:
+            time.sleep(0.3)
+    processo.kill()
+    raise RuntimeError("O servidor Streamlit não respondeu a tempo")
+
+class SessaoWebsocket:
+    """Cliente que imita o navegador: envia reruns e espera o fim do script."""
+
+    def __init__(self, porta, timeout):
+        self.url = f"ws://127.0.0.1:{porta}/_stcore/stream"
+        self.timeout = timeout
+        self.paginas = {}
+        self.pagina_atual = ""
+        self.widgets = {}
+        self.latencias = []
+        self.erros = []
+
+    async def conectar(self):
+        self.conexao = await websocket_connect(self.url, subprotocols=["streamlit"])
+
+    async def fechar(self):
+        self.conexao.close()
+
+    # Função para pedir um rerun e esperar até o script terminar
+    async def rerun(self, descricao, estados=(), pagina=None):
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = pagina if pagina is not None else self.pagina_atual
+        for estado in estados:
+            msg.rerun_script.widget_states.widgets.append(estado)
+
+        self.widgets = {}
+        inicio = time.perf_counter()
+        await self.conexao.write_message(msg.SerializeToString(), binary=True)
+        try:
+            await asyncio.wait_for(self._aguardar_fim(descricao), self.timeout)
+        except asyncio.TimeoutError:
+            self.erros.append(f"{descricao}: tempo esgotado")
+        self.latencias.append((descricao, time.perf_counter() - inicio))
+
+    async def _aguardar_fim(self, descricao):
+        while True:
+            payload = await self.conexao.read_message()
+            if payload is None:
+                raise RuntimeError("Conexão fechada pelo servidor")
+            fmsg = ForwardMsg()
+            fmsg.ParseFromString(payload)
+            tipo = fmsg.WhichOneof("type")
+
+            if tipo == "navigation":
+                self.paginas = {p.url_pathname: p.page_script_hash for p in fmsg.navigation.app_pages}
+                self.pagina_atual = fmsg.navigation.page_script_hash
+            elif tipo == "delta" and fmsg.delta.WhichOneof("type") == "new_element":
+                elemento = fmsg.delta.new_element
+                tipo_elemento = elemento.WhichOneof("type")
+                if tipo_elemento == "exception":
+                    self.erros.append(f"{descricao}: {elemento.exception.message}")
+                campo = getattr(elemento, tipo_elemento) if tipo_elemento else None
+                if getattr(campo, "id", "") and hasattr(campo, "label"):
+                    self.widgets[(tipo_elemento, campo.label)] = campo
+            elif tipo == "script_finished" and fmsg.script_finished in FIM_EXECUCAO:
+                return
+
+    def _widget(self, tipo, trecho_label):
+        for (tipo_widget, label), widget in self.widgets.items():
+            if tipo_widget == tipo and trecho_label in label:
+                return widget
+        return None
+
+    # Roteiro de navegação de um consultor
+    async def executar_roteiro(self, iteracao):
+        await self.rerun("inicial")
+
+        await self.rerun("analise_dados", pagina=self.paginas.get("analise_dados"))
+        seletor = self._widget("selectbox", "análise")
+        if seletor and seletor.options:
+            estado = _estado(seletor.id, string_value=seletor.options[iteracao % len(seletor.options)])
+            await self.rerun("trocar_reuniao", [estado])
+
+        await self.rerun("visualizar_transcricoes", pagina=self.paginas.get("visualizar_transcricoes"))
+
+        await self.rerun("relatorios", pagina=self.paginas.get("relatorios"))
+        chave = self._widget("text_input", "Chave API")
+        if chave:
+            # Guarda uma chave qualquer na sessão; o backend falso não a utiliza
+            await self.rerun("informar_chave", [_estado(chave.id, string_value="falso")])
+        botao = self._widget("button", "Resumo Conciso")
+        if botao:
+            await self.rerun("gerar_relatorio", [_estado(botao.id, trigger_value=True)])
+
+        await self.rerun("chat", pagina=self.paginas.get("chat_documentos"))
+        pergunta = self._widget("text_area", "pergunta")
+        botao = self._widget("button", "Buscar Resposta")
+        if pergunta and botao:
+            await self.rerun("pergunta_chat", [_estado(pergunta.id, string_value=PERGUNTA_CHAT),
+                                               _estado(botao.id, trigger_value=True)])
+
+def _estado(widget_id, **valor):
+    estado = WidgetState(id=widget_id)
+    for campo, conteudo in valor.items():
+        setattr(estado, campo, conteudo)
+    return estado
+
+# Função para resumir latências em percentis
+def _percentis(valores):
+    valores = np.asarray(valores)
+    return {"n": len(valores), "p50": float(np.percentile(valores, 50)),
+            "p95": float(np.percentile(valores, 95)), "p99": float(np.percentile(valores, 99))}
+
+async def _executar(porta, pid, n_sessoes, iteracoes, timeout):
+    memoria_inicial = memoria_residente_mb(pid)
+    pico = [memoria_inicial]
+
+    async def monitorar():
+        while True:
+            pico[0] = max(pico[0], memoria_residente_mb(pid))
+            await asyncio.sleep(0.2)
+
+    monitor = asyncio.ensure_future(monitorar())
+    sessoes = [SessaoWebsocket(porta, timeout) for _ in range(n_sessoes)]
+    await asyncio.gather(*(s.conectar() for s in sessoes))
+    memoria_conectado = memoria_residente_mb(pid)
+
+    async def rodar(sessao):
+        for iteracao in range(iteracoes):
+            await sessao.executar_roteiro(iteracao)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(rodar(s) for s in sessoes))
+    duracao = time.perf_counter() - inicio
+    memoria_final = memoria_residente_mb(pid)
+    monitor.cancel()
+    await asyncio.gather(*(s.fechar() for s in sessoes))
+
+    latencias = [(acao, t) for s in sessoes for acao, t in s.latencias]
+    por_acao = {acao: _percentis([t for a, t in latencias if a == acao])
+                for acao in dict.fromkeys(a for a, _ in latencias)}
+    return {
+        "sessoes": n_sessoes,
+        "reruns": len(latencias),
+        "duracao_s": duracao,
+        "vazao_reruns_s": len(latencias) / duracao,
+        **{k: v for k, v in _percentis([t for _, t in latencias]).items() if k != "n"},
+        "por_acao": por_acao,
+        "memoria_inicial_mb": memoria_inicial,
+        "memoria_final_mb": memoria_final,
+        "memoria_pico_mb": pico[0],
+        "memoria_por_sessao_mb": (memoria_final - memoria_conectado) / n_sessoes,
+        "erros": [e for s in sessoes for e in s.erros]
+    }
+
+# Função para executar o teste de carga
+def executar(n_sessoes=8, iteracoes=2, latencia_llm=0.5, timeout=300, aquecer=True):
+    """Executa `n_sessoes` sessões simultâneas contra um servidor local.
+
+    Com `aquecer`, uma sessão percorre o roteiro antes da medição para que os
+    caches do servidor estejam populados, como em produção.
+
+    Returns:
+        Dicionário com percentis de latência do rerun (geral e por ação),
+        vazão em reruns/s, memória do servidor por sessão e erros.
+    """
+    porta = _porta_livre()
+    servidor = iniciar_servidor(porta, latencia_llm)
+    try:
+        if aquecer:
+            asyncio.run(_executar(porta, servidor.pid, 1, 1, timeout))
+        return asyncio.run(_executar(porta, servidor.pid, n_sessoes, iteracoes, timeout))
+    finally:
+        servidor.terminate()
+        servidor.wait(timeout=10)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessoes", type=int, default=8)
+    parser.add_argument("--iteracoes", type=int, default=2)
+    parser.add_argument("--latencia-llm", type=float, default=0.5,
+                        help="Latência simulada de cada chamada ao LLM (s)")
+    parser.add_argument("--timeout", type=float, default=300, help="Tempo máximo de cada rerun (s)")
+    parser.add_argument("--sem-aquecimento", action="store_true",
+                        help="Mede com os caches do servidor vazios")
+    args = parser.parse_args()
+
+    resultado = executar(args.sessoes, args.iteracoes, args.latencia_llm, args.timeout,
+                         aquecer=not args.sem_aquecimento)
+
+    print(f"Sessões: {resultado['sessoes']}  reruns: {resultado['reruns']}  "
+          f"duração: {resultado['duracao_s']:.1f}s  vazão: {resultado['vazao_reruns_s']:.2f} reruns/s")
+    print(f"Latência do rerun: p50 {resultado['p50'] * 1000:.0f} ms  "
+          f"p95 {resultado['p95'] * 1000:.0f} ms  p99 {resultado['p99'] * 1000:.0f} ms")
+    for acao, estatisticas in resultado["por_acao"].items():
+        print(f"  {acao:24s} n={estatisticas['n']:<4d} p50 {estatisticas['p50'] * 1000:8.0f} ms  "
+              f"p95 {estatisticas['p95'] * 1000:8.0f} ms  p99 {estatisticas['p99'] * 1000:8.0f} ms")
+    print(f"Memória do servidor: {resultado['memoria_inicial_mb']:.0f} MB -> "
+          f"{resultado['memoria_final_mb']:.0f} MB (pico {resultado['memoria_pico_mb']:.0f} MB, "
+          f"~{resultado['memoria_por_sessao_mb']:.1f} MB por sessão)")
+    if resultado["erros"]:
+        print(f"{len(resultado['erros'])} erro(s):")
+        for erro in resultado["erros"][:10]:
+            print(f"  {erro}")
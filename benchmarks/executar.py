@@ -0,0 +1,176 @@
+"""Suíte de benchmarks: carga, parse, agregação, busca e renderização.
+
+Gera um corpus sintético (ver `benchmarks.gerador`), mede cada etapa e compara
+com a linha de base gravada em benchmarks/resultados/baseline.json.
+
+Uso:
+    python -m benchmarks.executar [--reunioes 10] [--falas 500] [--repeticoes 3]
+    python -m benchmarks.executar --salvar-baseline
+    python -m benchmarks.executar --comparar [--tolerancia 0.25]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.gerador import gerar_corpus
+from nucleo.ao_vivo import IndiceBusca
+from nucleo.dados import extrair_falas_html, ler_falas_arquivo
+from nucleo.exportacao import escrever_html
+from nucleo.linha_tempo import montar_linha_tempo
+from nucleo.participacao import participacao_por_bins
+from nucleo.renderizacao import renderizar_relatorio
+from nucleo.repositorio import listar_reunioes, texto_reuniao
+from nucleo.turnos import calcular_turnos
+
+DIRETORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+ARQUIVO_BASELINE = os.path.join(DIRETORIO_RESULTADOS, "baseline.json")
+
+CONSULTAS_BUSCA = ["porcentagem", "tarefa alunos", "leitura texto", "proposta grupo reunião"]
+
+# Etapas do benchmark: cada uma recebe o contexto e devolve o que a próxima usa
+def etapa_carga(contexto):
+    # Leitura a frio do XLSX (sem o cache por versão)
+    contexto["falas"] = [ler_falas_arquivo(a["excel"]) for a in contexto["reunioes"]]
+
+def etapa_parse(contexto):
+    for artefatos in contexto["reunioes"]:
+        with open(artefatos["html"], "r", encoding="utf-8") as file:
+            extrair_falas_html(file.read())
+
+def etapa_agregacao(contexto):
+    for df in contexto["falas"]:
+        # Mesmas agregações da página de análise
+        df['locutor'].value_counts()
+        df.groupby('locutor')['duracao'].sum()
+        ((df['palavras'] / df['duracao']) * 60).fillna(0).clip(0, 500).groupby(df['locutor']).mean()
+        participacao_por_bins(df, 10, "palavras")
+        calcular_turnos(df['locutor'], df['inicio'], df['fim'])
+        montar_linha_tempo([("reuniao", df)])
+
+def etapa_fala_longa(contexto):
+    # Pior caso da varredura de sobreposições: uma fala que dura a reunião inteira
+    for df in contexto["falas"]:
+        calcular_turnos(np.append(df['locutor'].to_numpy(), "Fala longa"), np.append(df['inicio'].to_numpy(), 0.0),
+                        np.append(df['fim'].to_numpy(), df['fim'].max()))
+
+def etapa_documentos(contexto):
+    # Equivalente a carregar_documentos() do chat
+    contexto["textos"] = [texto_reuniao(df) for df in contexto["falas"]]
+
+def etapa_busca(contexto):
+    indice = IndiceBusca()
+    id_fala = 0
+    for df in contexto["falas"]:
+        for texto in df['paragrafo']:
+            indice.adicionar(id_fala, texto)
+            id_fala += 1
+    for consulta in CONSULTAS_BUSCA:
+        indice.buscar(consulta)
+
+def etapa_renderizacao(contexto):
+    for df in contexto["falas"]:
+        escrever_html(df, io.StringIO())
+    for texto in contexto["textos"]:
+        renderizar_relatorio(texto[:3000], "resumo", "Reunião", data_geracao="-")
+
+ETAPAS = {
+    "carga_xlsx": etapa_carga,
+    "parse_html": etapa_parse,
+    "agregacao": etapa_agregacao,
+    "fala_longa": etapa_fala_longa,
+    "documentos_chat": etapa_documentos,
+    "busca": etapa_busca,
+    "renderizacao": etapa_renderizacao
+}
+
+# Função para medir todas as etapas sobre um corpus já gerado
+def medir(diretorio, repeticoes=3):
+    """Executa as etapas `repeticoes` vezes e guarda o melhor tempo de cada uma."""
+    contexto = {"reunioes": [a for a in listar_reunioes(diretorio).values()
+                             if a["excel"] and a["html"]]}
+    tempos = {}
+    for _ in range(repeticoes):
+        for nome, etapa in ETAPAS.items():
+            inicio = time.perf_counter()
+            etapa(contexto)
+            duracao = time.perf_counter() - inicio
+            tempos[nome] = min(duracao, tempos.get(nome, float("inf")))
+    return tempos
+
+# Função para gerar o corpus sintético e medir
+def executar(n_reunioes=10, n_falas=500, repeticoes=3, semente=0):
+    with tempfile.TemporaryDirectory() as diretorio:
+        inicio = time.perf_counter()
+        gerar_corpus(diretorio, n_reunioes, n_falas, semente, somente_falas=True)
+        geracao = time.perf_counter() - inicio
+        tempos = medir(diretorio, repeticoes)
+    return {
+        "configuracao": {"reunioes": n_reunioes, "falas": n_falas, "repeticoes": repeticoes,
+                         "semente": semente},
+        "ambiente": {"python": platform.python_version(), "pandas": pd.__version__,
+                     "plataforma": platform.platform()},
+        "geracao_corpus_s": geracao,
+        "etapas_s": tempos
+    }
+
+# Função para comparar um resultado com a linha de base
+def comparar(resultado, baseline, tolerancia=0.25):
+    """Retorna a lista de (etapa, atual, base, razão, regrediu)."""
+    linhas = []
+    for etapa, atual in resultado["etapas_s"].items():
+        base = baseline["etapas_s"].get(etapa)
+        if base is None:
+            continue
+        razao = atual / base if base > 0 else float("inf")
+        linhas.append((etapa, atual, base, razao, razao > 1 + tolerancia))
+    return linhas
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reunioes", type=int, default=None)
+    parser.add_argument("--falas", type=int, default=None)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--salvar-baseline", action="store_true")
+    parser.add_argument("--comparar", action="store_true")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Aumento relativo tolerado antes de acusar regressão")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.comparar:
+        with open(ARQUIVO_BASELINE, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    # Na comparação, o corpus padrão é o mesmo da linha de base
+    padrao = baseline["configuracao"] if baseline else {"reunioes": 10, "falas": 500}
+    resultado = executar(args.reunioes or padrao["reunioes"], args.falas or padrao["falas"],
+                         args.repeticoes)
+
+    config = resultado["configuracao"]
+    print(f"Corpus: {config['reunioes']} reuniões × {config['falas']} falas "
+          f"(gerado em {resultado['geracao_corpus_s']:.2f}s)")
+    for etapa, duracao in resultado["etapas_s"].items():
+        print(f"  {etapa:16s} {duracao * 1000:10.1f} ms")
+
+    if args.salvar_baseline:
+        os.makedirs(DIRETORIO_RESULTADOS, exist_ok=True)
+        with open(ARQUIVO_BASELINE, "w", encoding="utf-8") as file:
+            json.dump(resultado, file, indent=2, ensure_ascii=False)
+        print(f"Linha de base gravada em {ARQUIVO_BASELINE}")
+
+    if baseline:
+        regressoes = 0
+        print("\nComparação com a linha de base:")
+        for etapa, atual, base, razao, regrediu in comparar(resultado, baseline, args.tolerancia):
+            regressoes += regrediu
+            marca = "REGRESSÃO" if regrediu else "ok"
+            print(f"  {etapa:16s} {base * 1000:9.1f} ms -> {atual * 1000:9.1f} ms  ({razao:.2f}x)  {marca}")
+        sys.exit(1 if regressoes else 0)
@@ -0,0 +1,159 @@
+"""Gerador de reuniões sintéticas no formato de saidas/ (html_*.html e excel_*.xlsx).
+
+Uso:
+    python -m benchmarks.gerador DESTINO --reunioes 10 --falas 500 [--somente-falas]
+"""
+import argparse
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from nucleo.exportacao import PLANILHA_FALAS, escrever_html
+
+# Vocabulário usado para montar as falas
+VOCABULARIO = (
+    "a o de que e do da em um para é com não uma os no se na por mais as dos como mas "
+    "foi ao ele das tem à seu sua ou ser quando muito há nos já está eu também só pelo "
+    "pela até isso ela entre era depois sem mesmo aos ter seus quem nas me esse eles "
+    "estão você tinha foram essa num nem suas meu às minha têm numa pelos elas havia "
+    "seja qual será nós tenho lhe deles essas esses pelas este fosse dele tu te vocês "
+    "porcentagem tarefa aluno alunos professor professora escola aula leitura texto "
+    "artigo proposta reunião grupo discussão fração decimal representação problema "
+    "resolução estratégia planejamento ciclo lesson study observação registro "
+    "narrativa aprendizagem matemática currículo avaliação turma sala atividade "
+    "bom ótimo concordo dificuldade dúvida ideia exemplo pergunta resposta semana"
+).split()
+
+LOCUTORES = [
+    "Dario Fiorentini", "Sandra Menezes", "Ruth L", "Antonio Roberto Barbutti",
+    "Sara Carolayne Mendonça Salgado", "Marcio Barbassa", "Rosa Guimarães"
+]
+INTENCOES = ["Fazer Pergunta/Levantar Dúvida", "Dar Sugestão/Propor Ideia", "Nenhuma Categoria",
+             "Relatar Experiência/Fato", "Explicar/Justificar Raciocínio",
+             "Organizar/Coordenar Reunião", "Concordar/Apoiar", "Discordar/Contrapor"]
+FOCOS = ["Nenhuma Categoria", "Conteúdo Matemático", "Questões Organizacionais",
+         "Planejamento da Tarefa/Aula", "Prática Docente (Sala de Aula)",
+         "Processo do Lesson Study", "Antecipação da Resposta do Aluno"]
+TONS = ["Colaborativo", "Neutro", "Hesitante/Incerto", "Reflexivo", "Confiante", "Crítico"]
+
+# Função para gerar as falas de uma reunião sintética
+def gerar_falas(n_falas, rng, n_locutores=5):
+    """Gera um DataFrame com as colunas da planilha 'Resultado Processado'."""
+    locutores = rng.choice(LOCUTORES, size=n_locutores, replace=False)
+    # Poucos locutores concentram a maior parte das falas, como nas reuniões reais
+    pesos = rng.dirichlet(np.full(n_locutores, 0.8))
+    quem = rng.choice(locutores, size=n_falas, p=pesos)
+
+    palavras = np.maximum(1, rng.lognormal(3.0, 1.0, n_falas).astype(np.int64))
+    duracao = np.round(palavras / rng.uniform(1.8, 3.2, n_falas), 2)
+    pausas = rng.exponential(2.0, n_falas)
+    # Uma pequena parte das falas começa antes da anterior terminar
+    pausas[rng.random(n_falas) < 0.05] *= -1
+    inicio = np.round(np.maximum(0, np.cumsum(duracao + pausas) - duracao), 2)
+    fim = np.round(inicio + duracao, 2)
+
+    tokens = rng.choice(VOCABULARIO, size=int(palavras.sum()))
+    cortes = np.cumsum(palavras)[:-1]
+    textos = [" ".join(t).capitalize() + "." for t in np.split(tokens, cortes)]
+
+    return pd.DataFrame({
+        "locutor": quem,
+        "inicio": inicio,
+        "fim": fim,
+        "paragrafo": textos,
+        "palavras": palavras,
+        "sentencas": np.maximum(1, palavras // 15),
+        "locutor_ocr": quem,
+        "duracao": duracao,
+        "frase_corrigida": textos,
+        "intencao_do_locutor": rng.choice(INTENCOES, size=n_falas),
+        "foco_da_fala": rng.choice(FOCOS, size=n_falas),
+        "sentimento_tom": rng.choice(TONS, size=n_falas)
+    })
+
+# Função para montar as planilhas de detalhe (sentenças e palavras)
+def _planilhas_detalhe(df, rng):
+    request_id = str(uuid.UUID(int=int(rng.integers(0, 2**63))))
+    sentencas = pd.DataFrame({
+        "request_id": request_id,
+        "duracao_total_segundos": float(df["fim"].max()),
+        "locutor": "Speaker " + pd.Series(pd.factorize(df["locutor"])[0]).astype(str),
+        "tempo_inicio": df["inicio"],
+        "tempo_fim": df["fim"],
+        "sentenca": df["paragrafo"],
+        "posicao_na_frase": 1
+    })
+
+    palavras = df["paragrafo"].str.split().explode()
+    repeticoes = df["palavras"].to_numpy()
+    inicio = np.repeat(df["inicio"].to_numpy(), repeticoes)
+    passo = np.repeat((df["duracao"] / df["palavras"]).to_numpy(), repeticoes)
+    posicao = np.arange(len(inicio)) - np.repeat(np.cumsum(repeticoes) - repeticoes, repeticoes)
+    detalhe = pd.DataFrame({
+        "request_id": request_id,
+        "punctuated_word": palavras.to_numpy(),
+        "word": palavras.str.lower().str.strip(".,").to_numpy(),
+        "start": np.round(inicio + posicao * passo, 3),
+        "end": np.round(inicio + (posicao + 1) * passo, 3),
+        "confidence": rng.uniform(0.5, 1.0, len(inicio)),
+        "speaker": np.repeat(pd.factorize(df["locutor"])[0], repeticoes),
+        "speaker_confidence": rng.uniform(0.2, 0.9, len(inicio))
+    })
+    return {"Sentencas": sentencas, "Palavras": detalhe}
+
+# Função para gravar a reunião no formato excel_*.xlsx (modo write-only)
+def escrever_xlsx_reuniao(df, file_path, planilhas_extras=None):
+    wb = Workbook(write_only=True)
+    fonte_cabecalho = Font(bold=True)
+    planilhas = {PLANILHA_FALAS: df, **(planilhas_extras or {})}
+    for nome, dados in planilhas.items():
+        ws = wb.create_sheet(nome)
+        cabecalho = []
+        for coluna in dados.columns:
+            celula = WriteOnlyCell(ws, value=coluna)
+            celula.font = fonte_cabecalho
+            cabecalho.append(celula)
+        ws.append(cabecalho)
+        for linha in dados.itertuples(index=False, name=None):
+            ws.append(list(linha))
+    wb.save(file_path)
+
+# Função para gerar um corpus de reuniões sintéticas
+def gerar_corpus(destino, n_reunioes=10, n_falas=500, semente=0, somente_falas=False, formatos=("html", "excel")):
+    """Grava `n_reunioes` reuniões com `n_falas` falas cada em `destino`.
+
+    Returns:
+        Lista com os nomes das reuniões geradas.
+    """
+    os.makedirs(destino, exist_ok=True)
+    rng = np.random.default_rng(semente)
+    nomes = []
+    for i in range(n_reunioes):
+        nome = f"{i + 1}ª Reunião Sintética ({1 + i % 28:02d}_{1 + i // 28 % 12:02d})"
+        df = gerar_falas(n_falas, rng)
+        if "html" in formatos:
+            with open(os.path.join(destino, f"html_{nome}.html"), "w", encoding="utf-8") as file:
+                escrever_html(df, file)
+        if "excel" in formatos:
+            extras = None if somente_falas else _planilhas_detalhe(df, rng)
+            escrever_xlsx_reuniao(df, os.path.join(destino, f"excel_{nome}.xlsx"), extras)
+        nomes.append(nome)
+    return nomes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("destino")
+    parser.add_argument("--reunioes", type=int, default=10, help="Número de reuniões (10 a 10 000)")
+    parser.add_argument("--falas", type=int, default=500, help="Falas por reunião (100 a 20 000)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--somente-falas", action="store_true",
+                        help="Grava só a planilha de falas (sem 'Sentencas' e 'Palavras')")
+    args = parser.parse_args()
+
+    nomes = gerar_corpus(args.destino, args.reunioes, args.falas, args.semente, args.somente_falas)
+    print(f"{len(nomes)} reuniões geradas em {args.destino}")
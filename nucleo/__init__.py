@@ -0,0 +1 @@
+# Módulos compartilhados pelas páginas do aplicativo (carregamento e análises)
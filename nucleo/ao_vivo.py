@@ -0,0 +1,215 @@
+import codecs
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+
+import pandas as pd
+
+from nucleo.dados import DIRETORIO_SAIDAS, extrair_falas_html, montar_fala
+
+# Diretório com as transcrições em andamento (arquivos .html ou .jsonl que crescem)
+DIRETORIO_AO_VIVO = os.path.join(DIRETORIO_SAIDAS, "ao_vivo")
+
+# Tamanho dos blocos lidos a cada atualização (o arquivo é lido até o fim, bloco a bloco)
+TAMANHO_LEITURA = 1 << 20
+
+PADRAO_TOKEN = re.compile(r"\w+")
+
+# Função para obter o diretório de transcrições em andamento de um diretório de transcrições (projeto)
+def diretorio_ao_vivo(diretorio=DIRETORIO_SAIDAS):
+    return os.path.join(diretorio, "ao_vivo")
+
+# Função para listar as transcrições em andamento
+def listar_ao_vivo(diretorio=DIRETORIO_AO_VIVO):
+    if not os.path.isdir(diretorio):
+        return []
+    return sorted(f for f in os.listdir(diretorio) if f.endswith(('.html', '.jsonl')))
+
+# Função para converter uma linha JSONL no formato de fala
+def _fala_jsonl(linha):
+    registro = json.loads(linha)
+    texto = str(registro.get("paragrafo") or registro.get("texto") or "")
+    return montar_fala(str(registro["locutor"]), float(registro["inicio"]),
+                       float(registro["fim"]), texto)
+
+class LeitorIncremental:
+    """Lê apenas os bytes novos de um arquivo de transcrição que cresce.
+
+    Guarda a posição já lida e o trecho final ainda incompleto (uma fala HTML
+    sem `</p>` ou uma linha JSONL sem quebra de linha). Se o arquivo for
+    truncado ou substituído, a leitura recomeça do início. Linhas JSONL
+    completas que não são uma fala válida são puladas e contadas em
+    `linhas_invalidas`, sem perder as demais falas do trecho.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.formato = "jsonl" if file_path.endswith(".jsonl") else "html"
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.posicao = 0
+        self.identidade = None
+        self.pendente = ""
+        self.linhas_invalidas = 0
+        self.decodificador = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    # Função para ler e interpretar os bytes adicionados desde a última leitura
+    def ler_novas_falas(self):
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return [], False
+
+        reiniciado = False
+        identidade = (stat.st_dev, stat.st_ino)
+        if stat.st_size < self.posicao or (self.identidade and identidade != self.identidade):
+            self.reiniciar()
+            reiniciado = True
+        self.identidade = identidade
+
+        if stat.st_size == self.posicao:
+            return [], reiniciado
+
+        # Lê até o tamanho visto no stat, em blocos: cada bloco é interpretado
+        # antes do próximo, então só um bloco de texto fica em memória
+        falas = []
+        with open(self.file_path, "rb") as file:
+            file.seek(self.posicao)
+            while self.posicao < stat.st_size:
+                novos_bytes = file.read(min(stat.st_size - self.posicao, TAMANHO_LEITURA))
+                if not novos_bytes:
+                    break
+                self.posicao += len(novos_bytes)
+                falas += self._interpretar(novos_bytes)
+        return falas, reiniciado
+
+    # Função para interpretar um bloco de bytes lido (o final incompleto fica em `pendente`)
+    def _interpretar(self, novos_bytes):
+        self.pendente += self.decodificador.decode(novos_bytes)
+        if self.formato == "jsonl":
+            *linhas, self.pendente = self.pendente.split("\n")
+            falas = []
+            for linha in linhas:
+                if not linha.strip():
+                    continue
+                try:
+                    falas.append(_fala_jsonl(linha))
+                except (json.JSONDecodeError, AttributeError, KeyError, TypeError, ValueError):
+                    self.linhas_invalidas += 1
+        else:
+            falas, fim = extrair_falas_html(self.pendente)
+            restante = self.pendente[fim:]
+            # Descarta cabeçalho e estilos: só interessa a partir da próxima fala
+            proxima = restante.find("<p><b>")
+            self.pendente = restante[proxima:] if proxima >= 0 else restante[-5:]
+        return falas
+
+class IndiceBusca:
+    """Índice invertido termo -> falas, atualizado a cada nova fala."""
+
+    def __init__(self):
+        self.postings = defaultdict(list)
+
+    def adicionar(self, id_fala, texto):
+        for termo in set(PADRAO_TOKEN.findall(texto.lower())):
+            self.postings[termo].append(id_fala)
+
+    def buscar(self, consulta):
+        termos = set(PADRAO_TOKEN.findall(consulta.lower()))
+        if not termos:
+            return []
+        listas = sorted((self.postings.get(t, []) for t in termos), key=len)
+        resultado = set(listas[0])
+        for lista in listas[1:]:
+            resultado.intersection_update(lista)
+        return sorted(resultado)
+
+class ReuniaoAoVivo:
+    """Estado de uma reunião em andamento: falas, agregados e índice de busca.
+
+    Cada chamada a `atualizar` processa apenas as falas novas. A instância é
+    compartilhada entre sessões (ver `obter_reuniao_ao_vivo`), por isso
+    as operações são protegidas por um lock.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.leitor = LeitorIncremental(file_path)
+        self.lock = threading.Lock()
+        self._limpar()
+
+    def _limpar(self):
+        self.falas = []
+        self.agregados = defaultdict(lambda: {"falas": 0, "palavras": 0, "duracao": 0.0})
+        self.indice = IndiceBusca()
+        self.versao = 0
+        self._df = None
+        self._texto = None
+
+    # Função para incorporar as falas novas do arquivo
+    def atualizar(self):
+        with self.lock:
+            falas, reiniciado = self.leitor.ler_novas_falas()
+            if reiniciado:
+                self._limpar()
+            for fala in falas:
+                id_fala = len(self.falas)
+                self.falas.append(fala)
+                agregado = self.agregados[fala["locutor"]]
+                agregado["falas"] += 1
+                agregado["palavras"] += fala["palavras"]
+                agregado["duracao"] += fala["duracao"]
+                self.indice.adicionar(id_fala, fala["paragrafo"])
+            if falas or reiniciado:
+                self.versao += 1
+                self._df = None
+                self._texto = None
+            return len(falas)
+
+    # Função para obter as falas como DataFrame (refeito só quando há novidades)
+    def dataframe(self):
+        with self.lock:
+            if self._df is None:
+                self._df = pd.DataFrame(self.falas, columns=["locutor", "inicio", "fim",
+                                                             "paragrafo", "palavras", "duracao"])
+            return self._df
+
+    # Função para obter os agregados por locutor
+    def resumo(self):
+        with self.lock:
+            resumo = pd.DataFrame.from_dict(dict(self.agregados), orient="index")
+        return resumo.sort_values("falas", ascending=False) if len(resumo) else resumo
+
+    # Função para buscar falas que contenham todos os termos da consulta
+    def buscar(self, consulta):
+        with self.lock:
+            return [self.falas[i] for i in self.indice.buscar(consulta)]
+
+    # Função para obter o texto da reunião no formato usado pelo chat
+    def texto(self):
+        with self.lock:
+            if self._texto is None:
+                self._texto = " ".join(f"{f['locutor']}: {f['paragrafo']}" for f in self.falas)
+            return self._texto
+
+_reunioes_ao_vivo = {}
+_lock_registro = threading.Lock()
+
+# Função para obter a reunião em andamento compartilhada por todas as sessões
+def obter_reuniao_ao_vivo(file_path):
+    with _lock_registro:
+        if file_path not in _reunioes_ao_vivo:
+            _reunioes_ao_vivo[file_path] = ReuniaoAoVivo(file_path)
+        reuniao = _reunioes_ao_vivo[file_path]
+    reuniao.atualizar()
+    return reuniao
+
+# Função para descartar as reuniões em andamento de um diretório (projeto ocioso)
+def descartar_reunioes_ao_vivo(diretorio):
+    prefixo = os.path.join(os.path.abspath(diretorio), "")
+    with _lock_registro:
+        for file_path in [f for f in _reunioes_ao_vivo if os.path.abspath(f).startswith(prefixo)]:
+            del _reunioes_ao_vivo[file_path]
@@ -0,0 +1,406 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from nucleo.dados import DIRETORIO_ARMAZEM, DIRETORIO_SAIDAS, armazem_diretorio, carregar_falas, versao_falas
+from nucleo.locutores import NOME_ARQUIVO_LOCUTORES, carregar_registro, chave_nome
+from nucleo.repositorio import caminho_fonte, listar_reunioes, textos_falas
+from nucleo.sentimento import VERSAO_LEXICO, sentimento_reuniao
+
+# Banco SQLite com as falas de todas as reuniões
+ARQUIVO_BANCO = os.path.join(DIRETORIO_ARMAZEM, "corpus.sqlite")
+
+# Função para obter o banco de um diretório de transcrições (fica no armazém do diretório)
+def arquivo_banco(diretorio=DIRETORIO_SAIDAS):
+    return os.path.join(armazem_diretorio(diretorio), os.path.basename(ARQUIVO_BANCO))
+
+# Número máximo de linhas devolvidas por uma consulta livre
+LIMITE_LINHAS = 10000
+
+# Segundos de execução de uma consulta antes de ela ser interrompida
+TEMPO_MAXIMO_CONSULTA = 10.0
+
+# Instruções da máquina virtual do SQLite entre as verificações do prazo
+INSTRUCOES_POR_VERIFICACAO = 10000
+
+# Data no nome da reunião, ex.: "1ª Reunião Getaf (09_08)" -> dia 9, mês 8
+PADRAO_DATA_REUNIAO = re.compile(r"\((\d{1,2})_(\d{1,2})\)")
+
+# Versão do esquema (PRAGMA user_version); um banco de outra versão é recriado
+VERSAO_ESQUEMA = 3
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS locutores (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    apelidos TEXT
+);
+CREATE TABLE IF NOT EXISTS reunioes (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE,
+    arquivo TEXT NOT NULL,
+    versao TEXT NOT NULL,
+    dia INTEGER,
+    mes INTEGER,
+    falas INTEGER NOT NULL,
+    duracao_s REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS falas (
+    id INTEGER PRIMARY KEY,
+    reuniao_id INTEGER NOT NULL REFERENCES reunioes(id),
+    ordem INTEGER NOT NULL,
+    locutor_id INTEGER REFERENCES locutores(id),
+    inicio REAL,
+    fim REAL,
+    duracao REAL,
+    palavras INTEGER,
+    texto TEXT,
+    intencao_do_locutor TEXT,
+    foco_da_fala TEXT,
+    sentimento_tom TEXT,
+    positivas INTEGER,
+    negativas INTEGER,
+    polaridade REAL
+);
+CREATE INDEX IF NOT EXISTS idx_falas_reuniao_inicio ON falas(reuniao_id, inicio);
+CREATE INDEX IF NOT EXISTS idx_falas_locutor ON falas(locutor_id, reuniao_id);
+CREATE INDEX IF NOT EXISTS idx_falas_inicio ON falas(inicio);
+"""
+
+# Tabelas com o que o LLM extraiu de cada reunião (ver nucleo/extracao.py). Não
+# dependem das falas e não são apagadas quando VERSAO_ESQUEMA muda: refazer
+# a extração custa chamadas à API.
+ESQUEMA_EXTRACOES = """
+CREATE TABLE IF NOT EXISTS extracoes (
+    reuniao TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    modelo TEXT,
+    gerado_em TEXT NOT NULL,
+    segundos REAL,
+    pendencias TEXT
+);
+CREATE TABLE IF NOT EXISTS acoes (
+    id INTEGER PRIMARY KEY,
+    reuniao TEXT NOT NULL,
+    ordem INTEGER NOT NULL,
+    acao TEXT NOT NULL,
+    responsavel TEXT,
+    locutor_id INTEGER,
+    prazo TEXT,
+    status TEXT NOT NULL CHECK (status IN ('aberta', 'concluida')),
+    contexto TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_acoes_locutor ON acoes(locutor_id, status);
+CREATE INDEX IF NOT EXISTS idx_acoes_reuniao ON acoes(reuniao);
+CREATE TABLE IF NOT EXISTS decisoes (
+    id INTEGER PRIMARY KEY,
+    reuniao TEXT NOT NULL,
+    ordem INTEGER NOT NULL,
+    decisao TEXT NOT NULL,
+    contexto TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_decisoes_reuniao ON decisoes(reuniao);
+"""
+
+COLUNAS_OPCIONAIS = ['intencao_do_locutor', 'foco_da_fala', 'sentimento_tom']
+
+# Consultas prontas: SQL com parâmetros nomeados e o tipo de cada parâmetro
+CONSULTAS = {
+    "minutos_por_locutor_mes": {
+        "descricao": "Total de minutos de fala por participante em cada mês",
+        "sql": """SELECT l.nome AS locutor, r.mes, ROUND(SUM(f.duracao) / 60.0, 1) AS minutos, COUNT(*) AS falas
+                  FROM falas f JOIN reunioes r ON r.id = f.reuniao_id JOIN locutores l ON l.id = f.locutor_id
+                  GROUP BY f.locutor_id, r.mes ORDER BY r.mes, minutos DESC""",
+        "parametros": {}
+    },
+    "resumo_reunioes": {
+        "descricao": "Participantes, falas, palavras e duração de cada reunião",
+        "sql": """SELECT r.nome, r.dia, r.mes, COUNT(DISTINCT f.locutor_id) AS participantes, r.falas,
+                         SUM(f.palavras) AS palavras, ROUND(r.duracao_s / 60.0, 1) AS duracao_min
+                  FROM reunioes r JOIN falas f ON f.reuniao_id = r.id
+                  GROUP BY r.id ORDER BY r.mes, r.dia""",
+        "parametros": {}
+    },
+    "participacao_locutor": {
+        "descricao": "Participação de uma pessoa em cada reunião",
+        "sql": """SELECT r.nome, COUNT(*) AS falas, SUM(f.palavras) AS palavras,
+                         ROUND(SUM(f.duracao) / 60.0, 1) AS minutos
+                  FROM falas f JOIN reunioes r ON r.id = f.reuniao_id
+                  WHERE f.locutor_id = (SELECT id FROM locutores WHERE nome = :locutor)
+                  GROUP BY r.id ORDER BY r.mes, r.dia""",
+        "parametros": {"locutor": str}
+    },
+    "falas_intervalo": {
+        "descricao": "Falas de uma reunião que acontecem entre dois instantes (em segundos)",
+        "sql": """SELECT f.ordem, l.nome AS locutor, f.inicio, f.fim, f.texto
+                  FROM falas f JOIN reunioes r ON r.id = f.reuniao_id JOIN locutores l ON l.id = f.locutor_id
+                  WHERE r.nome = :reuniao AND f.inicio < :fim AND f.fim > :inicio
+                  ORDER BY f.inicio""",
+        "parametros": {"reuniao": str, "inicio": float, "fim": float}
+    },
+    "intencoes_por_locutor": {
+        "descricao": "Número de falas de cada intenção por participante",
+        "sql": """SELECT l.nome AS locutor, f.intencao_do_locutor, COUNT(*) AS falas
+                  FROM falas f JOIN locutores l ON l.id = f.locutor_id
+                  WHERE f.intencao_do_locutor IS NOT NULL
+                  GROUP BY f.locutor_id, f.intencao_do_locutor ORDER BY locutor, falas DESC""",
+        "parametros": {}
+    },
+    "sentimento_por_reuniao": {
+        "descricao": "Polaridade (léxico de palavras positivas e negativas) de cada participante por reunião",
+        "sql": """SELECT r.nome, l.nome AS locutor, SUM(f.positivas) AS positivas, SUM(f.negativas) AS negativas,
+                         ROUND(1.0 * (SUM(f.positivas) - SUM(f.negativas))
+                               / NULLIF(SUM(f.positivas) + SUM(f.negativas), 0), 2) AS polaridade
+                  FROM falas f JOIN reunioes r ON r.id = f.reuniao_id JOIN locutores l ON l.id = f.locutor_id
+                  GROUP BY r.id, f.locutor_id ORDER BY r.mes, r.dia, locutor""",
+        "parametros": {}
+    },
+    "acoes_abertas": {
+        "descricao": "Pontos de ação em aberto de uma pessoa em todas as reuniões",
+        "sql": """SELECT a.reuniao, a.acao, a.prazo, a.contexto, a.responsavel
+                  FROM acoes a LEFT JOIN reunioes r ON r.nome = a.reuniao
+                  WHERE a.status = 'aberta' AND a.locutor_id = (SELECT id FROM locutores WHERE nome = :locutor)
+                  ORDER BY r.mes, r.dia, a.ordem""",
+        "parametros": {"locutor": str}
+    },
+    "decisoes_reunioes": {
+        "descricao": "Decisões registradas em todas as reuniões",
+        "sql": """SELECT d.reuniao, d.decisao, d.contexto
+                  FROM decisoes d LEFT JOIN reunioes r ON r.nome = d.reuniao
+                  ORDER BY r.mes, r.dia, d.ordem""",
+        "parametros": {}
+    },
+    "buscar_texto": {
+        "descricao": "Falas que contêm um trecho de texto",
+        "sql": """SELECT r.nome, l.nome AS locutor, f.inicio, f.fim, f.texto
+                  FROM falas f JOIN reunioes r ON r.id = f.reuniao_id JOIN locutores l ON l.id = f.locutor_id
+                  WHERE f.texto LIKE '%' || :termo || '%' ORDER BY r.mes, r.dia, f.inicio LIMIT 500""",
+        "parametros": {"termo": str}
+    }
+}
+
+# Função para extrair dia e mês do nome da reunião
+def data_reuniao(nome):
+    match = PADRAO_DATA_REUNIAO.search(nome)
+    return (int(match.group(1)), int(match.group(2))) if match else (None, None)
+
+# Função para obter o id provisório (negativo e estável) de um locutor ainda não registrado
+def _id_provisorio(nome):
+    return -(zlib.crc32(chave_nome(nome).encode("utf-8")) + 1)
+
+# Função para obter os ids dos locutores das falas e os provisórios usados
+def _ids_locutores(df):
+    """Locutores fora do registro (locutor_id -1, antes da próxima ingestão)
+    recebem um id provisório derivado do nome, para não sumirem das junções.
+
+    Returns:
+        Tupla (ids, provisorios): ids por fala (None sem locutor) e
+        dicionário {id provisório: nome}.
+    """
+    ids = df['locutor_id'].to_numpy(dtype=object).copy()
+    provisorios = {}
+    for posicao in np.flatnonzero(df['locutor_id'].to_numpy() < 0):
+        nome = df['locutor'].iat[posicao]
+        if pd.isna(nome) or not str(nome).strip():
+            ids[posicao] = None
+            continue
+        ids[posicao] = _id_provisorio(nome)
+        provisorios[ids[posicao]] = str(nome).strip()
+    return ids, provisorios
+
+# Função para converter as falas de uma reunião em linhas da tabela `falas`
+def _linhas_falas(reuniao_id, df, sentimento, ids_locutores):
+    colunas = {c: df[c] if c in df.columns else None for c in COLUNAS_OPCIONAIS}
+    tabela = pd.DataFrame({
+        "reuniao_id": reuniao_id,
+        "ordem": range(len(df)),
+        "locutor_id": ids_locutores,
+        "inicio": df['inicio'],
+        "fim": df['fim'],
+        "duracao": df['duracao'],
+        "palavras": df['palavras'],
+        "texto": textos_falas(df),
+        **colunas,
+        "positivas": sentimento['positivas'].to_numpy(),
+        "negativas": sentimento['negativas'].to_numpy(),
+        "polaridade": sentimento['polaridade'].to_numpy()
+    })
+    return tabela.astype(object).where(tabela.notna(), None).itertuples(index=False, name=None)
+
+_lock_sincronizacao = threading.Lock()
+_estado_sincronizado = {}
+
+# Função para atualizar o banco com as reuniões novas, alteradas ou removidas
+def sincronizar_banco(diretorio=DIRETORIO_SAIDAS, caminho=None):
+    """Deixa o banco igual ao diretório de reuniões.
+
+    Cada reunião guarda a versão do arquivo de origem; só as que mudaram são
+    regravadas. Se nada mudou desde a última sincronização deste processo, o
+    banco nem é aberto.
+
+    Returns:
+        Dicionário com o número de reuniões inseridas, atualizadas e removidas.
+    """
+    caminho = caminho or arquivo_banco(diretorio)
+    fontes = {}
+    for nome, artefatos in listar_reunioes(diretorio).items():
+        file_path = caminho_fonte(artefatos)
+        # O léxico de sentimento faz parte da versão: alterá-lo regrava as falas
+        fontes[nome] = (file_path, json.dumps([*versao_falas(file_path), VERSAO_LEXICO]))
+    resultado = {"inseridas": 0, "atualizadas": 0, "removidas": 0}
+    provisorios = {}
+
+    with _lock_sincronizacao:
+        if _estado_sincronizado.get(caminho) == fontes and os.path.exists(caminho):
+            return resultado
+
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        con = sqlite3.connect(caminho)
+        try:
+            if con.execute("PRAGMA user_version").fetchone()[0] != VERSAO_ESQUEMA:
+                con.executescript("DROP TABLE IF EXISTS falas; DROP TABLE IF EXISTS reunioes; "
+                                  "DROP TABLE IF EXISTS locutores;")
+                con.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+            con.executescript(ESQUEMA + ESQUEMA_EXTRACOES)
+            with con:
+                existentes = {nome: (id_, arquivo, versao) for id_, nome, arquivo, versao
+                              in con.execute("SELECT id, nome, arquivo, versao FROM reunioes")}
+                for nome in existentes.keys() - fontes.keys():
+                    con.execute("DELETE FROM falas WHERE reuniao_id = ?", (existentes[nome][0],))
+                    con.execute("DELETE FROM reunioes WHERE id = ?", (existentes[nome][0],))
+                    resultado["removidas"] += 1
+
+                for nome, (file_path, versao) in fontes.items():
+                    anterior = existentes.get(nome)
+                    if anterior and anterior[1:] == (file_path, versao):
+                        continue
+                    df = carregar_falas(file_path)
+                    ids, novos = _ids_locutores(df)
+                    provisorios.update(novos)
+                    dia, mes = data_reuniao(nome)
+                    duracao = float(df['fim'].max()) if len(df) else 0.0
+                    if anterior:
+                        con.execute("DELETE FROM falas WHERE reuniao_id = ?", (anterior[0],))
+                        con.execute("UPDATE reunioes SET arquivo = ?, versao = ?, dia = ?, mes = ?, falas = ?, "
+                                    "duracao_s = ? WHERE id = ?",
+                                    (file_path, versao, dia, mes, len(df), duracao, anterior[0]))
+                        reuniao_id = anterior[0]
+                        resultado["atualizadas"] += 1
+                    else:
+                        reuniao_id = con.execute(
+                            "INSERT INTO reunioes (nome, arquivo, versao, dia, mes, falas, duracao_s) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (nome, file_path, versao, dia, mes, len(df), duracao)
+                        ).lastrowid
+                        resultado["inseridas"] += 1
+                    con.executemany(
+                        "INSERT INTO falas (reuniao_id, ordem, locutor_id, inicio, fim, duracao, palavras, texto, "
+                        "intencao_do_locutor, foco_da_fala, sentimento_tom, positivas, negativas, polaridade) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        _linhas_falas(reuniao_id, df, sentimento_reuniao(file_path), ids)
+                    )
+                if any(resultado.values()):
+                    # Registro de locutores (gravado pela ingestão) mais os provisórios ainda em uso
+                    registro = carregar_registro(os.path.join(diretorio, NOME_ARQUIVO_LOCUTORES))
+                    con.execute("DELETE FROM locutores WHERE id > 0")
+                    con.executemany("INSERT INTO locutores (id, nome, apelidos) VALUES (?, ?, ?)", [
+                        (r["id"], r["nome"], json.dumps(r["apelidos"], ensure_ascii=False))
+                        for r in registro.para_dict()["locutores"]
+                    ])
+                    con.executemany("INSERT OR IGNORE INTO locutores (id, nome, apelidos) VALUES (?, ?, '[]')",
+                                    provisorios.items())
+                    con.execute("DELETE FROM locutores WHERE id < 0 AND id NOT IN "
+                                "(SELECT locutor_id FROM falas WHERE locutor_id IS NOT NULL)")
+            if any(resultado.values()):
+                con.execute("ANALYZE")
+        finally:
+            con.close()
+        _estado_sincronizado[caminho] = fontes
+    return resultado
+
+# Função para abrir o banco somente para leitura (consultas livres não podem alterá-lo)
+def _conexao_leitura(caminho):
+    con = sqlite3.connect(f"file:{caminho}?mode=ro", uri=True, check_same_thread=False)
+    con.execute("PRAGMA query_only = ON")
+    return con
+
+# Função para executar uma consulta SQL somente leitura
+def consultar_sql(sql, parametros=None, diretorio=DIRETORIO_SAIDAS, caminho=None, limite=LIMITE_LINHAS,
+                  tempo_maximo=TEMPO_MAXIMO_CONSULTA):
+    """Executa `sql` no banco sincronizado com `diretorio`.
+
+    Args:
+        sql: Uma única instrução SQL; parâmetros nomeados no formato `:nome`.
+        parametros: Dicionário com os valores dos parâmetros.
+        limite: Número máximo de linhas lidas.
+        tempo_maximo: Segundos até a consulta ser interrompida (execução e
+            leitura das linhas).
+
+    Returns:
+        Tupla (DataFrame, truncado, segundos). TimeoutError se a consulta
+        passa de `tempo_maximo`.
+    """
+    caminho = caminho or arquivo_banco(diretorio)
+    sincronizar_banco(diretorio, caminho)
+    con = _conexao_leitura(caminho)
+    inicio = time.perf_counter()
+    prazo = inicio + tempo_maximo
+    # Um valor verdadeiro devolvido pelo handler interrompe a instrução em andamento
+    con.set_progress_handler(lambda: time.perf_counter() > prazo, INSTRUCOES_POR_VERIFICACAO)
+    try:
+        cursor = con.execute(sql, parametros or {})
+        linhas = cursor.fetchmany(limite + 1)
+        segundos = time.perf_counter() - inicio
+        colunas = [d[0] for d in cursor.description] if cursor.description else []
+    except sqlite3.OperationalError:
+        if time.perf_counter() > prazo:
+            raise TimeoutError(f"Consulta interrompida após {tempo_maximo:g}s")
+        raise
+    finally:
+        con.close()
+    return pd.DataFrame(linhas[:limite], columns=colunas), len(linhas) > limite, segundos
+
+# Função para converter os parâmetros de uma consulta pronta para os tipos esperados
+def parametros_consulta(nome, valores):
+    tipos = CONSULTAS[nome]["parametros"]
+    faltando = [p for p in tipos if valores.get(p) in (None, "")]
+    if faltando:
+        raise ValueError(f"Parâmetros obrigatórios ausentes: {', '.join(faltando)}")
+    try:
+        return {p: tipo(valores[p]) for p, tipo in tipos.items()}
+    except ValueError:
+        raise ValueError(f"Parâmetros inválidos para a consulta '{nome}'")
+
+# Função para executar uma das consultas prontas
+def executar_consulta(nome, valores=None, diretorio=DIRETORIO_SAIDAS, caminho=None):
+    if nome not in CONSULTAS:
+        raise KeyError(f"Consulta desconhecida: {nome}")
+    parametros = parametros_consulta(nome, valores or {})
+    return consultar_sql(CONSULTAS[nome]["sql"], parametros, diretorio, caminho)
+
+# Função para listar valores distintos de uma coluna (usado nos seletores de parâmetros)
+def valores_distintos(coluna, diretorio=DIRETORIO_SAIDAS, caminho=None):
+    tabela, campo = {"locutor": ("locutores", "nome"), "reuniao": ("reunioes", "nome")}[coluna]
+    df, _, _ = consultar_sql(f"SELECT DISTINCT {campo} FROM {tabela} WHERE {campo} IS NOT NULL ORDER BY {campo}",
+                             diretorio=diretorio, caminho=caminho)
+    return df.iloc[:, 0].tolist()
+
+# Função para descrever as tabelas do banco (nome, colunas e tipos)
+def esquema_banco(diretorio=DIRETORIO_SAIDAS, caminho=None):
+    caminho = caminho or arquivo_banco(diretorio)
+    sincronizar_banco(diretorio, caminho)
+    con = _conexao_leitura(caminho)
+    try:
+        return {
+            tabela: [(coluna, tipo) for _, coluna, tipo, *_ in con.execute(f"PRAGMA table_info({tabela})")]
+            for tabela in ("reunioes", "falas", "locutores", "acoes", "decisoes", "extracoes")
+        }
+    finally:
+        con.close()
@@ -0,0 +1,108 @@
+import os
+import pickle
+from functools import lru_cache
+
+import numpy as np
+
+from nucleo.ao_vivo import PADRAO_TOKEN, IndiceBusca
+from nucleo.dados import DIRETORIO_SAIDAS, armazem_diretorio, carregar_falas, versao_falas
+from nucleo.repositorio import caminho_fonte, listar_reunioes, textos_falas
+from nucleo.tokenizacao import termo_valido
+
+# Índice pronto gravado pela ingestão (python -m nucleo.ingestao)
+ARQUIVO_INDICE_BUSCA = "indice_busca.pkl"
+
+class BuscaCorpus:
+    """Índice invertido de todas as falas do corpus.
+
+    As falas são numeradas na ordem (reunião, fala); a consulta devolve os
+    números e as colunas ficam em arrays para montar os resultados.
+    """
+
+    def __init__(self, reunioes):
+        self.indice = IndiceBusca()
+        self.nomes = list(reunioes)
+        partes = {"reuniao": [], "locutor": [], "inicio": [], "fim": [], "texto": []}
+        id_fala = 0
+        for posicao, (nome, df) in enumerate(reunioes.items()):
+            textos = textos_falas(df)
+            for texto in textos:
+                self.indice.adicionar(id_fala, texto)
+                id_fala += 1
+            partes["reuniao"].append(np.full(len(df), posicao))
+            partes["locutor"].append(df['locutor'].astype(str).to_numpy())
+            partes["inicio"].append(df['inicio'].to_numpy(dtype=np.float64))
+            partes["fim"].append(df['fim'].to_numpy(dtype=np.float64))
+            partes["texto"].append(textos.to_numpy())
+        self.colunas = {
+            coluna: np.concatenate(valores) if valores else np.empty(0)
+            for coluna, valores in partes.items()
+        }
+
+    # Função para buscar falas com todos os termos, opcionalmente em uma reunião
+    def buscar(self, consulta, reuniao=None, limite=None):
+        ids = np.asarray(self.indice.buscar(consulta), dtype=np.int64)
+        if reuniao is not None:
+            if reuniao not in self.nomes:
+                return 0, []
+            ids = ids[self.colunas["reuniao"][ids] == self.nomes.index(reuniao)]
+        total = len(ids)
+        resultados = [
+            {
+                "reuniao": self.nomes[self.colunas["reuniao"][i]],
+                "locutor": self.colunas["locutor"][i],
+                "inicio": float(self.colunas["inicio"][i]),
+                "fim": float(self.colunas["fim"][i]),
+                "texto": self.colunas["texto"][i]
+            }
+            for i in ids[:limite]
+        ]
+        return total, resultados
+
+    # Função para ordenar as falas pela relevância para uma pergunta em linguagem natural
+    def relevantes(self, consulta, limite=20):
+        """Pontua as falas que têm qualquer termo da consulta pela soma do idf
+        dos termos (stopwords e termos curtos são ignorados).
+
+        Returns:
+            Array com os números das até `limite` falas mais relevantes, da
+            mais para a menos relevante (vazio se nenhum termo aparece).
+        """
+        n_falas = len(self.colunas["texto"])
+        termos = [t for t in set(PADRAO_TOKEN.findall(consulta.lower())) if termo_valido(t)]
+        listas = [np.asarray(self.indice.postings[t], dtype=np.int64) for t in termos if t in self.indice.postings]
+        if not listas:
+            return np.empty(0, dtype=np.int64)
+        pesos = [np.full(len(lista), np.log(n_falas / len(lista))) for lista in listas]
+        pontos = np.bincount(np.concatenate(listas), weights=np.concatenate(pesos), minlength=n_falas)
+        candidatos = np.flatnonzero(pontos)
+        ordem = np.argsort(-pontos[candidatos], kind="stable")[:limite]
+        return candidatos[ordem]
+
+# Função para identificar o conteúdo do índice: (nome, caminho, versão) de cada reunião
+def chave_busca(reunioes):
+    fontes = []
+    for nome, artefatos in reunioes.items():
+        file_path = os.path.abspath(caminho_fonte(artefatos))
+        fontes.append((nome, file_path, versao_falas(file_path)))
+    return tuple(fontes)
+
+# Função para ler o índice gravado pela ingestão, se ainda corresponder aos arquivos
+def _indice_armazenado(fontes, diretorio_armazem):
+    try:
+        with open(os.path.join(diretorio_armazem, ARQUIVO_INDICE_BUSCA), "rb") as file:
+            dados = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    return dados["indice"] if dados["chave"] == fontes else None
+
+@lru_cache(maxsize=4)
+def _busca_corpus(fontes, diretorio_armazem):
+    indice = _indice_armazenado(fontes, diretorio_armazem)
+    if indice is None:
+        indice = BuscaCorpus({nome: carregar_falas(file_path) for nome, file_path, _ in fontes})
+    return indice
+
+# Função para obter o índice de busca do corpus (refeito quando algum arquivo muda)
+def busca_corpus(diretorio=DIRETORIO_SAIDAS, diretorio_armazem=None):
+    return _busca_corpus(chave_busca(listar_reunioes(diretorio)), diretorio_armazem or armazem_diretorio(diretorio))
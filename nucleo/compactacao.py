@@ -0,0 +1,109 @@
+"""Compactação zstd do armazém da ingestão (dependência opcional: zstandard).
+
+Com o zstandard instalado, as falas de cada arquivo vão para o armazém como
+pickle comprimido (.pkl.zst) em vez de pickle puro. A marcação do HTML e as
+colunas repetidas do XLSX já ficam de fora no parse. O zstd reduz o que sobra:
+nomes de locutores, rótulos de análise e o vocabulário das falas.
+
+Opcionalmente, um dicionário treinado com amostras de todas as reuniões
+(dicionario.zstd no armazém) é usado na compressão. Cada quadro zstd guarda
+o id do dicionário, então arquivos com e sem dicionário convivem no mesmo
+armazém.
+"""
+import os
+import pickle
+from functools import lru_cache
+
+# Nível de compressão (a descompressão tem a mesma velocidade em qualquer nível)
+NIVEL_ZSTD = 12
+
+# Tamanho do dicionário e dos blocos usados como amostras no treino
+TAMANHO_DICIONARIO = 64 * 1024
+TAMANHO_AMOSTRA = 16 * 1024
+
+EXTENSAO_ZSTD = ".zst"
+ARQUIVO_DICIONARIO = "dicionario.zstd"
+
+# Função para verificar se a biblioteca zstandard está disponível
+def zstd_disponivel():
+    try:
+        import zstandard  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+# Função para treinar um dicionário com o conteúdo serializado de várias reuniões
+def treinar_dicionario(conteudos, tamanho=TAMANHO_DICIONARIO):
+    """Args:
+        conteudos: Lista de bytes (um por arquivo), divididos em blocos de
+            TAMANHO_AMOSTRA para o treino.
+
+    Returns:
+        Bytes do dicionário, ou None se as amostras não bastam para treinar.
+    """
+    import zstandard
+    amostras = [c[i:i + TAMANHO_AMOSTRA] for c in conteudos for i in range(0, len(c), TAMANHO_AMOSTRA)]
+    try:
+        return zstandard.train_dictionary(tamanho, amostras, level=NIVEL_ZSTD).as_bytes()
+    except zstandard.ZstdError:
+        return None
+
+# Função para comprimir bytes (com o dicionário, se houver)
+def comprimir(dados, dicionario=None, nivel=NIVEL_ZSTD):
+    import zstandard
+    dict_data = zstandard.ZstdCompressionDict(dicionario) if dicionario else None
+    return zstandard.ZstdCompressor(level=nivel, dict_data=dict_data).compress(dados)
+
+@lru_cache(maxsize=8)
+def _dicionario(file_path, versao):
+    import zstandard
+    with open(file_path, "rb") as file:
+        return zstandard.ZstdCompressionDict(file.read())
+
+# Função para ler o dicionário de um armazém (None se não existe)
+def ler_dicionario(diretorio):
+    file_path = os.path.join(diretorio, ARQUIVO_DICIONARIO)
+    try:
+        with open(file_path, "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+# Função para descomprimir um arquivo .zst do armazém
+def ler_comprimido(file_path):
+    """Returns:
+        Bytes descomprimidos. ValueError se o arquivo foi comprimido com um
+        dicionário que não está mais no armazém ou se está corrompido.
+    """
+    import zstandard
+    with open(file_path, "rb") as file:
+        dados = file.read()
+    try:
+        dict_id = zstandard.get_frame_parameters(dados).dict_id
+        dict_data = None
+        if dict_id:
+            caminho_dicionario = os.path.join(os.path.dirname(file_path), ARQUIVO_DICIONARIO)
+            stat = os.stat(caminho_dicionario)
+            dict_data = _dicionario(caminho_dicionario, (stat.st_mtime_ns, stat.st_size))
+            if dict_data.dict_id() != dict_id:
+                raise ValueError(f"Dicionário {dict_id} ausente do armazém")
+        return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(dados)
+    except (zstandard.ZstdError, FileNotFoundError) as e:
+        raise ValueError(f"Não foi possível descomprimir {os.path.basename(file_path)}: {e}")
+
+# Função para gravar um objeto como pickle, comprimido ou não (retorna o tamanho do pickle)
+def gravar_pickle(objeto, file_path, comprimido=False, dicionario=None):
+    dados = pickle.dumps(objeto, protocol=pickle.HIGHEST_PROTOCOL)
+    tamanho = len(dados)
+    if comprimido:
+        dados = comprimir(dados, dicionario)
+    with open(file_path, "wb") as file:
+        file.write(dados)
+    return tamanho
+
+# Função para ler os bytes do pickle de um arquivo do armazém (descomprimindo se preciso)
+def ler_pickle_bruto(file_path):
+    if file_path.endswith(EXTENSAO_ZSTD):
+        return ler_comprimido(file_path)
+    with open(file_path, "rb") as file:
+        return file.read()
@@ -0,0 +1,140 @@
+"""Conversa com memória sobre as transcrições.
+
+Cada pergunta recupera as falas mais relevantes do corpus (índice de busca,
+com as falas vizinhas de cada uma). Só as falas que ainda não estão no
+contexto da conversa são acrescentadas, então as perguntas seguintes
+reaproveitam o que já foi recuperado em vez de reenviar o corpus inteiro.
+
+O histórico vai literal enquanto couber em LIMITE_HISTORICO. Acima disso, os
+turnos antigos são resumidos em uma chamada e só os TURNOS_RECENTES últimos
+seguem literais.
+"""
+import time
+
+from nucleo.busca import busca_corpus, chave_busca
+from nucleo.dados import DIRETORIO_SAIDAS
+from nucleo.prompts import prompt_conversa, prompt_resumir_historico
+from nucleo.repositorio import formatar_hms, listar_reunioes
+
+# Falas recuperadas por pergunta e vizinhas incluídas antes e depois de cada uma
+FALAS_POR_PERGUNTA = 12
+JANELA_VIZINHAS = 2
+
+# Caracteres de trechos mantidos no contexto (os mais antigos saem primeiro)
+LIMITE_CONTEXTO = 60_000
+
+# Caracteres de histórico literal antes de resumir os turnos antigos
+LIMITE_HISTORICO = 6_000
+TURNOS_RECENTES = 4
+
+class Conversa:
+    """Estado de uma conversa: mensagens, contexto recuperado e resumo do histórico.
+
+    `falas` guarda os números das falas (na numeração de `BuscaCorpus`) na
+    ordem em que entraram no contexto. Se algum arquivo do corpus muda, a
+    numeração muda e o contexto é recuperado de novo.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_SAIDAS):
+        self.diretorio = diretorio
+        self.mensagens = []
+        self.turnos = []
+        self.resumo_historico = ""
+        self.falas = []
+        self._incluidas = set()
+        self._chave_corpus = None
+
+    # Função para formatar uma fala do contexto
+    @staticmethod
+    def _linha(busca, id_fala):
+        colunas = busca.colunas
+        return (f"{colunas['locutor'][id_fala]} ({formatar_hms(colunas['inicio'][id_fala])} - "
+                f"{formatar_hms(colunas['fim'][id_fala])}): {colunas['texto'][id_fala]}")
+
+    # Função para incluir as falas recuperadas (e as vizinhas da mesma reunião) que faltam no contexto
+    def _acrescentar(self, busca, ids):
+        reunioes = busca.colunas["reuniao"]
+        novas = []
+        for id_fala in ids:
+            for vizinha in range(max(0, id_fala - JANELA_VIZINHAS), min(len(reunioes), id_fala + JANELA_VIZINHAS + 1)):
+                if reunioes[vizinha] == reunioes[id_fala] and vizinha not in self._incluidas:
+                    self._incluidas.add(vizinha)
+                    novas.append(vizinha)
+        self.falas.extend(novas)
+
+        tamanhos = [len(self._linha(busca, i)) + 1 for i in self.falas]
+        excesso = sum(tamanhos) - LIMITE_CONTEXTO
+        removidas = 0
+        while excesso > 0 and removidas < len(self.falas) - len(novas):
+            excesso -= tamanhos[removidas]
+            self._incluidas.discard(self.falas[removidas])
+            removidas += 1
+        del self.falas[:removidas]
+        return len(novas)
+
+    # Função para montar o texto do contexto: trechos por reunião, na ordem das falas
+    def contexto(self, busca):
+        blocos, atual, anterior = [], None, None
+        for id_fala in sorted(self.falas):
+            reuniao = busca.nomes[busca.colunas["reuniao"][id_fala]]
+            if reuniao != atual:
+                blocos.append(f"\nTrechos da reunião '{reuniao}':")
+                atual = reuniao
+            elif id_fala != anterior + 1:
+                blocos.append("[...]")
+            blocos.append(self._linha(busca, id_fala))
+            anterior = id_fala
+        return "\n".join(blocos)
+
+    # Função para resumir os turnos antigos quando o histórico passa do limite
+    def _resumir_historico(self, model):
+        if sum(len(texto) for _, texto in self.turnos) <= LIMITE_HISTORICO or len(self.turnos) <= TURNOS_RECENTES:
+            return 0
+        antigos = self.turnos[:-TURNOS_RECENTES]
+        resposta = model.generate_content(prompt_resumir_historico(self.resumo_historico, antigos))
+        self.resumo_historico = resposta.text.strip()
+        self.turnos = self.turnos[-TURNOS_RECENTES:]
+        return 1
+
+    # Função para responder uma pergunta da conversa
+    def perguntar(self, model, question):
+        """Recupera o contexto que falta, resume o histórico se preciso e responde.
+
+        Returns:
+            Tupla (resposta, metricas): metricas com `caracteres_prompt`,
+            `falas_novas`, `falas_contexto`, `chamadas` e `segundos`.
+        """
+        inicio = time.perf_counter()
+        busca = busca_corpus(self.diretorio)
+        chave = chave_busca(listar_reunioes(self.diretorio))
+        if chave != self._chave_corpus:
+            self.falas, self._incluidas, self._chave_corpus = [], set(), chave
+
+        falas_novas = self._acrescentar(busca, busca.relevantes(question, FALAS_POR_PERGUNTA))
+        chamadas = self._resumir_historico(model)
+        prompt = prompt_conversa(question, self.contexto(busca), self.resumo_historico, self.turnos)
+        resposta = model.generate_content(prompt).text
+        chamadas += 1
+
+        self.turnos += [("usuario", question), ("assistente", resposta)]
+        metricas = {
+            "caracteres_prompt": len(prompt),
+            "falas_novas": falas_novas,
+            "falas_contexto": len(self.falas),
+            "chamadas": chamadas,
+            "segundos": time.perf_counter() - inicio
+        }
+        self.mensagens += [
+            {"papel": "usuario", "texto": question},
+            {"papel": "assistente", "texto": resposta, "metricas": metricas}
+        ]
+        return resposta, metricas
+
+    # Função para registrar na conversa uma resposta calculada localmente (nucleo/roteador.py)
+    def registrar_resposta_local(self, question, resposta):
+        self.turnos += [("usuario", question), ("assistente", resposta["texto"])]
+        self.mensagens += [
+            {"papel": "usuario", "texto": question},
+            {"papel": "assistente", "texto": resposta["texto"],
+             "metricas": {"intencao": resposta["intencao"], "segundos": resposta["segundos"]}}
+        ]
@@ -0,0 +1,227 @@
+import html
+import json
+import os
+import pickle
+import re
+from functools import lru_cache
+
+import pandas as pd
+
+from nucleo.compactacao import EXTENSAO_ZSTD, ler_comprimido
+from nucleo.locutores import aplicar_registro, arquivo_locutores, versao_registro
+
+# Diretório de saída com as transcrições
+DIRETORIO_BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRETORIO_SAIDAS = os.path.join(DIRETORIO_BASE, "saidas")
+
+# Armazém otimizado gravado pelo comando de ingestão (python -m nucleo.ingestao)
+DIRETORIO_ARMAZEM = os.path.join(DIRETORIO_BASE, "cache", "armazem")
+ARQUIVO_MANIFESTO = "manifesto.json"
+
+# Projetos: cada um em projetos/<nome>/, com saidas/ e cache/ próprios (nucleo/projetos.py)
+DIRETORIO_PROJETOS = os.path.join(DIRETORIO_BASE, "projetos")
+
+# Colunas esperadas na planilha de falas
+COLUNAS_ESPERADAS = ['locutor', 'inicio', 'fim', 'duracao', 'palavras']
+
+# Padrão de cada fala nos arquivos html_*.html
+PADRAO_FALA_HTML = re.compile(
+    r"<p><b>(?P<locutor>[^<]*)</b>\s*<span class='timestamp'>"
+    r"\((?P<inicio>\d+:\d{2}:\d{2}) - (?P<fim>\d+:\d{2}:\d{2})\):</span><br>"
+    r"(?P<texto>.*?)</p>",
+    re.DOTALL
+)
+
+# Função para extrair informações do nome do arquivo
+def extrair_info_arquivo(filename):
+    pattern = r"(html|excel)_(.+)\.(html|xlsx)"
+    match = re.match(pattern, filename)
+    if match:
+        file_type = match.group(1)
+        meeting_name = match.group(2)
+        return {
+            "type": file_type,
+            "meeting_name": meeting_name
+        }
+    return None
+
+# Função para obter o diretório de cache de um diretório de transcrições
+def diretorio_cache(diretorio=DIRETORIO_SAIDAS):
+    """projetos/<nome>/saidas usa projetos/<nome>/cache; qualquer outro
+    diretório usa o cache/ da raiz."""
+    diretorio = os.path.abspath(diretorio)
+    if os.path.dirname(os.path.dirname(diretorio)) == DIRETORIO_PROJETOS:
+        return os.path.join(os.path.dirname(diretorio), "cache")
+    return os.path.join(DIRETORIO_BASE, "cache")
+
+# Função para obter o armazém da ingestão de um diretório de transcrições
+def armazem_diretorio(diretorio=DIRETORIO_SAIDAS):
+    return os.path.join(diretorio_cache(diretorio), "armazem")
+
+# Função para listar arquivos de um tipo no diretório de saída
+def listar_arquivos(extensao, diretorio=DIRETORIO_SAIDAS):
+    if not os.path.exists(diretorio):
+        return []
+    return sorted(f for f in os.listdir(diretorio) if f.endswith(extensao))
+
+# Função para obter a versão de um arquivo (muda sempre que o arquivo é alterado)
+def versao_arquivo(file_path):
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+# Função para padronizar tipos e preencher colunas derivadas das falas
+def normalizar_falas(df):
+    """Padroniza as falas lidas de qualquer formato (altera `df`).
+
+    Converte os tempos e contagens para números, remove espaços dos nomes dos
+    locutores e preenche `duracao`, `palavras` e `frase_corrigida` quando
+    faltam.
+    """
+    for coluna in ('inicio', 'fim', 'duracao', 'palavras'):
+        if coluna in df.columns:
+            df[coluna] = pd.to_numeric(df[coluna], errors='coerce')
+    if 'locutor' in df.columns:
+        df['locutor'] = df['locutor'].where(df['locutor'].isna(), df['locutor'].astype(str).str.strip())
+    if 'inicio' in df.columns and 'fim' in df.columns:
+        duracao = (df['fim'] - df['inicio']).round(2)
+        df['duracao'] = df['duracao'].fillna(duracao) if 'duracao' in df.columns else duracao
+    if 'paragrafo' in df.columns:
+        palavras = df['paragrafo'].fillna("").astype(str).str.split().str.len()
+        df['palavras'] = df['palavras'].fillna(palavras) if 'palavras' in df.columns else palavras
+        if 'frase_corrigida' not in df.columns:
+            df['frase_corrigida'] = df['paragrafo']
+    return df
+
+# Função para validar as falas antes de gravá-las no armazém
+def validar_falas(df):
+    """Verifica colunas obrigatórias e tempos das falas.
+
+    Returns:
+        Tupla (erros, avisos). Com erros o arquivo não pode ser usado.
+    """
+    faltando = [c for c in COLUNAS_ESPERADAS if c not in df.columns]
+    if faltando:
+        return [f"colunas ausentes: {', '.join(faltando)}"], []
+    avisos = []
+    sem_locutor = int(df['locutor'].isna().sum())
+    if sem_locutor:
+        avisos.append(f"{sem_locutor} fala(s) sem locutor")
+    sem_tempo = int(df[['inicio', 'fim']].isna().any(axis=1).sum())
+    if sem_tempo:
+        avisos.append(f"{sem_tempo} fala(s) sem início ou fim")
+    invertidas = int((df['fim'] < df['inicio']).sum())
+    if invertidas:
+        avisos.append(f"{invertidas} fala(s) terminam antes de começar")
+    return [], avisos
+
+# Função para ler as falas de um arquivo sem cache (Excel: primeira planilha; HTML: falas)
+def ler_falas_arquivo(file_path):
+    if file_path.endswith('.html'):
+        with open(file_path, 'r', encoding='utf-8') as file:
+            falas, _ = extrair_falas_html(file.read())
+        # O HTML já traz o texto revisado (frase_corrigida é preenchida na normalização)
+        df = pd.DataFrame(falas, columns=["locutor", "inicio", "fim", "paragrafo", "palavras", "duracao"])
+    else:
+        # Só a primeira planilha: as de detalhe ('Sentencas', 'Palavras') são muito maiores
+        df = pd.read_excel(file_path, sheet_name=0)
+    return normalizar_falas(df)
+
+@lru_cache(maxsize=64)
+def _ler_falas(file_path, versao):
+    return ler_falas_arquivo(file_path)
+
+@lru_cache(maxsize=4)
+def _ler_manifesto(file_path, versao):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)["arquivos"]
+
+# Função para ler o manifesto do armazém ({caminho de origem: registro})
+def manifesto_armazem(diretorio=DIRETORIO_ARMAZEM):
+    file_path = os.path.join(diretorio, ARQUIVO_MANIFESTO)
+    try:
+        return _ler_manifesto(file_path, versao_arquivo(file_path))
+    except (FileNotFoundError, ValueError, KeyError):
+        return {}
+
+@lru_cache(maxsize=512)
+def _ler_falas_armazem(file_path):
+    # O nome do arquivo é o hash do conteúdo de origem, então nunca fica desatualizado
+    if file_path.endswith(EXTENSAO_ZSTD):
+        return pickle.loads(ler_comprimido(file_path))
+    return pd.read_pickle(file_path)
+
+# Função para carregar as falas já ingeridas, se o arquivo de origem não mudou
+def carregar_falas_armazem(file_path, versao, diretorio=DIRETORIO_ARMAZEM):
+    registro = manifesto_armazem(diretorio).get(os.path.abspath(file_path))
+    if not registro or tuple(registro["versao"]) != versao:
+        return None
+    try:
+        return _ler_falas_armazem(os.path.join(diretorio, registro["armazem"]))
+    except (FileNotFoundError, ImportError, ValueError):
+        # Arquivo apagado, zstandard ausente ou dicionário perdido: lê a origem
+        return None
+
+# Função para carregar as falas sem resolver os locutores (armazém ou leitura direta)
+def carregar_falas_brutas(file_path, versao):
+    df = carregar_falas_armazem(file_path, versao, armazem_diretorio(os.path.dirname(file_path)))
+    if df is not None:
+        return df
+    return _ler_falas(file_path, versao)
+
+@lru_cache(maxsize=512)
+def _falas_resolvidas(file_path, versao, versao_locutores):
+    return aplicar_registro(carregar_falas_brutas(file_path, versao), arquivo_locutores(file_path))
+
+# Função para obter a versão das falas: arquivo de origem e registro de locutores
+def versao_falas(file_path):
+    """Chave para caches derivados de `carregar_falas`: muda quando o arquivo ou
+    o registro de locutores (apelidos) do diretório muda."""
+    return versao_arquivo(file_path) + versao_registro(arquivo_locutores(file_path))
+
+# Função para carregar as falas de um arquivo de transcrição (Excel ou HTML)
+def carregar_falas(file_path):
+    """Carrega as falas de uma reunião, preferindo o armazém da ingestão.
+
+    Sem uma versão ingerida atual, o arquivo é lido diretamente (com cache
+    pela versão). Os locutores são resolvidos pelo registro de apelidos:
+    `locutor` traz o nome canônico e `locutor_id` o id inteiro estável. O
+    DataFrame retornado é compartilhado: não altere.
+    """
+    return _falas_resolvidas(file_path, versao_arquivo(file_path), versao_registro(arquivo_locutores(file_path)))
+
+# Função para converter "HH:MM:SS" em segundos
+def hms_para_segundos(valor):
+    horas, minutos, segundos = valor.split(":")
+    return int(horas) * 3600 + int(minutos) * 60 + float(segundos)
+
+# Função para montar o registro de uma fala no formato das planilhas
+def montar_fala(locutor, inicio, fim, paragrafo):
+    return {
+        "locutor": locutor,
+        "inicio": inicio,
+        "fim": fim,
+        "paragrafo": paragrafo,
+        "palavras": len(paragrafo.split()),
+        "duracao": round(fim - inicio, 2)
+    }
+
+# Função para extrair as falas de um trecho HTML
+def extrair_falas_html(conteudo):
+    """Extrai as falas completas de um trecho de transcrição em HTML.
+
+    Returns:
+        Tupla (falas, posicao). `falas` é uma lista de dicionários no formato
+        de `montar_fala`; `posicao` é o índice logo após a última fala
+        completa, para que um trecho incompleto possa ser retomado depois.
+    """
+    falas = []
+    posicao = 0
+    for match in PADRAO_FALA_HTML.finditer(conteudo):
+        falas.append(montar_fala(
+            html.unescape(match.group("locutor").strip()),
+            hms_para_segundos(match.group("inicio")),
+            hms_para_segundos(match.group("fim")),
+            html.unescape(match.group("texto").strip())
+        ))
+        posicao = match.end()
+    return falas, posicao
@@ -0,0 +1,105 @@
+"""Downloads por link, sem passar o conteúdo pela sessão do Streamlit.
+
+`st.download_button` envia o arquivo inteiro pelo websocket a cada execução da
+página. Aqui o arquivo é publicado uma vez em static/downloads/, que o
+Streamlit serve com `server.enableStaticServing` (ETag, Last-Modified e Range
+do tornado), e a página mostra só um link. A API (api/servidor.py) serve os
+mesmos arquivos em /api/reunioes/{nome}/arquivos/{formato} e
+/api/transcricoes.zip.
+
+Cada arquivo fica em static/downloads/<chave>/<versão>/<nome>: <chave> é o
+hash do que o download representa (por padrão, o caminho de origem) e
+<versão> o do caminho, data e tamanho. Por isso cada URL tem sempre o mesmo
+conteúdo. Ao publicar uma versão nova, as anteriores da mesma chave são
+apagadas. A publicação usa link físico quando o sistema de arquivos permite
+(sem cópia) e é feita sob uma trava por chave.
+
+O Streamlit serve arquivos de até 200 MB por esse caminho, e os tipos que
+não são imagem, PDF, XML ou JSON saem como text/plain. O atributo `download`
+do link faz o navegador salvar o arquivo mesmo assim.
+"""
+import hashlib
+import html
+import os
+import shutil
+import tempfile
+import threading
+from urllib.parse import quote
+
+from nucleo.dados import DIRETORIO_BASE
+
+# Pasta servida pelo Streamlit (ao lado de app.py) e URL relativa dela
+DIRETORIO_STATIC = os.path.join(DIRETORIO_BASE, "static")
+DIRETORIO_DOWNLOADS = os.path.join(DIRETORIO_STATIC, "downloads")
+URL_STATIC = "app/static"
+
+# Uma publicação por vez para cada chave: a remoção das versões anteriores não
+# apaga a pasta de uma versão que outra sessão está publicando
+_travas = {}
+_lock_travas = threading.Lock()
+
+# Função para calcular um hash curto
+def _hash(texto):
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:16]
+
+# Função para obter a trava de publicação de uma chave de download
+def _trava(origem):
+    with _lock_travas:
+        return _travas.setdefault(origem, threading.Lock())
+
+# Função para gravar o arquivo no destino de forma atômica (link físico ou cópia)
+def _publicar(file_path, destino):
+    try:
+        os.link(file_path, destino)
+        return
+    except FileExistsError:
+        return  # Já publicado por outra sessão ou processo
+    except OSError:
+        pass
+    fd, temporario = tempfile.mkstemp(dir=os.path.dirname(destino), suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copy2(file_path, temporario)
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+# Função para publicar um arquivo em static/downloads/ e obter a URL dele
+def publicar_download(file_path, nome=None, chave=None):
+    """Args:
+        nome: Nome do arquivo baixado (padrão: o nome de origem).
+        chave: Identifica o download entre versões quando o caminho de origem
+            muda a cada versão (ex.: exportações em cache).
+
+    Returns:
+        URL relativa à página (app/static/downloads/...).
+    """
+    file_path = os.path.abspath(file_path)
+    nome = nome or os.path.basename(file_path)
+    stat = os.stat(file_path)
+    origem = os.path.join(DIRETORIO_DOWNLOADS, _hash(chave or file_path))
+    versao = _hash(f"{file_path}:{stat.st_mtime_ns}:{stat.st_size}")
+    destino = os.path.join(origem, versao, nome)
+
+    if not os.path.exists(destino):
+        with _trava(origem):
+            if not os.path.exists(destino):
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                _publicar(file_path, destino)
+                for anterior in os.listdir(origem):
+                    if anterior != versao:
+                        shutil.rmtree(os.path.join(origem, anterior), ignore_errors=True)
+
+    caminho = os.path.relpath(destino, DIRETORIO_STATIC).replace(os.sep, "/")
+    return f"{URL_STATIC}/{quote(caminho)}"
+
+# Função para montar o link de download (HTML para st.markdown)
+def link_download(url, nome, rotulo="⬇️ Baixar"):
+    return (f'<a href="{html.escape(url)}" download="{html.escape(nome)}" target="_self">'
+            f'{html.escape(rotulo)}</a>')
+
+# Função para apagar todos os arquivos publicados
+def limpar_downloads():
+    shutil.rmtree(DIRETORIO_DOWNLOADS, ignore_errors=True)
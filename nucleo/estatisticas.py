@@ -0,0 +1,54 @@
+import pandas as pd
+
+# Colunas mínimas para calcular as estatísticas de uma reunião
+COLUNAS_ESTATISTICAS = ['locutor', 'inicio', 'fim', 'duracao', 'palavras']
+
+# Função para calcular as métricas principais de uma reunião
+def metricas_reuniao(df):
+    return {
+        "participantes": int(df['locutor'].nunique()),
+        "falas": int(len(df)),
+        "duracao_min": float(df['duracao'].sum() / 60),
+        "palavras": int(df['palavras'].sum())
+    }
+
+# Função para resumir as falas por participante
+def resumo_por_locutor(df):
+    """Agrega falas, palavras, tempo de fala e velocidade por participante.
+
+    Returns:
+        DataFrame indexado pelo locutor, ordenado pelo número de falas.
+    """
+    wpm = ((df['palavras'] / df['duracao']) * 60).fillna(0).clip(0, 500)
+    grupos = df.groupby('locutor')
+    resumo = pd.DataFrame({
+        "falas": grupos.size(),
+        "palavras_total": grupos['palavras'].sum(),
+        "palavras_media": grupos['palavras'].mean(),
+        "duracao_total_s": grupos['duracao'].sum(),
+        "duracao_media_s": grupos['duracao'].mean(),
+        "wpm_medio": wpm.groupby(df['locutor']).mean()
+    })
+    total = resumo['duracao_total_s'].sum()
+    resumo['percentual_tempo'] = resumo['duracao_total_s'] / total * 100 if total else 0.0
+    return resumo.sort_values('falas', ascending=False)
+
+# Função para consolidar o resumo por participante de várias reuniões
+def resumo_corpus(reunioes):
+    """Soma o resumo de cada reunião em `reunioes` ({nome: DataFrame de falas}).
+
+    Returns:
+        Tupla (metricas por reunião, resumo por locutor no corpus).
+    """
+    metricas = {nome: metricas_reuniao(df) for nome, df in reunioes.items()}
+    resumos = [resumo_por_locutor(df).assign(reunioes=1) for df in reunioes.values()]
+    if not resumos:
+        return metricas, resumo_por_locutor(pd.DataFrame(columns=COLUNAS_ESTATISTICAS))
+
+    somas = pd.concat(resumos).groupby(level=0)[
+        ['falas', 'palavras_total', 'duracao_total_s', 'reunioes']
+    ].sum()
+    somas['palavras_media'] = somas['palavras_total'] / somas['falas']
+    somas['duracao_media_s'] = somas['duracao_total_s'] / somas['falas']
+    somas['percentual_tempo'] = somas['duracao_total_s'] / somas['duracao_total_s'].sum() * 100
+    return metricas, somas.sort_values('falas', ascending=False)
@@ -0,0 +1,187 @@
+import hashlib
+import html
+import os
+import shutil
+import tempfile
+import zipfile
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from nucleo.dados import DIRETORIO_BASE, DIRETORIO_SAIDAS, carregar_falas, diretorio_cache, versao_falas
+from nucleo.locutores import NOME_ARQUIVO_LOCUTORES
+from nucleo.repositorio import caminho_fonte, formatar_hms, listar_reunioes, textos_falas
+
+# Diretório com as exportações geradas sob demanda
+DIRETORIO_EXPORTACOES = os.path.join(DIRETORIO_BASE, "cache", "exportacoes")
+
+# Função para obter o diretório de exportações de um diretório de transcrições
+def diretorio_exportacoes(diretorio=DIRETORIO_SAIDAS):
+    return os.path.join(diretorio_cache(diretorio), "exportacoes")
+
+# Nome da planilha de falas nos arquivos excel_*.xlsx
+PLANILHA_FALAS = "Resultado Processado"
+
+# Cabeçalho e rodapé dos arquivos html_*.html
+CABECALHO_HTML = """
+    <html>
+    <head>
+        <title>Transcrição da Reunião</title>
+        <style>
+            body {
+                font-family: sans-serif;
+                line-height: 1.6;
+                margin: 20px;
+                background-color: #f4f4f4;
+                color: #333;
+            }
+            h1 {
+                color: #0056b3;
+                border-bottom: 2px solid #0056b3;
+                padding-bottom: 10px;
+                margin-bottom: 20px;
+            }
+            p {
+                margin-bottom: 15px;
+                padding: 10px;
+                background-color: #fff;
+                border-radius: 5px;
+                box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+            }
+            b {
+                color: #555;
+            }
+            .timestamp {
+                font-size: 0.9em;
+                color: #888;
+                margin-left: 10px;
+            }
+        </style>
+    </head>
+    <body>
+    <h1>Transcrição da Reunião</h1>
+    """
+
+RODAPE_HTML = """
+    </body>
+    </html>
+    """
+
+# Função para gerar o HTML da transcrição em partes (sem montar o documento inteiro)
+def iterar_html(df):
+    yield CABECALHO_HTML
+    for locutor, inicio, fim, texto in zip(df['locutor'], df['inicio'], df['fim'], textos_falas(df)):
+        yield (f"<p><b>{html.escape(str(locutor), quote=False)}</b> "
+               f"<span class='timestamp'>({formatar_hms(inicio)} - {formatar_hms(fim)}):</span>"
+               f"<br>{html.escape(texto, quote=False)}</p>\n")
+    yield RODAPE_HTML
+
+# Função para escrever o HTML da transcrição em um arquivo aberto
+def escrever_html(df, destino):
+    for parte in iterar_html(df):
+        destino.write(parte)
+
+# Função para escrever a planilha de falas em modo write-only (memória constante)
+def escrever_xlsx(df, file_path):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(PLANILHA_FALAS)
+    fonte_cabecalho = Font(bold=True)
+
+    cabecalho = []
+    for coluna in df.columns:
+        celula = WriteOnlyCell(ws, value=coluna)
+        celula.font = fonte_cabecalho
+        cabecalho.append(celula)
+    ws.append(cabecalho)
+
+    # Linha a linha: o openpyxl grava direto no arquivo, sem manter as células
+    for linha in df.itertuples(index=False, name=None):
+        ws.append([None if v != v else v for v in linha])
+    wb.save(file_path)
+
+# Função para gravar um arquivo de forma atômica (nunca deixa exportação pela metade)
+def _gravar_atomico(file_path, escrever, modo_texto):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix=".tmp")
+    try:
+        if modo_texto:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                escrever(file)
+        else:
+            os.close(fd)
+            escrever(temporario)
+        os.replace(temporario, file_path)
+    except Exception:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+# Função para obter o arquivo de uma reunião no formato pedido
+def obter_exportacao(nome, formato, diretorio=DIRETORIO_SAIDAS):
+    """Retorna o caminho da reunião no formato "html" ou "excel".
+
+    Se o artefato já existe em saidas/ ele é usado diretamente. Caso contrário
+    é gerado a partir da fonte canônica e guardado em cache; a chave do cache
+    inclui a versão da fonte e do registro de locutores, então alterações em
+    qualquer um dos dois geram nova exportação.
+    """
+    artefatos = listar_reunioes(diretorio).get(nome)
+    if not artefatos:
+        raise FileNotFoundError(f"Reunião não encontrada: {nome}")
+    if artefatos.get(formato):
+        return artefatos[formato]
+
+    fonte = caminho_fonte(artefatos)
+    versao = "-".join(f"{v:x}" for v in versao_falas(fonte))
+    extensao = ".html" if formato == "html" else ".xlsx"
+    destino = os.path.join(diretorio_exportacoes(diretorio), versao, f"{formato}_{nome}{extensao}")
+    if os.path.exists(destino):
+        return destino
+
+    # O id do locutor é interno; a exportação traz só o nome canônico
+    df = carregar_falas(fonte).drop(columns=['locutor_id'], errors='ignore')
+    if formato == "html":
+        _gravar_atomico(destino, lambda file: escrever_html(df, file), modo_texto=True)
+    else:
+        _gravar_atomico(destino, lambda path: escrever_xlsx(df, path), modo_texto=False)
+    return destino
+
+# Função para obter o ZIP com todos os arquivos do diretório de transcrições
+def obter_pacote_transcricoes(diretorio=DIRETORIO_SAIDAS):
+    """Retorna o caminho de um ZIP com os arquivos de `diretorio` (e subpastas).
+
+    O registro de locutores e arquivos de trava ou temporários ficam de fora:
+    o pacote leva só as transcrições.
+
+    O ZIP é gravado em disco uma vez por versão do conteúdo (nomes, datas e
+    tamanhos dos arquivos); as versões anteriores são apagadas.
+    """
+    arquivos = []
+    for raiz, _, nomes in os.walk(diretorio):
+        for nome in nomes:
+            if nome == NOME_ARQUIVO_LOCUTORES or nome.endswith((".lock", ".tmp")):
+                continue
+            file_path = os.path.join(raiz, nome)
+            stat = os.stat(file_path)
+            arquivos.append((os.path.relpath(file_path, diretorio), stat.st_mtime_ns, stat.st_size))
+    arquivos.sort()
+    versao = hashlib.sha256(repr(arquivos).encode("utf-8")).hexdigest()[:16]
+    pasta = os.path.join(diretorio_exportacoes(diretorio), "pacotes")
+    destino = os.path.join(pasta, f"transcricoes_{versao}.zip")
+    if os.path.exists(destino):
+        return destino
+
+    def escrever(path):
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for arc_name, _, _ in arquivos:
+                zip_file.write(os.path.join(diretorio, arc_name), arc_name)
+    _gravar_atomico(destino, escrever, modo_texto=False)
+    for nome in os.listdir(pasta):
+        if nome.endswith(".zip") and nome != os.path.basename(destino):
+            os.remove(os.path.join(pasta, nome))
+    return destino
+
+# Função para apagar exportações em cache
+def limpar_exportacoes(diretorio=DIRETORIO_SAIDAS):
+    shutil.rmtree(diretorio_exportacoes(diretorio), ignore_errors=True)
@@ -0,0 +1,281 @@
+"""Extração estruturada de pontos de ação e decisões, uma vez por reunião.
+
+O LLM recebe a transcrição inteira e responde um JSON no formato de
+ESTRUTURA_EXTRACAO; a resposta é validada e gravada nas tabelas `acoes`,
+`decisoes` e `extracoes` do banco do corpus. A extração só é refeita quando o
+conteúdo do arquivo da reunião muda (hash), então perguntas como "ações em
+aberto da Sara" viram consultas locais.
+
+Uso:
+    python -m nucleo.extracao [ENTRADA] [--limite N]
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+from functools import lru_cache
+
+from nucleo.banco import arquivo_banco, consultar_sql, sincronizar_banco
+from nucleo.dados import DIRETORIO_SAIDAS, carregar_falas, versao_arquivo
+from nucleo.ingestao import hash_arquivo
+from nucleo.llm import MARCADOR_JSON, MODELO_PADRAO, obter_genai
+from nucleo.locutores import NOME_ARQUIVO_LOCUTORES, carregar_registro
+from nucleo.repositorio import caminho_fonte, listar_reunioes, texto_reuniao
+
+# Formato pedido ao modelo (mesmo estilo das estruturas de exemplos/2_Relatorios_Inteligentes)
+ESTRUTURA_EXTRACAO = {
+    "acoes": [
+        {
+            "acao": "Descrição da ação",
+            "responsavel": "Nome do responsável (ou vazio)",
+            "prazo": "Prazo para conclusão (ou vazio)",
+            "status": "aberta ou concluida",
+            "contexto": "Contexto em que a ação foi definida"
+        }
+    ],
+    "decisoes": [
+        {"decisao": "Decisão tomada", "contexto": "Contexto da decisão"}
+    ],
+    "pendencias": ["Pendência 1", "Pendência 2"]
+}
+
+STATUS_ACAO = ("aberta", "concluida")
+
+# Tentativas por reunião: a segunda reenvia o prompt com o erro de validação
+TENTATIVAS_EXTRACAO = 2
+
+# Temperatura zero: a mesma transcrição deve gerar a mesma extração
+CONFIGURACAO_GERACAO = {"temperature": 0.0}
+
+# Função para montar o prompt de extração
+def prompt_extracao(content):
+    return f"""Extraia da seguinte transcrição de reunião todos os pontos de ação (tarefas atribuídas, com responsável e prazo quando mencionados), as decisões tomadas e as pendências.
+Marque o status de uma ação como "concluida" somente se a própria reunião disser que ela já foi feita; caso contrário use "aberta".
+Use os nomes dos participantes como aparecem na transcrição e deixe vazio o que não for mencionado.
+
+Transcrição:
+{content}
+
+Forneça a resposta em formato JSON estruturado conforme o exemplo a seguir:
+{json.dumps(ESTRUTURA_EXTRACAO, indent=2, ensure_ascii=False)}
+
+{MARCADOR_JSON}"""
+
+# Função para extrair o objeto JSON do texto da resposta
+def extrair_json(texto):
+    bloco = re.search(r'```(?:json)?\s*\n(.+?)\n```', texto, re.DOTALL)
+    if bloco:
+        texto = bloco.group(1)
+    else:
+        objeto = re.search(r'\{.*\}', texto, re.DOTALL)
+        if objeto:
+            texto = objeto.group(0)
+    try:
+        return json.loads(texto)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Resposta não é um JSON válido: {e}")
+
+# Função para converter um campo opcional em texto (None se vazio)
+def _texto_opcional(valor):
+    if valor is None or isinstance(valor, (dict, list)):
+        return None
+    valor = str(valor).strip()
+    return valor or None
+
+# Função para validar e normalizar a extração
+def validar_extracao(dados):
+    """Confere a resposta contra ESTRUTURA_EXTRACAO.
+
+    Listas ausentes contam como vazias; itens sem o campo principal são um
+    erro (a resposta não seguiu o formato), assim como tipos diferentes.
+
+    Returns:
+        Dicionário {"acoes", "decisoes", "pendencias"} normalizado.
+
+    Raises:
+        ValueError: Se a resposta não corresponde ao formato.
+    """
+    if not isinstance(dados, dict):
+        raise ValueError("A resposta deve ser um objeto JSON")
+    listas = {}
+    for chave in ESTRUTURA_EXTRACAO:
+        valor = dados.get(chave) or []
+        if not isinstance(valor, list):
+            raise ValueError(f"'{chave}' deve ser uma lista")
+        listas[chave] = valor
+
+    acoes = []
+    for posicao, item in enumerate(listas["acoes"]):
+        if not isinstance(item, dict) or not _texto_opcional(item.get("acao")):
+            raise ValueError(f"Ação {posicao + 1} sem o campo 'acao'")
+        status = (_texto_opcional(item.get("status")) or "aberta").lower().replace("í", "i")
+        if status not in STATUS_ACAO:
+            raise ValueError(f"Ação {posicao + 1} com status inválido: {status}")
+        acoes.append({
+            "acao": _texto_opcional(item["acao"]),
+            "responsavel": _texto_opcional(item.get("responsavel")),
+            "prazo": _texto_opcional(item.get("prazo")),
+            "status": status,
+            "contexto": _texto_opcional(item.get("contexto"))
+        })
+
+    decisoes = []
+    for posicao, item in enumerate(listas["decisoes"]):
+        if isinstance(item, str):
+            item = {"decisao": item}
+        if not isinstance(item, dict) or not _texto_opcional(item.get("decisao")):
+            raise ValueError(f"Decisão {posicao + 1} sem o campo 'decisao'")
+        decisoes.append({"decisao": _texto_opcional(item["decisao"]),
+                         "contexto": _texto_opcional(item.get("contexto"))})
+
+    pendencias = [p for p in (_texto_opcional(p) for p in listas["pendencias"]) if p]
+    return {"acoes": acoes, "decisoes": decisoes, "pendencias": pendencias}
+
+# Função para extrair ações e decisões de uma transcrição (exceções da API são propagadas)
+def extrair_reuniao(model, content):
+    prompt = prompt_extracao(content)
+    for tentativa in range(TENTATIVAS_EXTRACAO):
+        resposta = model.generate_content(prompt, generation_config=CONFIGURACAO_GERACAO).text
+        try:
+            return validar_extracao(extrair_json(resposta))
+        except ValueError as e:
+            if tentativa == TENTATIVAS_EXTRACAO - 1:
+                raise
+            prompt = (f"{prompt}\n\nSua resposta anterior foi rejeitada ({e}). "
+                      f"Responda novamente seguindo exatamente o formato do exemplo.")
+
+@lru_cache(maxsize=512)
+def _hash_fonte(file_path, versao):
+    return hash_arquivo(file_path)
+
+# Função para listar as reuniões sem extração para o conteúdo atual
+def reunioes_pendentes(diretorio=DIRETORIO_SAIDAS, caminho=None):
+    """Returns:
+        Lista de tuplas (nome, caminho da fonte, hash do conteúdo).
+    """
+    sincronizar_banco(diretorio, caminho)
+    df, _, _ = consultar_sql("SELECT reuniao, hash FROM extracoes", diretorio=diretorio, caminho=caminho)
+    extraidas = dict(zip(df['reuniao'], df['hash']))
+    pendentes = []
+    for nome, artefatos in listar_reunioes(diretorio).items():
+        file_path = caminho_fonte(artefatos)
+        hash_atual = _hash_fonte(file_path, versao_arquivo(file_path))
+        if extraidas.get(nome) != hash_atual:
+            pendentes.append((nome, file_path, hash_atual))
+    return pendentes
+
+# Função para gravar a extração de uma reunião (substitui a anterior)
+def gravar_extracao(nome, hash_conteudo, extracao, modelo=None, segundos=None,
+                    diretorio=DIRETORIO_SAIDAS, caminho=None):
+    registro = carregar_registro(os.path.join(diretorio, NOME_ARQUIVO_LOCUTORES))
+    con = sqlite3.connect(caminho or arquivo_banco(diretorio), timeout=30)
+    try:
+        with con:
+            con.execute("DELETE FROM acoes WHERE reuniao = ?", (nome,))
+            con.execute("DELETE FROM decisoes WHERE reuniao = ?", (nome,))
+            con.executemany(
+                "INSERT INTO acoes (reuniao, ordem, acao, responsavel, locutor_id, prazo, status, contexto) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(nome, ordem, a["acao"], a["responsavel"], registro.procurar(a["responsavel"]), a["prazo"],
+                  a["status"], a["contexto"]) for ordem, a in enumerate(extracao["acoes"])]
+            )
+            con.executemany(
+                "INSERT INTO decisoes (reuniao, ordem, decisao, contexto) VALUES (?, ?, ?, ?)",
+                [(nome, ordem, d["decisao"], d["contexto"]) for ordem, d in enumerate(extracao["decisoes"])]
+            )
+            con.execute(
+                "INSERT OR REPLACE INTO extracoes (reuniao, hash, modelo, gerado_em, segundos, pendencias) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (nome, hash_conteudo, modelo, datetime.now().isoformat(timespec="seconds"), segundos,
+                 json.dumps(extracao["pendencias"], ensure_ascii=False))
+            )
+    finally:
+        con.close()
+
+# Função para extrair as reuniões pendentes
+def extrair_pendentes(model, diretorio=DIRETORIO_SAIDAS, caminho=None, limite=None, ao_concluir=None):
+    """Executa a extração das reuniões novas ou alteradas, uma chamada por reunião.
+
+    Args:
+        limite: Número máximo de reuniões extraídas nesta execução.
+        ao_concluir: Função chamada com (nome, erro ou None) após cada reunião.
+
+    Returns:
+        Dicionário {"extraidas": [...], "erros": {nome: mensagem}}.
+    """
+    resultado = {"extraidas": [], "erros": {}}
+    for nome, file_path, hash_conteudo in reunioes_pendentes(diretorio, caminho)[:limite]:
+        inicio = time.perf_counter()
+        try:
+            extracao = extrair_reuniao(model, texto_reuniao(carregar_falas(file_path)))
+            gravar_extracao(nome, hash_conteudo, extracao, getattr(model, "model_name", None),
+                            time.perf_counter() - inicio, diretorio, caminho)
+            resultado["extraidas"].append(nome)
+            erro = None
+        except Exception as e:
+            erro = resultado["erros"][nome] = str(e)
+        if ao_concluir:
+            ao_concluir(nome, erro)
+    return resultado
+
+# Função para consultar os pontos de ação extraídos
+def consultar_acoes(locutor=None, status=None, reuniao=None, diretorio=DIRETORIO_SAIDAS, caminho=None):
+    """Filtra as ações gravadas; `locutor` aceita nome, apelido ou só parte do nome.
+
+    Returns:
+        DataFrame com id, reunião, ação, responsável (como dito na reunião),
+        locutor (nome canônico), prazo, status e contexto.
+    """
+    filtros, parametros = [], {}
+    if locutor:
+        id_locutor = carregar_registro(os.path.join(diretorio, NOME_ARQUIVO_LOCUTORES)).procurar(locutor)
+        filtros.append("(a.locutor_id = :id_locutor OR a.responsavel LIKE '%' || :locutor || '%')")
+        parametros.update(id_locutor=id_locutor, locutor=locutor)
+    if status:
+        filtros.append("a.status = :status")
+        parametros["status"] = status
+    if reuniao:
+        filtros.append("a.reuniao = :reuniao")
+        parametros["reuniao"] = reuniao
+    sql = f"""SELECT a.id, a.reuniao, a.acao, a.responsavel, l.nome AS locutor, a.prazo, a.status, a.contexto
+              FROM acoes a LEFT JOIN locutores l ON l.id = a.locutor_id LEFT JOIN reunioes r ON r.nome = a.reuniao
+              {"WHERE " + " AND ".join(filtros) if filtros else ""}
+              ORDER BY r.mes, r.dia, a.reuniao, a.ordem"""
+    return consultar_sql(sql, parametros, diretorio, caminho)[0]
+
+# Função para consultar as decisões extraídas
+def consultar_decisoes(reuniao=None, diretorio=DIRETORIO_SAIDAS, caminho=None):
+    sql = """SELECT d.reuniao, d.decisao, d.contexto
+             FROM decisoes d LEFT JOIN reunioes r ON r.nome = d.reuniao
+             WHERE :reuniao IS NULL OR d.reuniao = :reuniao
+             ORDER BY r.mes, r.dia, d.reuniao, d.ordem"""
+    return consultar_sql(sql, {"reuniao": reuniao}, diretorio, caminho)[0]
+
+# Função para alterar o status de uma ação (ex.: marcar como concluída)
+def atualizar_status(id_acao, status, diretorio=DIRETORIO_SAIDAS, caminho=None):
+    if status not in STATUS_ACAO:
+        raise ValueError(f"Status inválido: {status}")
+    con = sqlite3.connect(caminho or arquivo_banco(diretorio), timeout=30)
+    try:
+        with con:
+            con.execute("UPDATE acoes SET status = ? WHERE id = ?", (status, int(id_acao)))
+    finally:
+        con.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("entrada", nargs="?", default=DIRETORIO_SAIDAS)
+    parser.add_argument("--limite", type=int, default=None, help="Máximo de reuniões extraídas")
+    args = parser.parse_args()
+
+    genai = obter_genai(os.environ.get("GEMINI_API_KEY"))
+    if genai is None:
+        raise SystemExit("Biblioteca google-generativeai não instalada. Execute: pip install google-generativeai")
+    resultado = extrair_pendentes(
+        genai.GenerativeModel(MODELO_PADRAO), args.entrada, limite=args.limite,
+        ao_concluir=lambda nome, erro: print(f"  {nome}: {erro or 'ok'}")
+    )
+    print(f"{len(resultado['extraidas'])} reunião(ões) extraída(s), {len(resultado['erros'])} com erro")
@@ -0,0 +1,337 @@
+"""Ingestão do corpus: lê HTML e XLSX em vários processos e grava o armazém.
+
+Para cada arquivo de origem o armazém guarda as falas já validadas e
+normalizadas (pickle do DataFrame, nomeado pelo hash do conteúdo; comprimido
+com zstd quando o zstandard está instalado, ver nucleo/compactacao.py) e o
+manifesto registra hash e versão. `carregar_falas` passa a ler do armazém, e
+o índice de busca e o banco SQLite do corpus são gravados prontos. Arquivos
+com o mesmo conteúdo da última ingestão não são processados de novo. O
+armazém é um cache derivado: a origem continua em disco e a compactação só
+reduz o acréscimo do cache sobre ela.
+
+Uso:
+    python -m nucleo.ingestao [ENTRADA] [--armazem DIR] [--processos N] [--forcar]
+                              [--sem-compactacao] [--dicionario]
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from nucleo.banco import ARQUIVO_BANCO, sincronizar_banco
+from nucleo.busca import ARQUIVO_INDICE_BUSCA, BuscaCorpus, _indice_armazenado, chave_busca
+from nucleo.compactacao import (
+    ARQUIVO_DICIONARIO, EXTENSAO_ZSTD, comprimir, gravar_pickle, ler_dicionario, ler_pickle_bruto,
+    treinar_dicionario, zstd_disponivel
+)
+from nucleo.dados import (
+    ARQUIVO_MANIFESTO, DIRETORIO_SAIDAS, armazem_diretorio, carregar_falas_armazem, diretorio_cache, ler_falas_arquivo,
+    manifesto_armazem, validar_falas, versao_arquivo
+)
+from nucleo.exportacao import _gravar_atomico
+from nucleo.locutores import (
+    NOME_ARQUIVO_LOCUTORES, aplicar_registro, arquivo_locutores, carregar_registro, registrar_locutores,
+    sugerir_apelidos
+)
+from nucleo.repositorio import listar_reunioes
+
+# Versão do formato gravado; mudar força a reingestão de tudo
+VERSAO_FORMATO = 1
+
+TAMANHO_BLOCO_HASH = 1 << 20
+
+ETAPAS_INGESTAO = ["varredura", "hash", "parse", "validacao", "gravacao", "dicionario", "indices", "banco"]
+
+# Arquivos do armazém descomprimidos para medir a vazão da decodificação
+AMOSTRA_MEDICAO = 16
+
+# Função para calcular o hash do conteúdo de um arquivo
+def hash_arquivo(file_path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file:
+        for bloco in iter(lambda: file.read(TAMANHO_BLOCO_HASH), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+# Função executada em cada processo: hash, parse, validação e gravação de um arquivo
+def _ingerir_arquivo(file_path, registro_anterior, diretorio_armazem, forcar, compactar=False, dicionario=None):
+    tempos = dict.fromkeys(ETAPAS_INGESTAO[1:5], 0.0)
+    resultado = {"arquivo": file_path, "tempos": tempos, "avisos": [], "erros": []}
+    versao = versao_arquivo(file_path)
+
+    inicio = time.perf_counter()
+    conteudo = hash_arquivo(file_path)
+    tempos["hash"] = time.perf_counter() - inicio
+    armazem = f"{conteudo}.v{VERSAO_FORMATO}.pkl" + (EXTENSAO_ZSTD if compactar else "")
+    destino = os.path.join(diretorio_armazem, armazem)
+
+    if not forcar and registro_anterior and registro_anterior["armazem"] == armazem and os.path.exists(destino):
+        # Só a data mudou: o conteúdo já está no armazém
+        resultado.update(situacao="inalterado", registro={**registro_anterior, "versao": list(versao)})
+        return resultado
+
+    inicio = time.perf_counter()
+    try:
+        df = ler_falas_arquivo(file_path)
+    except Exception as e:
+        resultado.update(situacao="erro", erros=[f"falha na leitura: {e}"])
+        return resultado
+    tempos["parse"] = time.perf_counter() - inicio
+    if 'locutor' in df.columns:
+        resultado["locutores"] = df['locutor'].dropna().unique().tolist()
+
+    inicio = time.perf_counter()
+    erros, avisos = validar_falas(df)
+    tempos["validacao"] = time.perf_counter() - inicio
+    resultado.update(erros=erros, avisos=avisos)
+    if erros:
+        resultado["situacao"] = "erro"
+        return resultado
+
+    inicio = time.perf_counter()
+    tamanho = []
+    _gravar_atomico(destino, lambda path: tamanho.append(gravar_pickle(df, path, compactar, dicionario)),
+                    modo_texto=False)
+    tempos["gravacao"] = time.perf_counter() - inicio
+
+    resultado.update(situacao="atualizado" if registro_anterior else "novo", registro={
+        "armazem": armazem,
+        "hash": conteudo,
+        "versao": list(versao),
+        "falas": len(df),
+        "colunas": list(df.columns),
+        "bytes_pickle": tamanho[0]
+    })
+    return resultado
+
+# Função para gravar o manifesto do armazém
+def _gravar_manifesto(diretorio_armazem, arquivos):
+    dados = {"formato": VERSAO_FORMATO, "arquivos": arquivos}
+    _gravar_atomico(os.path.join(diretorio_armazem, ARQUIVO_MANIFESTO),
+                    lambda file: json.dump(dados, file, ensure_ascii=False, indent=1), modo_texto=True)
+
+# Função para ingerir todos os arquivos de um diretório
+def ingerir(diretorio=DIRETORIO_SAIDAS, diretorio_armazem=None, processos=None, forcar=False,
+            compactar=None, dicionario=False):
+    """Processa os arquivos novos ou alterados de `diretorio` em paralelo.
+
+    Arquivos com a mesma versão (data e tamanho) do manifesto nem são lidos;
+    os demais passam pelo hash e só são reprocessados se o conteúdo mudou.
+
+    Args:
+        compactar: Grava as falas com zstd (padrão: se o zstandard está instalado).
+        dicionario: Usa um dicionário zstd treinado com todas as reuniões do
+            armazém. É treinado na primeira vez e mantido até `forcar`.
+
+    Returns:
+        Dicionário com a contagem por situação, os tempos por etapa (somados
+        entre os processos), o tempo total e os erros e avisos por arquivo.
+    """
+    diretorio_armazem = diretorio_armazem or armazem_diretorio(diretorio)
+    compactar = zstd_disponivel() if compactar is None else compactar
+    if (compactar or dicionario) and not zstd_disponivel():
+        raise ImportError("Biblioteca zstandard não instalada. Execute: pip install zstandard")
+    dicionario = dicionario and compactar
+    tempos = dict.fromkeys(ETAPAS_INGESTAO, 0.0)
+    inicio_total = time.perf_counter()
+
+    inicio = time.perf_counter()
+    reunioes = listar_reunioes(diretorio)
+    arquivos = sorted(os.path.abspath(c) for artefatos in reunioes.values() for c in artefatos.values() if c)
+    # Com `forcar` o manifesto continua sendo lido: as entradas de outros
+    # diretórios no mesmo armazém são mantidas, só as deste são regravadas
+    manifesto = manifesto_armazem(diretorio_armazem)
+    pendentes, registros = [], {}
+    for file_path in arquivos:
+        registro = manifesto.get(file_path)
+        atual = (not forcar and registro and tuple(registro["versao"]) == versao_arquivo(file_path)
+                 and os.path.exists(os.path.join(diretorio_armazem, registro["armazem"])))
+        if atual:
+            registros[file_path] = registro
+        else:
+            pendentes.append(file_path)
+    tempos["varredura"] = time.perf_counter() - inicio
+
+    situacoes = {"novo": 0, "atualizado": 0, "inalterado": len(registros), "erro": 0}
+    problemas = {}
+    nomes = set()
+    os.makedirs(diretorio_armazem, exist_ok=True)
+    # Com `forcar` o dicionário é treinado de novo no fim; até lá o atual
+    # continua no armazém para ler os arquivos de outros diretórios
+    dados_dicionario = ler_dicionario(diretorio_armazem) if dicionario and not forcar else None
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = [executor.submit(_ingerir_arquivo, f, manifesto.get(f), diretorio_armazem, forcar,
+                                       compactar, dados_dicionario)
+                       for f in pendentes]
+            for futuro in futuros:
+                resultado = futuro.result()
+                situacoes[resultado["situacao"]] += 1
+                for etapa, duracao in resultado["tempos"].items():
+                    tempos[etapa] += duracao
+                if resultado["erros"] or resultado["avisos"]:
+                    problemas[os.path.basename(resultado["arquivo"])] = resultado["erros"] + resultado["avisos"]
+                if "registro" in resultado:
+                    registros[resultado["arquivo"]] = resultado["registro"]
+                nomes.update(resultado.get("locutores", []))
+
+    # Ids dos locutores novos atribuídos aqui, em um único processo e em ordem alfabética
+    arquivo_registro = os.path.join(os.path.abspath(diretorio), NOME_ARQUIVO_LOCUTORES)
+    registrar_locutores(arquivo_registro, sorted(nomes),
+                        os.path.join(diretorio_cache(diretorio), NOME_ARQUIVO_LOCUTORES + ".lock"))
+
+    inicio = time.perf_counter()
+    # Mantém entradas de outros diretórios ingeridos no mesmo armazém
+    diretorio_abs = os.path.abspath(diretorio)
+    registros.update({f: r for f, r in manifesto.items() if os.path.dirname(f) != diretorio_abs})
+    _gravar_manifesto(diretorio_armazem, dict(sorted(registros.items())))
+    _remover_orfaos(diretorio_armazem, registros)
+    tempos["indices"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    if dicionario and dados_dicionario is None:
+        _treinar_dicionario(diretorio_armazem, registros)
+    tempos["dicionario"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    _gravar_indice_busca(reunioes, diretorio_armazem)
+    tempos["indices"] += time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    sincronizar_banco(diretorio, os.path.join(diretorio_armazem, os.path.basename(ARQUIVO_BANCO)))
+    tempos["banco"] = time.perf_counter() - inicio
+
+    return {
+        "arquivos": len(arquivos),
+        "situacoes": situacoes,
+        "tempos": tempos,
+        "total_s": time.perf_counter() - inicio_total,
+        "problemas": problemas,
+        "armazem": medir_armazem(diretorio_armazem, registros),
+        "locutores": len(carregar_registro(arquivo_registro).locutores),
+        "apelidos_sugeridos": sugerir_apelidos(carregar_registro(arquivo_registro))
+    }
+
+# Função para apagar do armazém os arquivos que não estão mais no manifesto
+def _remover_orfaos(diretorio_armazem, registros):
+    em_uso = {r["armazem"] for r in registros.values()}
+    for nome in os.listdir(diretorio_armazem):
+        if nome.endswith((".pkl", ".pkl" + EXTENSAO_ZSTD)) and nome != ARQUIVO_INDICE_BUSCA and nome not in em_uso:
+            os.remove(os.path.join(diretorio_armazem, nome))
+
+# Função para treinar o dicionário com as falas do armazém e recomprimir os arquivos com ele
+def _treinar_dicionario(diretorio_armazem, registros):
+    arquivos = sorted({os.path.join(diretorio_armazem, r["armazem"]) for r in registros.values()
+                       if r["armazem"].endswith(EXTENSAO_ZSTD)})
+    conteudos = [ler_pickle_bruto(f) for f in arquivos]
+    dados_dicionario = treinar_dicionario(conteudos)
+    if dados_dicionario is None:
+        return
+    _gravar_atomico(os.path.join(diretorio_armazem, ARQUIVO_DICIONARIO),
+                    lambda path: _gravar_bytes(dados_dicionario, path), modo_texto=False)
+    for file_path, conteudo in zip(arquivos, conteudos):
+        comprimido = comprimir(conteudo, dados_dicionario)
+        _gravar_atomico(file_path, lambda path: _gravar_bytes(comprimido, path), modo_texto=False)
+
+def _gravar_bytes(dados, file_path):
+    with open(file_path, "wb") as file:
+        file.write(dados)
+
+# Função para medir o armazém: tamanho em disco × origem e vazão da decodificação
+def medir_armazem(diretorio_armazem, registros):
+    """O armazém é um cache derivado: os arquivos de origem continuam no
+    diretório de transcrições, então a ocupação total é a origem mais o
+    armazém (`bytes_total`). A compactação reduz o cache, não a origem.
+
+    Returns:
+        Dicionário com os bytes de origem, em disco e descomprimidos (pickle),
+        o total em disco (origem + armazém), as razões origem/disco e
+        pickle/disco e a vazão de decodificação em MB/s de pickle, medida nos
+        AMOSTRA_MEDICAO maiores arquivos.
+    """
+    tamanhos = {}
+    bytes_origem = bytes_pickle = 0
+    for file_path, registro in registros.items():
+        caminho = os.path.join(diretorio_armazem, registro["armazem"])
+        if os.path.exists(file_path) and os.path.exists(caminho):
+            bytes_origem += os.path.getsize(file_path)
+            tamanhos[caminho] = os.path.getsize(caminho)
+            # Registros anteriores à compactação: o arquivo em disco é o próprio pickle
+            bytes_pickle += registro.get("bytes_pickle", tamanhos[caminho])
+    bytes_disco = sum(tamanhos.values())
+
+    amostra = sorted(tamanhos, key=tamanhos.get, reverse=True)[:AMOSTRA_MEDICAO]
+    inicio = time.perf_counter()
+    bytes_amostra = sum(len(ler_pickle_bruto(f)) for f in amostra)
+    segundos = time.perf_counter() - inicio
+    return {
+        "arquivos": len(tamanhos),
+        "comprimidos": sum(f.endswith(EXTENSAO_ZSTD) for f in tamanhos),
+        "dicionario": os.path.exists(os.path.join(diretorio_armazem, ARQUIVO_DICIONARIO)),
+        "bytes_origem": bytes_origem,
+        "bytes_disco": bytes_disco,
+        "bytes_pickle": bytes_pickle,
+        "bytes_total": bytes_origem + bytes_disco,
+        "razao_origem": bytes_origem / bytes_disco if bytes_disco else None,
+        "razao_pickle": bytes_pickle / bytes_disco if bytes_disco else None,
+        "decodificacao_mb_s": bytes_amostra / 1e6 / segundos if segundos else None
+    }
+
+# Função para gravar o índice de busca do corpus já montado
+def _gravar_indice_busca(reunioes, diretorio_armazem):
+    fontes = chave_busca(reunioes)
+    if _indice_armazenado(fontes, diretorio_armazem) is not None:
+        return
+    falas = {}
+    for nome, file_path, versao in fontes:
+        df = carregar_falas_armazem(file_path, versao[:2], diretorio_armazem)
+        df = ler_falas_arquivo(file_path) if df is None else df
+        falas[nome] = aplicar_registro(df, arquivo_locutores(file_path))
+    indice = BuscaCorpus(falas)
+    dados = {"chave": fontes, "indice": indice}
+    _gravar_atomico(os.path.join(diretorio_armazem, ARQUIVO_INDICE_BUSCA),
+                    lambda path: _gravar_pickle(dados, path), modo_texto=False)
+
+def _gravar_pickle(dados, file_path):
+    with open(file_path, "wb") as file:
+        pickle.dump(dados, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("entrada", nargs="?", default=DIRETORIO_SAIDAS)
+    parser.add_argument("--armazem", default=None, help="Padrão: cache/armazem do projeto da entrada")
+    parser.add_argument("--processos", type=int, default=None, help="Padrão: um por CPU")
+    parser.add_argument("--forcar", action="store_true", help="Reprocessa todos os arquivos")
+    parser.add_argument("--sem-compactacao", action="store_true", help="Grava pickle sem zstd")
+    parser.add_argument("--dicionario", action="store_true",
+                        help="Comprime com um dicionário zstd treinado com todas as reuniões")
+    args = parser.parse_args()
+
+    resultado = ingerir(args.entrada, args.armazem, args.processos, args.forcar,
+                        False if args.sem_compactacao else None, args.dicionario)
+
+    situacoes = resultado["situacoes"]
+    print(f"{resultado['arquivos']} arquivo(s): {situacoes['novo']} novo(s), {situacoes['atualizado']} "
+          f"atualizado(s), {situacoes['inalterado']} inalterado(s), {situacoes['erro']} com erro")
+    for etapa, duracao in resultado["tempos"].items():
+        print(f"  {etapa:10s} {duracao * 1000:10.1f} ms")
+    print(f"Total: {resultado['total_s']:.2f}s (parse, validação e gravação somam o tempo de todos os processos)")
+    armazem = resultado["armazem"]
+    if armazem["bytes_disco"]:
+        print(f"Armazém: {armazem['bytes_disco'] / 1e6:.2f} MB em disco ({armazem['comprimidos']} de "
+              f"{armazem['arquivos']} com zstd{', dicionário' if armazem['dicionario'] else ''}), "
+              f"{armazem['razao_origem']:.1f}x menor que a origem ({armazem['bytes_origem'] / 1e6:.2f} MB), "
+              f"{armazem['razao_pickle']:.1f}x menor que o pickle; decodificação a "
+              f"{armazem['decodificacao_mb_s']:.0f} MB/s")
+        print(f"O armazém é um cache derivado e não substitui a origem: ocupação total "
+              f"{armazem['bytes_total'] / 1e6:.2f} MB (origem + armazém, "
+              f"+{armazem['bytes_disco'] / armazem['bytes_origem'] * 100 if armazem['bytes_origem'] else 0:.0f}% "
+              f"sobre a origem)")
+    for arquivo, mensagens in resultado["problemas"].items():
+        print(f"  {arquivo}: {'; '.join(mensagens)}")
+    print(f"{resultado['locutores']} locutor(es) no registro")
+    for curto, longo in resultado["apelidos_sugeridos"]:
+        print(f"  Possível apelido: '{curto}' -> '{longo}' (edite {NOME_ARQUIVO_LOCUTORES} para unir)")
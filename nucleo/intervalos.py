@@ -0,0 +1,124 @@
+"""Índice de intervalos das falas de uma reunião: quem falava em um instante e
+o que foi dito em uma janela de tempo, sem percorrer o DataFrame.
+
+O índice guarda o início das falas em ordem e o máximo acumulado do fim
+(`fim_max[i]` é o maior fim entre as i primeiras falas). Como os dois arrays
+são crescentes, as falas que podem tocar uma janela [a, b) ficam entre a
+primeira posição com fim_max > a e a última com início < b: duas buscas
+binárias, e só esse trecho é filtrado. Sem falas muito longas englobando
+outras, o trecho tem poucas falas e a consulta é O(log n).
+
+As posições devolvidas são as linhas do DataFrame de `carregar_falas`, na
+ordem do arquivo (a mesma das falas no HTML da transcrição).
+"""
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from nucleo.dados import carregar_falas, versao_falas
+
+# "1:02:03", "42:10", "42:10.5", "42min", "42m10s", "90s" ou um número (minutos)
+PADRAO_HORARIO = re.compile(
+    r"^\s*(?:(?:(\d+):)?(\d{1,2}):(\d{1,2}(?:[.,]\d+)?)"
+    r"|(?:(\d+)\s*h)?\s*(?:(\d+)\s*m(?:in)?)?\s*(?:(\d+(?:[.,]\d+)?)\s*s)?"
+    r"|(\d+(?:[.,]\d+)?))\s*$"
+)
+
+class IndiceIntervalos:
+    """Intervalos [inicio, fim) ordenados pelo início, com o máximo acumulado do fim.
+
+    Falas sem início ou sem fim ficam fora do índice (um NaN no máximo
+    acumulado quebraria a ordem usada pelas buscas binárias); as demais
+    mantêm a posição original.
+    """
+
+    def __init__(self, inicio, fim):
+        inicio = np.asarray(inicio, dtype=np.float64)
+        fim = np.asarray(fim, dtype=np.float64)
+        posicoes = np.flatnonzero(~(np.isnan(inicio) | np.isnan(fim)))
+        inicio = inicio[posicoes]
+        fim = np.maximum(fim[posicoes], inicio)
+        ordenadas = np.argsort(inicio, kind='stable')
+        self.ordem = posicoes[ordenadas]
+        self.inicio = inicio[ordenadas]
+        self.fim = fim[ordenadas]
+        self.fim_max = np.maximum.accumulate(self.fim) if len(fim) else self.fim
+
+    def __len__(self):
+        return len(self.inicio)
+
+    # Função para devolver as posições originais das candidatas em [esquerda, direita) que passam no filtro
+    def _posicoes(self, esquerda, direita, manter):
+        return self.ordem[esquerda:direita][manter]
+
+    # Função para obter as falas em andamento no instante t (início <= t < fim)
+    def no_instante(self, t):
+        esquerda = np.searchsorted(self.fim_max, t, side='right')
+        direita = np.searchsorted(self.inicio, t, side='right')
+        return self._posicoes(esquerda, direita, self.fim[esquerda:direita] > t)
+
+    # Função para obter as falas que se sobrepõem à janela [a, b)
+    def na_janela(self, a, b):
+        if b <= a:
+            return self.no_instante(a)
+        esquerda = np.searchsorted(self.fim_max, a, side='right')
+        direita = np.searchsorted(self.inicio, b, side='left')
+        return self._posicoes(esquerda, direita, self.fim[esquerda:direita] > a)
+
+    # Função para obter as falas inteiramente dentro da janela [a, b]
+    def contidas(self, a, b):
+        esquerda = np.searchsorted(self.inicio, a, side='left')
+        direita = np.searchsorted(self.inicio, b, side='right')
+        return self._posicoes(esquerda, direita, self.fim[esquerda:direita] <= b)
+
+    # Função para obter a fala mais próxima do instante t (a em andamento ou a próxima a começar)
+    def mais_proxima(self, t):
+        """Returns:
+            Posição da fala em andamento em t (a que começou por último), ou
+            da primeira que começa depois de t, ou da última antes de t se a
+            reunião já acabou. None se não há falas.
+        """
+        if len(self) == 0:
+            return None
+        em_andamento = self.no_instante(t)
+        if len(em_andamento):
+            return int(em_andamento[-1])
+        proxima = np.searchsorted(self.inicio, t, side='right')
+        return int(self.ordem[min(proxima, len(self) - 1)])
+
+@lru_cache(maxsize=512)
+def _indice_reuniao(file_path, versao):
+    df = carregar_falas(file_path)
+    return IndiceIntervalos(df['inicio'], df['fim'])
+
+# Função para obter o índice de intervalos de uma reunião (cache pela versão das falas)
+def indice_intervalos(file_path):
+    return _indice_reuniao(file_path, versao_falas(file_path))
+
+# Função para obter as falas em andamento em um instante (segundos desde o início)
+def falas_no_instante(file_path, segundos):
+    return carregar_falas(file_path).iloc[indice_intervalos(file_path).no_instante(segundos)]
+
+# Função para obter as falas que se sobrepõem a uma janela de tempo
+def falas_na_janela(file_path, inicio, fim):
+    return carregar_falas(file_path).iloc[indice_intervalos(file_path).na_janela(inicio, fim)]
+
+# Função para converter um horário digitado em segundos
+def interpretar_horario(texto):
+    """Args:
+        texto: "hh:mm:ss", "mm:ss", "42min", "1h05m", "90s" ou um número,
+            que é lido como minutos.
+
+    Returns:
+        Segundos (float). ValueError se o texto não é um horário, inclusive
+        com minutos ou segundos a partir de 60 nas formas com ":".
+    """
+    encontrado = PADRAO_HORARIO.match(str(texto).lower())
+    if not encontrado or not any(encontrado.groups()):
+        raise ValueError(f"Horário inválido: {texto}")
+    horas, minutos, segundos, h, m, s, apenas_minutos = (
+        float(g.replace(",", ".")) if g else 0.0 for g in encontrado.groups())
+    if minutos >= 60 or segundos >= 60:
+        raise ValueError(f"Horário inválido: {texto} (minutos e segundos vão até 59)")
+    return (horas + h) * 3600 + (minutos + m + apenas_minutos) * 60 + segundos + s
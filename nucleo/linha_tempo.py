@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+# Largura padrão (em pixels) usada para reduzir a linha do tempo no servidor
+LARGURA_PADRAO_PX = 1600
+
+# Intervalo (em segundos) inserido entre reuniões na visão com várias reuniões
+ESPACO_ENTRE_REUNIOES = 60.0
+
+# Função para unir intervalos do mesmo locutor que se tocam ou ficam a até `folga` segundos
+def mesclar_intervalos(codigos, inicio, fim, folga=0.0):
+    """Une intervalos adjacentes de um mesmo locutor.
+
+    Args:
+        codigos: Array de inteiros identificando o locutor de cada intervalo
+        inicio: Array com o início de cada intervalo
+        fim: Array com o fim de cada intervalo
+        folga: Distância máxima entre dois intervalos para que sejam unidos
+
+    Returns:
+        Tupla (codigos, inicio, fim) com os intervalos unidos, ordenados por
+        locutor e início. Intervalos sem início ou sem fim são descartados.
+    """
+    codigos = np.asarray(codigos, dtype=np.int64)
+    inicio = np.asarray(inicio, dtype=np.float64)
+    fim = np.asarray(fim, dtype=np.float64)
+    # Um NaN contaminaria o mínimo, o máximo e o máximo acumulado de todos os intervalos
+    validos = ~(np.isnan(inicio) | np.isnan(fim))
+    if not validos.all():
+        codigos, inicio, fim = codigos[validos], inicio[validos], fim[validos]
+    fim = np.maximum(fim, inicio)
+
+    if len(inicio) == 0:
+        return codigos, inicio, fim
+
+    ordem = np.lexsort((inicio, codigos))
+    codigos, inicio, fim = codigos[ordem], inicio[ordem], fim[ordem]
+
+    # Máximo acumulado do fim dentro de cada locutor: o deslocamento por código
+    # impede que o máximo de um locutor "vaze" para o próximo grupo
+    base = inicio.min()
+    deslocamento = (fim.max() - base) + folga + 1.0
+    fim_acumulado = np.maximum.accumulate((fim - base) + codigos * deslocamento)
+    fim_anterior = np.empty_like(fim_acumulado)
+    fim_anterior[0] = -np.inf
+    fim_anterior[1:] = fim_acumulado[:-1]
+
+    novo_segmento = (inicio - base) + codigos * deslocamento > fim_anterior + folga
+    novo_segmento[1:] |= codigos[1:] != codigos[:-1]
+    novo_segmento[0] = True
+
+    indices = np.flatnonzero(novo_segmento)
+    return codigos[indices], inicio[indices], np.maximum.reduceat(fim, indices)
+
+# Função para reduzir os intervalos à resolução de pixels do gráfico
+def reduzir_para_pixels(codigos, inicio, fim, largura_px=LARGURA_PADRAO_PX, t0=None, t1=None):
+    """Arredonda os intervalos para a grade de pixels e une os que se encostam.
+
+    Cada locutor fica com no máximo `largura_px // 2` segmentos, então o número
+    de formas enviadas ao navegador não depende do número de falas.
+    """
+    inicio = np.asarray(inicio, dtype=np.float64)
+    fim = np.asarray(fim, dtype=np.float64)
+
+    if len(inicio) == 0:
+        return mesclar_intervalos(codigos, inicio, fim)
+
+    t0 = np.nanmin(inicio) if t0 is None else t0
+    t1 = np.nanmax(fim) if t1 is None else t1
+    tamanho_pixel = max(t1 - t0, 1e-9) / largura_px
+
+    # Cada intervalo passa a ocupar pelo menos um pixel inteiro
+    pixel_inicio = np.floor((inicio - t0) / tamanho_pixel)
+    pixel_fim = np.maximum(np.ceil((fim - t0) / tamanho_pixel), pixel_inicio + 1)
+
+    codigos, pixel_inicio, pixel_fim = mesclar_intervalos(codigos, pixel_inicio, pixel_fim)
+    return codigos, t0 + pixel_inicio * tamanho_pixel, t0 + pixel_fim * tamanho_pixel
+
+# Função para montar a linha do tempo (já reduzida) de uma ou mais reuniões
+def montar_linha_tempo(reunioes, largura_px=LARGURA_PADRAO_PX, folga=0.0):
+    """Monta os segmentos de fala por locutor para o gráfico de Gantt.
+
+    Args:
+        reunioes: Lista de tuplas (nome_reuniao, DataFrame) com as colunas
+                  'locutor', 'inicio' e 'fim'
+        largura_px: Resolução horizontal do gráfico
+        folga: Distância (s) abaixo da qual falas do mesmo locutor são unidas
+
+    Returns:
+        Tupla (segmentos, limites). `segmentos` é um DataFrame com as colunas
+        'locutor', 'inicio' e 'fim' em segundos no eixo contínuo; `limites`
+        lista (nome_reuniao, inicio, fim) de cada reunião nesse eixo.
+    """
+    partes_locutor = []
+    partes_inicio = []
+    partes_fim = []
+    limites = []
+    deslocamento = 0.0
+
+    # Reuniões são colocadas uma após a outra no mesmo eixo de tempo
+    for nome, df in reunioes:
+        # Falas sem locutor ou sem horário ficam fora (um NaN tornaria NaN todo o eixo)
+        df = df[df['locutor'].notna() & df['inicio'].notna() & df['fim'].notna()]
+        if len(df) == 0:
+            continue
+        inicio = df['inicio'].to_numpy(dtype=np.float64)
+        fim = df['fim'].to_numpy(dtype=np.float64)
+        origem = inicio.min()
+        duracao = max(fim.max(), inicio.max()) - origem
+
+        partes_locutor.append(df['locutor'].astype(str).to_numpy())
+        partes_inicio.append(inicio - origem + deslocamento)
+        partes_fim.append(fim - origem + deslocamento)
+        limites.append((nome, deslocamento, deslocamento + duracao))
+        deslocamento += duracao + ESPACO_ENTRE_REUNIOES
+
+    if not partes_inicio:
+        return pd.DataFrame(columns=['locutor', 'inicio', 'fim']), limites
+
+    codigos, locutores = pd.factorize(np.concatenate(partes_locutor))
+    codigos, inicio, fim = mesclar_intervalos(
+        codigos, np.concatenate(partes_inicio), np.concatenate(partes_fim), folga
+    )
+    codigos, inicio, fim = reduzir_para_pixels(
+        codigos, inicio, fim, largura_px, t0=0.0, t1=limites[-1][2]
+    )
+
+    segmentos = pd.DataFrame({
+        'locutor': np.asarray(locutores)[codigos],
+        'inicio': inicio,
+        'fim': fim
+    })
+    return segmentos, limites
@@ -0,0 +1,78 @@
+import os
+import re
+import time
+
+# Modelo Gemini usado pelas páginas
+MODELO_PADRAO = 'gemini-2.5-flash'
+
+# Variáveis de ambiente do backend falso (testes de carga e desenvolvimento offline)
+VARIAVEL_LLM_FALSO = "SARA_LLM_FALSO"
+VARIAVEL_LATENCIA_FALSO = "SARA_LLM_FALSO_LATENCIA"
+
+# Instrução final dos prompts que pedem JSON (o backend falso responde "{}")
+MARCADOR_JSON = "Responda APENAS com o JSON, sem texto adicional."
+PADRAO_SECAO_FALSO = re.compile(r"^=== (\w+) ===$", re.MULTILINE)
+
+class RespostaFalsa:
+    def __init__(self, text):
+        self.text = text
+
+class ContagemFalsa:
+    def __init__(self, total_tokens):
+        self.total_tokens = total_tokens
+
+class ModeloFalso:
+    """Imita `genai.GenerativeModel` sem chamar a API.
+
+    Espera a latência configurada em SARA_LLM_FALSO_LATENCIA (segundos) e
+    devolve um texto em Markdown derivado do início do prompt (ou um JSON
+    vazio, se o prompt pede JSON).
+    """
+
+    def __init__(self, model_name=MODELO_PADRAO, **kwargs):
+        self.model_name = model_name
+        self.latencia = float(os.environ.get(VARIAVEL_LATENCIA_FALSO, "0.5"))
+
+    def generate_content(self, prompt, **kwargs):
+        time.sleep(self.latencia)
+        if MARCADOR_JSON in str(prompt):
+            return RespostaFalsa("{}")
+        inicio = " ".join(str(prompt).split()[:30])
+        texto = f"## Resposta simulada\n\n- {inicio}...\n- Prompt com {len(str(prompt))} caracteres."
+        # Prompts com várias seções ("=== tipo ===") recebem uma resposta por seção
+        secoes = list(dict.fromkeys(PADRAO_SECAO_FALSO.findall(str(prompt))))
+        if secoes:
+            texto = "\n\n".join(f"=== {secao} ===\n{texto}" for secao in secoes)
+        return RespostaFalsa(texto)
+
+    def count_tokens(self, prompt):
+        # Aproximação usual: ~4 caracteres por token
+        return ContagemFalsa(len(str(prompt)) // 4)
+
+class GenaiFalso:
+    """Substituto do módulo `google.generativeai` com a mesma interface usada."""
+
+    GenerativeModel = ModeloFalso
+
+    def configure(self, **kwargs):
+        pass
+
+# Função para verificar se o backend falso está ativo
+def llm_falso_ativo():
+    return os.environ.get(VARIAVEL_LLM_FALSO, "") not in ("", "0")
+
+# Função para configurar a API do Gemini (ou o backend falso)
+def obter_genai(api_key):
+    """Retorna o módulo `google.generativeai` configurado.
+
+    Com SARA_LLM_FALSO=1 retorna `GenaiFalso`, sem acessar a rede. Retorna
+    None se a biblioteca não estiver instalada.
+    """
+    if llm_falso_ativo():
+        return GenaiFalso()
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        return None
+    genai.configure(api_key=api_key)
+    return genai
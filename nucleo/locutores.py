@@ -0,0 +1,202 @@
+import json
+import os
+import tempfile
+import threading
+import unicodedata
+from contextlib import contextmanager
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Nome do registro de locutores, guardado no mesmo diretório das transcrições
+NOME_ARQUIVO_LOCUTORES = "locutores.json"
+
+# Função para normalizar um nome para comparação (sem acentos, caixa e espaços extras)
+def chave_nome(nome):
+    sem_acentos = unicodedata.normalize("NFKD", str(nome)).encode("ascii", "ignore").decode("ascii")
+    return " ".join(sem_acentos.casefold().split())
+
+class RegistroLocutores:
+    """Tabela de locutores: id inteiro estável, nome canônico e apelidos.
+
+    O arquivo JSON tem o formato
+    {"locutores": [{"id": 1, "nome": "...", "apelidos": ["...", ...]}, ...]}.
+    Os ids nunca são reaproveitados; para unir duas grafias, mova uma delas
+    para os apelidos da outra.
+    """
+
+    def __init__(self, locutores=()):
+        self.locutores = {}
+        self._por_chave = {}
+        for registro in locutores:
+            self._adicionar(int(registro["id"]), registro["nome"], registro.get("apelidos", []))
+
+    def _adicionar(self, id_locutor, nome, apelidos):
+        self.locutores[id_locutor] = {"id": id_locutor, "nome": nome, "apelidos": list(apelidos)}
+        for variante in [nome, *apelidos]:
+            self._por_chave.setdefault(chave_nome(variante), id_locutor)
+
+    # Função para obter o id de um nome (ou apelido); None se não registrado
+    def resolver(self, nome):
+        return self._por_chave.get(chave_nome(nome))
+
+    # Função para obter o id de um nome livre ("Sara", "Roberto"); None se ambíguo
+    def procurar(self, nome):
+        """Resolve nomes como o LLM os escreve: primeiro pelo registro e, se não
+        houver, pelo único locutor cujo nome contém todas as palavras de `nome`."""
+        if pd.isna(nome) or not str(nome).strip():
+            return None
+        id_locutor = self.resolver(nome)
+        if id_locutor is not None:
+            return id_locutor
+        palavras = set(chave_nome(nome).split())
+        candidatos = {
+            id_candidato
+            for variante, id_candidato in self._por_chave.items()
+            if palavras <= set(variante.split())
+        }
+        return candidatos.pop() if len(candidatos) == 1 else None
+
+    def nome(self, id_locutor):
+        return self.locutores[id_locutor]["nome"]
+
+    # Função para registrar nomes ainda desconhecidos com novos ids
+    def registrar(self, nomes):
+        proximo = max(self.locutores, default=0) + 1
+        novos = []
+        for nome in nomes:
+            if pd.isna(nome) or not str(nome).strip() or self.resolver(nome) is not None:
+                continue
+            self._adicionar(proximo, str(nome).strip(), [])
+            novos.append(proximo)
+            proximo += 1
+        return novos
+
+    # Função para converter uma coluna de nomes em ids e nomes canônicos
+    def codificar(self, nomes):
+        """Resolve cada nome distinto uma única vez e expande com `take`.
+
+        Returns:
+            Tupla (ids, canonicos): ids int32 (-1 para nomes vazios ou não
+            registrados) e os nomes canônicos correspondentes.
+        """
+        codigos, distintos = pd.factorize(nomes)
+        ids_distintos = np.array([self.resolver(n) or -1 for n in distintos] + [-1], dtype=np.int32)
+        nomes_distintos = np.array([self.nome(i) if i > 0 else None for i in ids_distintos], dtype=object)
+        # Código -1 do factorize (valor ausente) aponta para a última posição
+        return ids_distintos[codigos], nomes_distintos[codigos]
+
+    def para_dict(self):
+        return {"locutores": [self.locutores[i] for i in sorted(self.locutores)]}
+
+# Função para obter o caminho do registro de locutores de um arquivo de transcrição
+def arquivo_locutores(file_path):
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), NOME_ARQUIVO_LOCUTORES)
+
+# Função para obter a versão do registro ((0, 0) se ainda não existe)
+def versao_registro(file_path):
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=16)
+def _ler_registro(file_path, versao):
+    if versao == (0, 0):
+        return RegistroLocutores()
+    with open(file_path, "r", encoding="utf-8") as file:
+        return RegistroLocutores(json.load(file)["locutores"])
+
+# Função para carregar o registro de locutores (cache pela versão do arquivo)
+def carregar_registro(file_path):
+    return _ler_registro(file_path, versao_registro(file_path))
+
+_lock_registro = threading.Lock()
+
+# Trava entre threads e entre processos enquanto o registro é alterado
+@contextmanager
+def _travar_registro(arquivo_trava):
+    with _lock_registro:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(arquivo_trava), exist_ok=True)
+        with open(arquivo_trava, "w") as trava:
+            fcntl.flock(trava, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(trava, fcntl.LOCK_UN)
+
+# Função para registrar nomes novos e gravar o registro (só na ingestão)
+def registrar_locutores(file_path, nomes, arquivo_trava):
+    """Atribui ids aos nomes que ainda não estão no registro.
+
+    Relê o arquivo sob trava antes de alterar, então processos diferentes não
+    atribuem o mesmo id a locutores diferentes. A trava (`arquivo_trava`) fica
+    fora do diretório das transcrições, no cache.
+
+    Returns:
+        O registro atualizado.
+    """
+    registro = carregar_registro(file_path)
+    if all(pd.isna(n) or not str(n).strip() or registro.resolver(n) is not None for n in nomes):
+        return registro
+
+    with _travar_registro(arquivo_trava):
+        # Leitura sem cache: o objeto será alterado
+        registro = _ler_registro.__wrapped__(file_path, versao_registro(file_path))
+        if registro.registrar(sorted(set(str(n).strip() for n in nomes if not pd.isna(n)))):
+            fd, temporario = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(registro.para_dict(), file, ensure_ascii=False, indent=2)
+            os.replace(temporario, file_path)
+    return carregar_registro(file_path)
+
+# Função para aplicar o registro às falas: nome canônico e id inteiro do locutor
+def aplicar_registro(df, file_path_registro):
+    """Retorna uma cópia rasa de `df` com `locutor` canônico e `locutor_id`.
+
+    Só resolve: nomes que ainda não estão no registro mantêm a grafia do
+    arquivo e recebem `locutor_id` -1 até a próxima ingestão registrá-los
+    (`registrar_locutores`). As demais colunas continuam compartilhadas com
+    `df`.
+    """
+    if 'locutor' not in df.columns:
+        return df
+    registro = carregar_registro(file_path_registro)
+    ids, canonicos = registro.codificar(df['locutor'])
+    resolvido = df.copy(deep=False)
+    resolvido['locutor'] = np.where(ids > 0, canonicos, df['locutor'].to_numpy(dtype=object))
+    resolvido['locutor_id'] = ids
+    return resolvido
+
+# Função para sugerir apelidos: nomes cujas palavras começam outro nome mais longo
+def sugerir_apelidos(registro):
+    """Procura grafias que podem ser da mesma pessoa, sem alterar o registro.
+
+    Ex.: "Ruth L" -> "Ruth Leia Farias Ruth" (a última palavra do nome curto
+    pode estar abreviada).
+
+    Returns:
+        Lista de pares (nome curto, nome longo).
+    """
+    nomes = [r["nome"] for r in registro.locutores.values()]
+    sugestoes = []
+    for curto in nomes:
+        palavras_curto = chave_nome(curto).split()
+        for longo in nomes:
+            palavras_longo = chave_nome(longo).split()
+            if longo == curto or len(palavras_longo) <= len(palavras_curto):
+                continue
+            n = len(palavras_curto)
+            if palavras_longo[:n - 1] == palavras_curto[:-1] and palavras_longo[n - 1].startswith(palavras_curto[-1]):
+                sugestoes.append((curto, longo))
+    return sugestoes
@@ -0,0 +1,135 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from nucleo.dados import carregar_falas, versao_falas
+
+# Métricas de participação disponíveis (coluna de peso; None conta falas)
+METRICAS_PARTICIPACAO = {
+    "falas": None,
+    "palavras": "palavras",
+    "segundos": "duracao"
+}
+
+# Função para obter os pesos de uma métrica sem copiar o DataFrame
+def _pesos(df, metrica):
+    coluna = METRICAS_PARTICIPACAO[metrica]
+    if coluna is None:
+        return None
+    return df[coluna].to_numpy(dtype=np.float64, na_value=0.0)
+
+# Função para marcar as falas que entram na contagem (com locutor e início definidos)
+def _falas_validas(codigos, inicio):
+    # pd.factorize dá o código -1 às falas sem locutor; sem início a fala não tem posição
+    return (codigos >= 0) & ~np.isnan(inicio)
+
+# Função para atribuir cada fala a um de `n_bins` intervalos de tempo
+def indices_bins(inicio, n_bins, t_max=None):
+    inicio = np.asarray(inicio, dtype=np.float64)
+    t_max = (inicio.max() if len(inicio) else 0.0) if t_max is None else t_max
+    bordas = np.linspace(0.0, max(t_max, 1e-9), n_bins + 1)
+    return np.clip(np.searchsorted(bordas, inicio, side='right') - 1, 0, n_bins - 1), bordas
+
+# Função para calcular a participação por locutor em N intervalos da reunião
+def participacao_por_bins(df, n_bins=3, metrica="falas"):
+    """Distribui a participação de cada locutor em `n_bins` intervalos iguais.
+
+    Os intervalos vão de 0 até o início da última fala. O cálculo usa
+    `searchsorted` e `bincount` sobre as colunas, sem copiar nem reordenar o
+    DataFrame. Falas sem locutor ou sem início ficam de fora.
+
+    Returns:
+        DataFrame locutores × intervalos (índice = início do intervalo em min).
+    """
+    codigos, locutores = pd.factorize(df['locutor'])
+    inicio = df['inicio'].to_numpy(dtype=np.float64, na_value=np.nan)
+    validas = _falas_validas(codigos, inicio)
+    bins, bordas = indices_bins(inicio[validas], n_bins)
+    pesos = _pesos(df, metrica)
+    k = len(locutores)
+
+    valores = np.bincount(codigos[validas] * n_bins + bins, weights=None if pesos is None else pesos[validas],
+                          minlength=k * n_bins).reshape(k, n_bins)
+    return pd.DataFrame(valores.T, index=np.round(bordas[:-1] / 60, 1), columns=locutores)
+
+# Função para calcular a participação em uma janela móvel
+def participacao_janela_movel(df, janela_s=300.0, passo_s=60.0, metrica="falas"):
+    """Soma a participação de cada locutor na janela [t - janela_s, t).
+
+    Usa somas acumuladas por locutor sobre as falas ordenadas por início; cada
+    janela vira duas buscas binárias, independente do número de falas. Falas
+    sem locutor ou sem início ficam de fora.
+    """
+    inicio = df['inicio'].to_numpy(dtype=np.float64, na_value=np.nan)
+    codigos, locutores = pd.factorize(df['locutor'])
+    pesos = _pesos(df, metrica)
+    pesos = np.ones(len(inicio)) if pesos is None else pesos
+    validas = _falas_validas(codigos, inicio)
+    inicio, codigos, pesos = inicio[validas], codigos[validas], pesos[validas]
+
+    ordem = np.argsort(inicio, kind='stable')
+    inicio_ordenado = inicio[ordem]
+    # Matriz (locutores × falas+1) com a soma acumulada de cada locutor
+    uma_quente = np.zeros((len(locutores), len(inicio) + 1))
+    uma_quente[codigos[ordem], np.arange(1, len(inicio) + 1)] = pesos[ordem]
+    acumulado = np.cumsum(uma_quente, axis=1)
+
+    t_max = inicio_ordenado[-1] if len(inicio) else 0.0
+    instantes = np.arange(passo_s, t_max + passo_s, passo_s)
+    fim_janela = np.searchsorted(inicio_ordenado, instantes, side='left')
+    inicio_janela = np.searchsorted(inicio_ordenado, instantes - janela_s, side='left')
+    valores = acumulado[:, fim_janela] - acumulado[:, inicio_janela]
+    return pd.DataFrame(valores.T, index=np.round(instantes / 60, 1), columns=locutores)
+
+@lru_cache(maxsize=512)
+def _colunas_reuniao(file_path, versao):
+    df = carregar_falas(file_path)
+    df = df[df['locutor'].notna() & df['inicio'].notna()]
+    inicio = df['inicio'].to_numpy(dtype=np.float64)
+    t_max = inicio.max() if len(inicio) else 0.0
+    return {
+        "locutor": df['locutor'].astype(str).to_numpy(),
+        "posicao": inicio / t_max if t_max > 0 else np.zeros(len(inicio)),
+        "palavras": df['palavras'].to_numpy(dtype=np.float64, na_value=0.0),
+        "duracao": df['duracao'].to_numpy(dtype=np.float64, na_value=0.0)
+    }
+
+@lru_cache(maxsize=8)
+def _colunas_corpus(arquivos, versoes):
+    partes = [_colunas_reuniao(f, v) for f, v in zip(arquivos, versoes)]
+    codigos, locutores = pd.factorize(np.concatenate([p["locutor"] for p in partes]))
+    return {
+        "locutores": np.asarray(locutores),
+        "codigo": codigos,
+        "reuniao": np.repeat(np.arange(len(partes)), [len(p["posicao"]) for p in partes]),
+        "posicao": np.concatenate([p["posicao"] for p in partes]),
+        "palavras": np.concatenate([p["palavras"] for p in partes]),
+        "duracao": np.concatenate([p["duracao"] for p in partes])
+    }
+
+# Função para montar o cubo locutores × reuniões × intervalos do corpus
+def participacao_corpus(arquivos, n_bins=10, metrica="falas"):
+    """Calcula a participação de todo o corpus em tempo normalizado.
+
+    Cada reunião é dividida em `n_bins` partes proporcionais à sua duração, e
+    as colunas de todas as reuniões ficam em cache já concatenadas; mudar o
+    número de intervalos só refaz um `bincount`.
+
+    Returns:
+        Tupla (cubo, locutores) em que `cubo` tem forma
+        (locutores, reuniões, intervalos).
+    """
+    arquivos = tuple(arquivos)
+    if not arquivos:
+        return np.zeros((0, 0, n_bins)), np.array([], dtype=object)
+    corpus = _colunas_corpus(arquivos, tuple(versao_falas(f) for f in arquivos))
+
+    k, m = len(corpus["locutores"]), len(arquivos)
+    bins = np.minimum((corpus["posicao"] * n_bins).astype(np.int64), n_bins - 1)
+    coluna = METRICAS_PARTICIPACAO[metrica]
+    pesos = corpus[coluna] if coluna else None
+
+    posicoes = (corpus["codigo"] * m + corpus["reuniao"]) * n_bins + bins
+    cubo = np.bincount(posicoes, weights=pesos, minlength=k * m * n_bins)
+    return cubo.reshape(k, m, n_bins), corpus["locutores"]
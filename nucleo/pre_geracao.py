@@ -0,0 +1,411 @@
+"""Cache em disco dos relatórios e pré-geração especulativa em segundo plano.
+
+Cada relatório gerado fica em cache/relatorios/ (do projeto), com uma chave que combina o
+modelo e o prompt completo. Alterar a transcrição, a instrução do tipo ou o
+modelo gera uma chave nova. Os cliques em cada tipo são contados em uso.json.
+
+Com a pré-geração ativada (opt-in), os tipos mais usados de uma reunião são
+gerados por uma única thread em segundo plano. Isso acontece quando a reunião
+é selecionada ou quando ela aparece em saidas/. O próximo clique então sai do
+cache. POLITICA_PRE_GERACAO limita quantos tipos entram na pré-geração e
+quanto ela pode gastar por dia.
+"""
+import hashlib
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, datetime
+
+from nucleo.dados import DIRETORIO_BASE, DIRETORIO_SAIDAS, diretorio_cache
+from nucleo.llm import MODELO_PADRAO
+from nucleo.prompts import (
+    gerar_relatorio, gerar_relatorios, prompt_relatorio, prompt_relatorios_combinados, separar_relatorios
+)
+from nucleo.repositorio import carregar_reuniao, listar_reunioes, texto_reuniao
+
+# Diretório com os relatórios gerados e as estatísticas de uso
+DIRETORIO_RELATORIOS = os.path.join(DIRETORIO_BASE, "cache", "relatorios")
+ARQUIVO_USO = "uso.json"
+
+# Variável de ambiente que liga a pré-geração por padrão (páginas e API)
+VARIAVEL_PRE_GERACAO = "SARA_PRE_GERACAO"
+
+# Limites da pré-geração especulativa (os cliques do usuário não são limitados)
+POLITICA_PRE_GERACAO = {
+    "tipos_por_reuniao": 2,         # só os N tipos mais usados
+    "uso_minimo": 3,                # cliques mínimos para um tipo ser pré-gerado
+    "chamadas_por_dia": 20,         # chamadas especulativas por dia
+    "caracteres_por_dia": 400_000   # entrada especulativa por dia (~100 mil tokens)
+}
+
+# Pausa entre duas chamadas especulativas (baixa prioridade)
+PAUSA_PRE_GERACAO = 2.0
+
+# Dias de gasto guardados em uso.json
+DIAS_GASTO = 7
+
+# Prioridades da fila: a reunião selecionada passa na frente das novas
+PRIORIDADE_SELECAO = 0
+PRIORIDADE_NOVA = 1
+# Sentinela que encerra a thread da fila, depois de todo o trabalho
+PRIORIDADE_PARADA = 2
+
+# Função para obter o cache de relatórios de um diretório de transcrições
+def diretorio_relatorios(diretorio=DIRETORIO_SAIDAS):
+    return os.path.join(diretorio_cache(diretorio), "relatorios")
+
+# Função para verificar se a pré-geração está ligada por padrão
+def pre_geracao_ativa():
+    return os.environ.get(VARIAVEL_PRE_GERACAO, "") not in ("", "0")
+
+# Função para obter o nome do modelo (parte da chave do cache)
+def nome_modelo(model):
+    return getattr(model, "model_name", MODELO_PADRAO)
+
+# Função para calcular a chave de um relatório no cache
+def chave_relatorio(model, content, tipo):
+    prompt = prompt_relatorio(content, tipo)
+    return hashlib.sha256(f"{nome_modelo(model)}\n{prompt}".encode("utf-8")).hexdigest()
+
+def _caminho_relatorio(chave, diretorio_cache):
+    return os.path.join(diretorio_cache, chave[:2], f"{chave}.json")
+
+# Função para gravar um JSON de forma atômica
+def _gravar_json(dados, file_path):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
+        json.dump(dados, file, ensure_ascii=False, indent=2)
+    os.replace(temporario, file_path)
+
+# Função para ler um relatório do cache (None se ainda não foi gerado)
+def ler_relatorio(chave, diretorio_cache=DIRETORIO_RELATORIOS):
+    try:
+        with open(_caminho_relatorio(chave, diretorio_cache), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+# Função para gravar um relatório no cache
+def gravar_relatorio(chave, reuniao, tipo, model, relatorio, origem, diretorio_cache=DIRETORIO_RELATORIOS):
+    _gravar_json({
+        "reuniao": reuniao,
+        "tipo": tipo,
+        "modelo": nome_modelo(model),
+        "origem": origem,
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "relatorio": relatorio
+    }, _caminho_relatorio(chave, diretorio_cache))
+
+class EstatisticasUso:
+    """Contadores persistidos em uso.json: cliques por tipo, acertos do cache,
+    gasto diário da pré-geração e reuniões já vistas.
+
+    As gravações são serializadas entre threads; entre processos, a última
+    gravação vence (são contadores aproximados, usados só para a política).
+    """
+
+    def __init__(self, diretorio_cache=DIRETORIO_RELATORIOS):
+        self.file_path = os.path.join(diretorio_cache, ARQUIVO_USO)
+        self._lock = threading.Lock()
+
+    def _ler(self):
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                dados = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            dados = {}
+        dados.setdefault("usos", {})
+        dados.setdefault("acertos", 0)
+        dados.setdefault("acertos_pre_geracao", 0)
+        dados.setdefault("faltas", 0)
+        dados.setdefault("pre_gerados", 0)
+        dados.setdefault("gastos", {})
+        return dados
+
+    def ler(self):
+        with self._lock:
+            return self._ler()
+
+    # Aplica `alterar(dados)` e grava; retorna o que `alterar` retornar
+    def atualizar(self, alterar):
+        with self._lock:
+            dados = self._ler()
+            resultado = alterar(dados)
+            recentes = sorted(dados["gastos"])[-DIAS_GASTO:]
+            dados["gastos"] = {dia: dados["gastos"][dia] for dia in recentes}
+            _gravar_json(dados, self.file_path)
+            return resultado
+
+    def registrar_pedido(self, tipos, origens):
+        def alterar(dados):
+            for tipo, origem in zip(tipos, origens):
+                dados["usos"][tipo] = dados["usos"].get(tipo, 0) + 1
+                if origem is None:
+                    dados["faltas"] += 1
+                else:
+                    dados["acertos"] += 1
+                    dados["acertos_pre_geracao"] += origem == "pre_geracao"
+        self.atualizar(alterar)
+
+    # Reserva orçamento do dia; False se a chamada estouraria algum limite
+    def reservar_gasto(self, caracteres, politica):
+        def alterar(dados):
+            gasto = dados["gastos"].setdefault(date.today().isoformat(), {"chamadas": 0, "caracteres": 0})
+            if (gasto["chamadas"] + 1 > politica["chamadas_por_dia"]
+                    or gasto["caracteres"] + caracteres > politica["caracteres_por_dia"]):
+                return False
+            gasto["chamadas"] += 1
+            gasto["caracteres"] += caracteres
+            return True
+        return self.atualizar(alterar)
+
+    def registrar_pre_gerados(self, n):
+        def alterar(dados):
+            dados["pre_gerados"] += n
+        self.atualizar(alterar)
+
+    # Retorna as reuniões ainda não vistas e as marca como vistas
+    def reunioes_novas(self, nomes):
+        def alterar(dados):
+            primeira_vez = "reunioes_vistas" not in dados
+            vistas = set(dados.get("reunioes_vistas", []))
+            novas = [nome for nome in nomes if nome not in vistas]
+            dados["reunioes_vistas"] = sorted(vistas | set(nomes))
+            # Na primeira vez o corpus existente só é registrado, sem pré-geração
+            return [] if primeira_vez else novas
+        return self.atualizar(alterar)
+
+# Função para escolher os tipos a pré-gerar: os mais usados, acima do uso mínimo
+def tipos_para_pre_gerar(usos, politica=POLITICA_PRE_GERACAO):
+    elegiveis = [tipo for tipo, n in usos.items() if n >= politica["uso_minimo"]]
+    elegiveis.sort(key=lambda tipo: -usos[tipo])
+    return elegiveis[:politica["tipos_por_reuniao"]]
+
+class PreGerador:
+    """Fila de relatórios a gerar em segundo plano, atendida por uma só thread.
+
+    `obter_relatorio` consulta `em_andamento`: um clique em um relatório cuja
+    chamada já começou espera essa chamada em vez de fazer outra. Se ele
+    ainda está na fila (`_na_fila`), sai da fila e é gerado na hora, sem
+    esperar os trabalhos da frente.
+    """
+
+    def __init__(self, diretorio_cache=DIRETORIO_RELATORIOS, politica=POLITICA_PRE_GERACAO):
+        self.diretorio_cache = diretorio_cache
+        self.politica = politica
+        self.uso = EstatisticasUso(diretorio_cache)
+        self.em_andamento = {}
+        self._na_fila = {}
+        self.ultimo_erro = None
+        self._fila = queue.PriorityQueue()
+        self._sequencia = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def pendentes(self):
+        with self._lock:
+            return len(self.em_andamento)
+
+    # Função para agendar os tipos mais usados de uma reunião
+    def agendar(self, model, reuniao, diretorio=DIRETORIO_SAIDAS, prioridade=PRIORIDADE_SELECAO):
+        """Returns:
+            Lista dos tipos agendados (vazia se todos já estão em cache, em
+            andamento ou se nenhum tipo atingiu o uso mínimo).
+        """
+        tipos = tipos_para_pre_gerar(self.uso.ler()["usos"], self.politica)
+        if not tipos:
+            return []
+        content = texto_reuniao(carregar_reuniao(reuniao, diretorio))
+        trabalho = {}
+        with self._lock:
+            for tipo in tipos:
+                chave = chave_relatorio(model, content, tipo)
+                if chave in self.em_andamento or ler_relatorio(chave, self.diretorio_cache):
+                    continue
+                self.em_andamento[chave] = Future()
+                self._na_fila[chave] = trabalho
+                trabalho[tipo] = chave
+            if not trabalho:
+                return []
+            self._sequencia += 1
+            self._fila.put((prioridade, self._sequencia, model, reuniao, content, trabalho))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._executar, name="pre-geracao", daemon=True)
+                self._thread.start()
+        return list(trabalho)
+
+    # Função para agendar as reuniões que apareceram em saidas/ desde a última verificação
+    def agendar_novas(self, model, diretorio=DIRETORIO_SAIDAS):
+        novas = self.uso.reunioes_novas(list(listar_reunioes(diretorio)))
+        for reuniao in novas:
+            self.agendar(model, reuniao, diretorio, PRIORIDADE_NOVA)
+        return novas
+
+    def _executar(self):
+        while True:
+            _, _, model, reuniao, content, trabalho = self._fila.get()
+            if trabalho is None:
+                self._fila.task_done()
+                return
+            with self._lock:
+                # A partir daqui os pedidos esperam esta chamada; os tipos já
+                # retirados por um clique (`_retirar_da_fila`) não estão mais em `trabalho`
+                for chave in trabalho.values():
+                    self._na_fila.pop(chave, None)
+                vazio = not trabalho
+            if vazio:
+                self._fila.task_done()
+                continue
+            try:
+                self._gerar(model, reuniao, content, trabalho)
+            finally:
+                self._fila.task_done()
+            time.sleep(PAUSA_PRE_GERACAO)
+
+    # Função para encerrar a thread da fila (sentinela no fim da fila) e esperar por ela
+    def parar(self):
+        with self._lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            self._sequencia += 1
+            self._fila.put((PRIORIDADE_PARADA, self._sequencia, None, None, None, None))
+            self._thread = None
+        thread.join()
+
+    # Função para tirar da fila um relatório que ainda não começou (o pedido gera na hora)
+    def _retirar_da_fila(self, chave):
+        trabalho = self._na_fila.pop(chave)
+        for tipo in [t for t, c in trabalho.items() if c == chave]:
+            del trabalho[tipo]
+        # Ninguém espera o futuro de um trabalho que não começou: basta resolvê-lo
+        self.em_andamento.pop(chave).set_result(None)
+
+    def _gerar(self, model, reuniao, content, trabalho):
+        tipos = list(trabalho)
+        relatorios = {}
+        try:
+            # Vários tipos saem de uma única chamada combinada; os que faltarem na
+            # resposta custam uma chamada cada, e cada chamada reserva o seu gasto
+            if len(tipos) == 1:
+                faltando = tipos
+            elif self.uso.reservar_gasto(len(prompt_relatorios_combinados(content, tipos)), self.politica):
+                response = model.generate_content(prompt_relatorios_combinados(content, tipos))
+                relatorios = separar_relatorios(response.text, tipos)
+                faltando = [tipo for tipo in tipos if tipo not in relatorios]
+            else:
+                faltando = []
+            for tipo in faltando:
+                if not self.uso.reservar_gasto(len(prompt_relatorio(content, tipo)), self.politica):
+                    break
+                relatorios[tipo] = gerar_relatorio(model, content, tipo)
+            for tipo, relatorio in relatorios.items():
+                gravar_relatorio(trabalho[tipo], reuniao, tipo, model, relatorio, "pre_geracao", self.diretorio_cache)
+            if relatorios:
+                self.uso.registrar_pre_gerados(len(relatorios))
+        except Exception as e:
+            self.ultimo_erro = f"{reuniao}: {e}"
+        finally:
+            with self._lock:
+                for tipo, chave in trabalho.items():
+                    self.em_andamento.pop(chave).set_result(relatorios.get(tipo))
+
+    # Função para obter relatórios do cache, da pré-geração em andamento ou do modelo
+    def obter_relatorios(self, model, content, tipos, reuniao, contar_uso=True):
+        """Retorna os relatórios de `tipos`, gerando só os que faltam.
+
+        Os que faltam são gerados em uma chamada combinada (ou uma simples, se
+        for um só tipo). Registra os cliques em uso.json, exceto com
+        `contar_uso=False` (pedidos internos, como o resumo consolidado).
+
+        Returns:
+            Tupla (relatorios, origens, chamadas): {tipo: texto}, {tipo:
+            "usuario" | "pre_geracao" | None (gerado agora)} e o número de
+            chamadas feitas ao modelo.
+        """
+        relatorios, origens, faltando = {}, {}, {}
+        for tipo in tipos:
+            chave = chave_relatorio(model, content, tipo)
+            with self._lock:
+                if chave in self._na_fila:
+                    self._retirar_da_fila(chave)
+                futuro = self.em_andamento.get(chave)
+            # Já está sendo pré-gerado: espera o resultado (None se falhou)
+            relatorio = futuro.result() if futuro else None
+            registro = ler_relatorio(chave, self.diretorio_cache)
+            if registro:
+                relatorios[tipo], origens[tipo] = registro["relatorio"], registro["origem"]
+            elif relatorio:
+                relatorios[tipo], origens[tipo] = relatorio, "pre_geracao"
+            else:
+                faltando[tipo] = chave
+                origens[tipo] = None
+
+        chamadas = 0
+        if faltando:
+            if len(faltando) == 1:
+                tipo = next(iter(faltando))
+                gerados, chamadas = {tipo: gerar_relatorio(model, content, tipo)}, 1
+            else:
+                gerados, chamadas = gerar_relatorios(model, content, list(faltando))
+            for tipo, relatorio in gerados.items():
+                gravar_relatorio(faltando[tipo], reuniao, tipo, model, relatorio, "usuario", self.diretorio_cache)
+            relatorios.update(gerados)
+
+        if contar_uso:
+            self.uso.registrar_pedido(list(tipos), [origens[tipo] for tipo in tipos])
+        return {tipo: relatorios[tipo] for tipo in tipos}, origens, chamadas
+
+    # Função para obter um relatório (ver `obter_relatorios`)
+    def obter_relatorio(self, model, content, tipo, reuniao):
+        """Returns:
+            Tupla (relatorio, origem): origem None quando gerado agora.
+        """
+        relatorios, origens, _ = self.obter_relatorios(model, content, [tipo], reuniao)
+        return relatorios[tipo], origens[tipo]
+
+    # Função para resumir o uso e o gasto (página de relatórios e API)
+    def resumo(self):
+        dados = self.uso.ler()
+        pedidos = dados["acertos"] + dados["faltas"]
+        return {
+            "usos": dict(sorted(dados["usos"].items(), key=lambda item: -item[1])),
+            "tipos_pre_gerados": tipos_para_pre_gerar(dados["usos"], self.politica),
+            "acertos": dados["acertos"],
+            "acertos_pre_geracao": dados["acertos_pre_geracao"],
+            "faltas": dados["faltas"],
+            "taxa_acertos": dados["acertos"] / pedidos if pedidos else None,
+            "pre_gerados": dados["pre_gerados"],
+            "gasto_hoje": dados["gastos"].get(date.today().isoformat(), {"chamadas": 0, "caracteres": 0}),
+            "politica": dict(self.politica),
+            "pendentes": self.pendentes(),
+            "ultimo_erro": self.ultimo_erro
+        }
+
+_pre_geradores = {}
+_lock_pre_geradores = threading.Lock()
+
+# Função para obter o pré-gerador de um diretório de transcrições (um por cache de relatórios)
+def pre_gerador(diretorio=DIRETORIO_SAIDAS):
+    diretorio_cache = diretorio_relatorios(diretorio)
+    with _lock_pre_geradores:
+        if diretorio_cache not in _pre_geradores:
+            _pre_geradores[diretorio_cache] = PreGerador(diretorio_cache)
+        return _pre_geradores[diretorio_cache]
+
+# Função para descartar o pré-gerador de um diretório (projeto ocioso); falso se a fila ainda tem trabalho
+def descartar_pre_gerador(diretorio):
+    diretorio_cache = diretorio_relatorios(diretorio)
+    with _lock_pre_geradores:
+        pre_geracao = _pre_geradores.get(diretorio_cache)
+        if pre_geracao is not None and pre_geracao.pendentes():
+            return False
+        _pre_geradores.pop(diretorio_cache, None)
+    if pre_geracao is not None:
+        pre_geracao.parar()
+    return True
@@ -0,0 +1,183 @@
+"""Projetos (clientes ou engajamentos) com transcrições e caches separados.
+
+O projeto "padrao" é o saidas/ da raiz. Os demais ficam em
+projetos/<nome>/saidas/, e tudo o que é derivado das transcrições vai para
+projetos/<nome>/cache/: armazém da ingestão, banco SQLite, índice de busca,
+relatórios e exportações (ver `diretorio_cache` em nucleo/dados.py).
+
+Nada de um projeto é carregado antes do primeiro uso. `GerenciadorProjetos`
+registra o último uso de cada projeto e descarta os índices em memória dos
+que ficaram ociosos por mais de TEMPO_OCIOSO segundos, ou dos menos usados
+quando há mais de MAXIMO_PROJETOS_CARREGADOS. O que está em disco fica, então
+voltar a um projeto descartado não refaz a ingestão nem os relatórios.
+
+Uso:
+    python -m nucleo.projetos listar
+    python -m nucleo.projetos criar NOME
+"""
+import argparse
+import os
+import re
+import threading
+import time
+
+from nucleo.ao_vivo import descartar_reunioes_ao_vivo
+from nucleo.busca import busca_corpus
+from nucleo.dados import DIRETORIO_PROJETOS, DIRETORIO_SAIDAS
+from nucleo.pre_geracao import descartar_pre_gerador, pre_gerador
+from nucleo.serie import descartar_resumo_serie, resumo_serie
+from nucleo.termos import descartar_indice_termos, indice_termos
+
+# Projeto que usa o saidas/ da raiz
+PROJETO_PADRAO = "padrao"
+
+# Nomes aceitos: minúsculas, dígitos, "-" e "_" (viram nome de diretório)
+PADRAO_NOME_PROJETO = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+
+# Segundos sem uso até os índices em memória de um projeto serem descartados
+TEMPO_OCIOSO = 30 * 60
+
+# Projetos com índices em memória ao mesmo tempo (os menos usados saem primeiro)
+MAXIMO_PROJETOS_CARREGADOS = 8
+
+# Função para listar os projetos existentes (o padrão primeiro)
+def listar_projetos():
+    projetos = []
+    if os.path.isdir(DIRETORIO_PROJETOS):
+        projetos = sorted(nome for nome in os.listdir(DIRETORIO_PROJETOS)
+                          if PADRAO_NOME_PROJETO.match(nome)
+                          and os.path.isdir(os.path.join(DIRETORIO_PROJETOS, nome, "saidas")))
+    return [PROJETO_PADRAO] + [nome for nome in projetos if nome != PROJETO_PADRAO]
+
+# Função para obter o diretório de transcrições de um projeto
+def diretorio_projeto(nome=PROJETO_PADRAO):
+    if nome == PROJETO_PADRAO:
+        return DIRETORIO_SAIDAS
+    if not PADRAO_NOME_PROJETO.match(nome or ""):
+        raise ValueError(f"Nome de projeto inválido: {nome}")
+    diretorio = os.path.join(DIRETORIO_PROJETOS, nome, "saidas")
+    if not os.path.isdir(diretorio):
+        raise FileNotFoundError(f"Projeto não encontrado: {nome}")
+    return diretorio
+
+# Função para criar um projeto vazio (as transcrições são copiadas para o saidas/ dele)
+def criar_projeto(nome):
+    if nome == PROJETO_PADRAO or not PADRAO_NOME_PROJETO.match(nome or ""):
+        raise ValueError(f"Nome de projeto inválido: {nome} (use minúsculas, dígitos, '-' ou '_')")
+    diretorio = os.path.join(DIRETORIO_PROJETOS, nome, "saidas")
+    os.makedirs(diretorio, exist_ok=True)
+    return diretorio
+
+
+class Projeto:
+    """Acesso preguiçoso aos índices de um projeto.
+
+    Cada método delega à função compartilhada do módulo correspondente, que
+    só carrega o índice na primeira chamada; `descartar` remove as instâncias
+    por diretório desses módulos.
+    """
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.diretorio = diretorio_projeto(nome)
+        self.ultimo_uso = time.monotonic()
+
+    def busca(self):
+        return busca_corpus(self.diretorio)
+
+    def termos(self):
+        return indice_termos(self.diretorio)
+
+    def relatorios(self):
+        return pre_gerador(self.diretorio)
+
+    def serie(self):
+        return resumo_serie(self.diretorio)
+
+    # Função para liberar os índices em memória (falso se a pré-geração ainda tem trabalho na fila)
+    def descartar(self):
+        if not descartar_pre_gerador(self.diretorio):
+            return False
+        descartar_indice_termos(self.diretorio)
+        descartar_resumo_serie(self.diretorio)
+        descartar_reunioes_ao_vivo(self.diretorio)
+        return True
+
+
+class GerenciadorProjetos:
+    """Projetos carregados no processo, com descarte dos ociosos.
+
+    O projeto padrão nunca é descartado. O índice de busca fica no cache LRU
+    de nucleo/busca.py, que já é limitado pelo número de entradas.
+    """
+
+    def __init__(self, tempo_ocioso=TEMPO_OCIOSO, maximo=MAXIMO_PROJETOS_CARREGADOS):
+        self.tempo_ocioso = tempo_ocioso
+        self.maximo = maximo
+        self._carregados = {}
+        self.descartados = 0
+        self._lock = threading.Lock()
+
+    # Função para obter um projeto, registrando o uso
+    def obter(self, nome=PROJETO_PADRAO):
+        with self._lock:
+            projeto = self._carregados.get(nome)
+            if projeto is None:
+                projeto = self._carregados[nome] = Projeto(nome)
+            projeto.ultimo_uso = time.monotonic()
+        self.descartar_ociosos()
+        return projeto
+
+    def carregados(self):
+        with self._lock:
+            return list(self._carregados.values())
+
+    # Função para descartar os projetos ociosos e os menos usados acima do limite
+    def descartar_ociosos(self):
+        agora = time.monotonic()
+        with self._lock:
+            candidatos = sorted((p for p in self._carregados.values() if p.nome != PROJETO_PADRAO),
+                                key=lambda p: p.ultimo_uso)
+            excesso = len(self._carregados) - self.maximo
+            descartados = []
+            for projeto in candidatos:
+                if agora - projeto.ultimo_uso < self.tempo_ocioso and excesso <= 0:
+                    break
+                if projeto.descartar():
+                    del self._carregados[projeto.nome]
+                    descartados.append(projeto.nome)
+                    excesso -= 1
+            self.descartados += len(descartados)
+        return descartados
+
+    def resumo(self):
+        agora = time.monotonic()
+        with self._lock:
+            carregados = {nome: round(agora - p.ultimo_uso, 1) for nome, p in self._carregados.items()}
+            return {
+                "projetos": listar_projetos(),
+                "carregados": carregados,
+                "descartados": self.descartados,
+                "tempo_ocioso": self.tempo_ocioso,
+                "maximo": self.maximo
+            }
+
+_gerenciador = GerenciadorProjetos()
+
+# Função para obter o gerenciador de projetos do processo
+def gerenciador_projetos():
+    return _gerenciador
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lista ou cria projetos")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    subcomandos.add_parser("listar")
+    criar = subcomandos.add_parser("criar")
+    criar.add_argument("nome")
+    args = parser.parse_args()
+
+    if args.comando == "criar":
+        print(f"Projeto criado: copie as transcrições para {criar_projeto(args.nome)}")
+    else:
+        for nome in listar_projetos():
+            print(f"{nome:20s} {diretorio_projeto(nome)}")
@@ -0,0 +1,258 @@
+import re
+
+# Instruções de cada tipo de relatório
+PROMPTS_RELATORIO = {
+    "resumo": "Crie um resumo conciso da seguinte transcrição de reunião, destacando os principais pontos discutidos, decisões tomadas e próximos passos. Responda diretamente com o conteúdo, sem introduções ou explicações:",
+    "resumo_expandido": "Crie um resumo detalhado da seguinte transcrição de reunião, incluindo todos os tópicos discutidos, decisões tomadas, responsabilidades atribuídas e prazos estabelecidos. Responda diretamente com o conteúdo, sem introduções ou explicações:",
+    "insights": "Analise a seguinte transcrição de reunião e identifique insights importantes, padrões de comunicação, pontos de tensão, oportunidades de melhoria e recomendações. Responda diretamente com o conteúdo, sem introduções ou explicações:",
+    "ata": "Crie uma ata formal da seguinte reunião, incluindo data, participantes, pauta, discussões, decisões e encaminhamentos. Responda diretamente com o conteúdo, sem introduções ou explicações:",
+    "pontos_acao": "Extraia da seguinte transcrição de reunião todos os pontos de ação, tarefas atribuídas, responsáveis e prazos mencionados. Responda diretamente com o conteúdo, sem introduções ou explicações:"
+}
+
+# Número máximo de caracteres da transcrição enviados no prompt de relatório
+LIMITE_TRANSCRICAO = 15000
+
+# Linhas introdutórias comuns removidas das respostas
+LINHAS_INTRODUTORIAS = [
+    "Aqui está um resumo detalhado da transcrição da reunião, estruturado conforme solicitado:",
+    "Aqui está um resumo conciso da transcrição da reunião:",
+    "Aqui está a análise da transcrição da reunião:",
+    "Aqui está a ata formal da reunião:",
+    "Aqui estão os pontos de ação extraídos da transcrição:",
+    "Com base na transcrição fornecida, aqui está o resumo:",
+    "Analisando a transcrição da reunião, identifiquei os seguintes pontos:",
+    "Segue o resumo estruturado da reunião:",
+    "Aqui está o relatório solicitado:",
+    "Com base na transcrição, aqui estão os insights:",
+    "Aqui está a ata estruturada:",
+    "Segue a análise detalhada:",
+    "Aqui estão os principais pontos identificados:",
+    "Com base na transcrição da reunião:",
+    "Aqui está o resumo estruturado:",
+    "Segue o relatório solicitado:",
+    "Aqui está a análise completa:",
+    "Com base na transcrição fornecida:",
+    "Aqui está o conteúdo estruturado:",
+    "Segue a análise da reunião:"
+]
+
+# Função para montar o prompt de um relatório
+def prompt_relatorio(content, report_type):
+    prompt = PROMPTS_RELATORIO.get(report_type, PROMPTS_RELATORIO["resumo"])
+    return f"{prompt}\n\nTranscrição:\n{content[:LIMITE_TRANSCRICAO]}\n\nForneça uma resposta estruturada e detalhada em português, começando diretamente com o conteúdo solicitado."
+
+# Função para remover introduções e espaços extras da resposta do modelo
+def limpar_relatorio(report_text):
+    for line in LINHAS_INTRODUTORIAS:
+        report_text = report_text.replace(line, "").replace(line.replace(":", ""), "")
+    return report_text.strip()
+
+# Função para gerar um relatório com o modelo (exceções da API são propagadas)
+def gerar_relatorio(model, content, report_type):
+    response = model.generate_content(prompt_relatorio(content, report_type))
+    return limpar_relatorio(response.text)
+
+# Cabeçalho que separa cada relatório na resposta combinada
+FORMATO_SECAO = "=== {tipo} ==="
+PADRAO_SECAO = re.compile(r"^\s*=== (\w+) ===\s*$", re.MULTILINE)
+
+# Função para montar um prompt que pede vários relatórios de uma vez
+def prompt_relatorios_combinados(content, report_types):
+    """Envia a transcrição uma única vez com as instruções de cada tipo.
+
+    Cada relatório deve começar com a linha FORMATO_SECAO do seu tipo, o que
+    permite separar a resposta em relatórios independentes.
+    """
+    instrucoes = "\n\n".join(
+        f"{FORMATO_SECAO.format(tipo=tipo)}\n{PROMPTS_RELATORIO[tipo]}" for tipo in report_types
+    )
+    return f"""Gere os {len(report_types)} relatórios abaixo sobre a mesma transcrição de reunião.
+Comece cada relatório com a sua linha de cabeçalho exatamente como indicada (ex.: {FORMATO_SECAO.format(tipo=report_types[0])}), na mesma ordem, e não escreva nada fora das seções.
+
+{instrucoes}
+
+Transcrição:
+{content[:LIMITE_TRANSCRICAO]}
+
+Forneça respostas estruturadas e detalhadas em português, começando cada seção diretamente com o conteúdo solicitado."""
+
+# Função para separar a resposta combinada em relatórios por tipo
+def separar_relatorios(texto, report_types):
+    """Returns:
+        Dicionário {tipo: relatório}; tipos sem seção na resposta ficam de fora.
+    """
+    partes = PADRAO_SECAO.split(texto)
+    # split com grupo: [antes, tipo1, texto1, tipo2, texto2, ...]
+    relatorios = {}
+    for tipo, conteudo in zip(partes[1::2], partes[2::2]):
+        if tipo in report_types and tipo not in relatorios and conteudo.strip():
+            relatorios[tipo] = limpar_relatorio(conteudo)
+    return relatorios
+
+# Função para gerar vários relatórios em uma única chamada ao modelo
+def gerar_relatorios(model, content, report_types):
+    """Gera os relatórios de `report_types` com uma só chamada.
+
+    Os tipos que não vierem na resposta são gerados em chamadas separadas,
+    então o resultado sempre tem todos os tipos pedidos.
+
+    Returns:
+        Tupla (relatorios, chamadas): {tipo: texto} e o número de chamadas feitas.
+    """
+    report_types = list(report_types)
+    if len(report_types) == 1:
+        return {report_types[0]: gerar_relatorio(model, content, report_types[0])}, 1
+    response = model.generate_content(prompt_relatorios_combinados(content, report_types))
+    relatorios = separar_relatorios(response.text, report_types)
+    chamadas = 1
+    for tipo in report_types:
+        if tipo not in relatorios:
+            relatorios[tipo] = gerar_relatorio(model, content, tipo)
+            chamadas += 1
+    return {tipo: relatorios[tipo] for tipo in report_types}, chamadas
+
+# Função para comparar o tamanho da entrada: uma chamada por tipo × chamada combinada
+def comparar_entrada(model, content, report_types):
+    """Conta os tokens de entrada com `model.count_tokens`.
+
+    Returns:
+        Dicionário {"separados": tokens das N chamadas, "combinado": tokens
+        da chamada única}.
+    """
+    return {
+        "separados": sum(model.count_tokens(prompt_relatorio(content, tipo)).total_tokens for tipo in report_types),
+        "combinado": model.count_tokens(prompt_relatorios_combinados(content, list(report_types))).total_tokens
+    }
+
+# Função para montar o prompt do chat sobre várias transcrições
+def prompt_chat(question, documents):
+    """Monta o prompt com todas as transcrições.
+
+    Args:
+        question: Pergunta do usuário.
+        documents: Dicionário {nome da reunião: {"content": texto, ...}}.
+    """
+    combined_context = ""
+    for doc_name, doc_info in documents.items():
+        combined_context += f"\n\nTranscrição da reunião '{doc_name}':\n{doc_info['content']}\n"
+
+    return f"""Você é um assistente especializado em analisar transcrições de reuniões.
+    Responda à pergunta com base apenas nas informações contidas nas transcrições fornecidas.
+    Se a resposta não estiver nas transcrições, diga claramente que não consegue responder com base nas informações disponíveis.
+    Quando a informação estiver em uma transcrição específica, mencione qual reunião contém essa informação.
+
+    Contexto das transcrições:
+    {combined_context}
+
+    Pergunta: {question}
+
+    Resposta:"""
+
+# Função para responder uma pergunta sobre várias transcrições
+def responder_pergunta(model, question, documents):
+    return model.generate_content(prompt_chat(question, documents)).text
+
+# Função para montar o prompt do resumo consolidado a partir dos resumos de cada reunião
+def prompt_resumo_serie(resumos):
+    """Args:
+        resumos: Dicionário {nome da reunião: resumo}, em ordem cronológica.
+    """
+    blocos = "\n\n".join(f"Reunião '{nome}':\n{resumo}" for nome, resumo in resumos.items())
+    return f"""Consolide os resumos a seguir, de uma série de reuniões em ordem cronológica, em uma visão geral da série.
+Organize por temas, indicando em quais reuniões cada tema apareceu, como evoluiu e quais decisões, pendências e responsáveis seguem em aberto.
+Responda diretamente com o conteúdo, sem introduções ou explicações.
+
+{blocos}
+
+Forneça uma resposta estruturada em português, começando diretamente com o conteúdo solicitado."""
+
+# Função para montar o prompt que incorpora uma reunião nova ao resumo consolidado
+def prompt_incorporar_serie(resumo_serie, nome, resumo):
+    return f"""A seguir está a visão geral de uma série de reuniões e o resumo da reunião mais recente.
+Atualize a visão geral incorporando a reunião nova: acrescente temas novos, registre a evolução dos temas já existentes e atualize decisões, pendências e responsáveis.
+Mantenha a mesma organização por temas e a indicação das reuniões em que cada tema apareceu. Responda apenas com a visão geral atualizada, sem introduções ou explicações.
+
+Visão geral atual:
+{resumo_serie}
+
+Reunião nova '{nome}':
+{resumo}"""
+
+# Função para montar o prompt do chat sobre os resumos (em vez das transcrições)
+def prompt_chat_resumos(question, resumo_serie, resumos, documents=None):
+    """Args:
+        question: Pergunta do usuário.
+        resumo_serie: Visão geral consolidada da série.
+        resumos: Dicionário {nome da reunião: resumo}.
+        documents: Transcrições completas adicionais (ex.: reuniões em andamento).
+    """
+    contexto = "\n\n".join(f"Resumo da reunião '{nome}':\n{resumo}" for nome, resumo in resumos.items())
+    for doc_name, doc_info in (documents or {}).items():
+        contexto += f"\n\nTranscrição da reunião '{doc_name}':\n{doc_info['content']}\n"
+
+    return f"""Você é um assistente especializado em analisar reuniões.
+    Responda à pergunta com base apenas na visão geral da série e nos resumos das reuniões fornecidos.
+    Se a resposta não estiver nessas informações, diga claramente que não consegue responder com base nos resumos disponíveis.
+    Quando a informação vier de uma reunião específica, mencione qual reunião.
+
+    Visão geral da série:
+    {resumo_serie}
+
+    {contexto}
+
+    Pergunta: {question}
+
+    Resposta:"""
+
+# Função para montar o prompt de um turno da conversa (contexto recuperado + histórico)
+def prompt_conversa(question, contexto, resumo_historico, turnos):
+    """Args:
+        question: Pergunta atual.
+        contexto: Trechos das transcrições já recuperados na conversa.
+        resumo_historico: Resumo dos turnos antigos ("" se não houver).
+        turnos: Lista de (papel, texto) dos turnos recentes, papel "usuario" ou "assistente".
+    """
+    historico = "\n".join(
+        f"{'Usuário' if papel == 'usuario' else 'Assistente'}: {texto}" for papel, texto in turnos
+    )
+    if resumo_historico:
+        historico = f"Resumo da conversa até aqui:\n{resumo_historico}\n\n{historico}"
+
+    return f"""Você é um assistente especializado em analisar transcrições de reuniões, em uma conversa com o usuário.
+    Responda à pergunta com base apenas nos trechos das transcrições fornecidos e no histórico da conversa.
+    Se a resposta não estiver nos trechos, diga claramente que não consegue responder com base nas informações disponíveis.
+    Quando a informação estiver em uma reunião específica, mencione qual reunião.
+
+    Trechos das transcrições:
+    {contexto}
+
+    Histórico da conversa:
+    {historico or "(início da conversa)"}
+
+    Pergunta: {question}
+
+    Resposta:"""
+
+# Função para montar o prompt que resume os turnos antigos de uma conversa
+def prompt_resumir_historico(resumo_anterior, turnos):
+    historico = "\n".join(
+        f"{'Usuário' if papel == 'usuario' else 'Assistente'}: {texto}" for papel, texto in turnos
+    )
+    anterior = f"Resumo anterior:\n{resumo_anterior}\n\n" if resumo_anterior else ""
+    return f"""Resuma a conversa abaixo entre um usuário e um assistente sobre transcrições de reuniões, em poucos parágrafos.
+Preserve as perguntas feitas, os fatos e nomes citados nas respostas e as reuniões mencionadas, para que a conversa possa continuar só com este resumo.
+Responda apenas com o resumo.
+
+{anterior}{historico}"""
+
+# Função para montar o prompt que reescreve uma resposta calculada localmente
+def prompt_frasear_resposta(question, resposta_local):
+    return f"""Responda à pergunta do usuário em português, em poucas frases, usando somente os dados abaixo, que foram calculados a partir das transcrições das reuniões.
+Não invente números nem acrescente informações que não estejam nos dados. Se for útil, mantenha a tabela.
+
+Dados:
+{resposta_local}
+
+Pergunta: {question}
+
+Resposta:"""
@@ -0,0 +1,145 @@
+import html
+import os
+import threading
+import time
+from functools import lru_cache
+from string import Template
+
+import pandas as pd
+
+from nucleo.dados import DIRETORIO_BASE
+
+# Diretório com o modelo HTML e o CSS compartilhado dos relatórios
+DIRETORIO_MODELOS = os.path.join(DIRETORIO_BASE, "modelos")
+ARQUIVO_CSS = "relatorio.css"
+
+# Títulos dos relatórios por tipo
+TITULOS_RELATORIO = {
+    "resumo": "Resumo Conciso",
+    "resumo_expandido": "Resumo Expandido",
+    "insights": "Insights e Recomendações",
+    "ata": "Ata Formal",
+    "pontos_acao": "Pontos de Ação",
+    "visao_geral": "Visão Geral da Série"
+}
+
+# Função para carregar (uma única vez) o modelo HTML já compilado
+@lru_cache(maxsize=None)
+def modelo_relatorio():
+    with open(os.path.join(DIRETORIO_MODELOS, "relatorio.html"), 'r', encoding='utf-8') as file:
+        return Template(file.read())
+
+# Função para carregar (uma única vez) o CSS compartilhado
+@lru_cache(maxsize=None)
+def css_relatorio():
+    with open(os.path.join(DIRETORIO_MODELOS, ARQUIVO_CSS), 'r', encoding='utf-8') as file:
+        return file.read()
+
+# Conversores Markdown reaproveitados (um por thread, pois o objeto guarda estado)
+_conversores = threading.local()
+
+# Função para converter Markdown em HTML com um conversor reaproveitado
+def converter_markdown(texto):
+    try:
+        import markdown
+    except ImportError:
+        # Fallback simples se markdown não estiver disponível
+        return f'<div style="white-space: pre-wrap;">{html.escape(texto)}</div>'
+
+    md = getattr(_conversores, "md", None)
+    if md is None:
+        md = _conversores.md = markdown.Markdown(extensions=['extra', 'nl2br'])
+    return md.reset().convert(texto)
+
+# Função para renderizar um relatório em HTML
+def renderizar_relatorio(report_content, report_type, meeting_name, embutir_css=True, data_geracao=None):
+    """Renderiza o relatório com o modelo compilado.
+
+    Args:
+        report_content: Texto do relatório em Markdown
+        report_type: Tipo do relatório (chave de TITULOS_RELATORIO)
+        meeting_name: Nome da reunião
+        embutir_css: Se True, o CSS vai dentro do HTML (arquivo avulso para
+                     download). Se False, o HTML aponta para `relatorio.css`,
+                     que é gravado uma única vez junto dos arquivos do lote.
+        data_geracao: Texto da data de geração (padrão: agora)
+    """
+    if embutir_css:
+        estilo = f"<style>\n{css_relatorio()}    </style>"
+    else:
+        estilo = f'<link rel="stylesheet" href="{ARQUIVO_CSS}">'
+
+    return modelo_relatorio().substitute(
+        titulo=TITULOS_RELATORIO.get(report_type, "Relatório"),
+        reuniao=html.escape(meeting_name),
+        data_geracao=data_geracao or pd.Timestamp.now().strftime('%d/%m/%Y às %H:%M'),
+        estilo=estilo,
+        conteudo=converter_markdown(report_content)
+    )
+
+# Função para converter HTML em PDF localmente (sem serviços externos)
+def html_para_pdf(html_content, destino=None):
+    """Gera o PDF com a biblioteca opcional weasyprint.
+
+    Returns:
+        Os bytes do PDF, ou None quando `destino` é informado (o PDF é gravado
+        nesse caminho).
+
+    Raises:
+        RuntimeError: se a biblioteca weasyprint não estiver instalada.
+    """
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError):
+        raise RuntimeError("Biblioteca weasyprint não instalada. Execute: pip install weasyprint")
+    # base_url permite resolver o relatorio.css dos relatórios em lote
+    documento = HTML(string=html_content, base_url=os.path.dirname(destino) if destino else DIRETORIO_MODELOS)
+    return documento.write_pdf(destino)
+
+# Função para verificar se a geração de PDF está disponível
+def pdf_disponivel():
+    try:
+        import weasyprint  # noqa: F401
+        return True
+    except (ImportError, OSError):
+        # OSError: pacote instalado, mas sem as bibliotecas do sistema (Pango)
+        return False
+
+# Função para renderizar vários relatórios de uma vez
+def renderizar_lote(relatorios, diretorio_saida, formato="html"):
+    """Renderiza um lote de relatórios em arquivos.
+
+    Args:
+        relatorios: Iterável de tuplas (report_content, report_type, meeting_name)
+        diretorio_saida: Diretório onde os arquivos serão gravados
+        formato: "html" (com um único relatorio.css compartilhado) ou "pdf"
+
+    Returns:
+        Dicionário com os caminhos gerados, o total e a vazão (relatórios/s).
+    """
+    os.makedirs(diretorio_saida, exist_ok=True)
+    with open(os.path.join(diretorio_saida, ARQUIVO_CSS), 'w', encoding='utf-8') as file:
+        file.write(css_relatorio())
+
+    # Mesma data para todo o lote
+    data_geracao = pd.Timestamp.now().strftime('%d/%m/%Y às %H:%M')
+    caminhos = []
+    inicio = time.perf_counter()
+    for report_content, report_type, meeting_name in relatorios:
+        html_content = renderizar_relatorio(report_content, report_type, meeting_name,
+                                            embutir_css=False, data_geracao=data_geracao)
+        destino = os.path.join(diretorio_saida, f"{report_type}_{meeting_name}.{formato}")
+        if formato == "pdf":
+            html_para_pdf(html_content, destino)
+        else:
+            with open(destino, 'w', encoding='utf-8') as file:
+                file.write(html_content)
+        caminhos.append(destino)
+
+    duracao = time.perf_counter() - inicio
+    return {
+        "arquivos": caminhos,
+        "total": len(caminhos),
+        "segundos": duracao,
+        "relatorios_por_segundo": len(caminhos) / duracao if duracao > 0 else float("inf")
+    }
@@ -0,0 +1,79 @@
+import os
+from functools import lru_cache
+
+from nucleo.dados import DIRETORIO_SAIDAS, carregar_falas, extrair_info_arquivo, versao_falas
+
+# Extensão de cada tipo de artefato em saidas/ (o prefixo do nome é o tipo)
+EXTENSOES = {"excel": ".xlsx", "html": ".html"}
+
+# Função para listar as reuniões disponíveis e os artefatos de cada uma
+def listar_reunioes(diretorio=DIRETORIO_SAIDAS):
+    """Lista as reuniões do diretório, independente de qual formato existe.
+
+    Returns:
+        Dicionário ordenado pelo nome da reunião, no formato
+        {nome: {"excel": caminho ou None, "html": caminho ou None}}.
+    """
+    reunioes = {}
+    if not os.path.exists(diretorio):
+        return reunioes
+    for filename in os.listdir(diretorio):
+        file_info = extrair_info_arquivo(filename)
+        if not file_info:
+            continue
+        artefatos = reunioes.setdefault(file_info["meeting_name"], {"excel": None, "html": None})
+        artefatos[file_info["type"]] = os.path.join(diretorio, filename)
+    return dict(sorted(reunioes.items()))
+
+# Função para escolher o arquivo que serve de fonte canônica das falas
+def caminho_fonte(artefatos):
+    # A planilha é preferida: traz o texto original e as colunas de análise
+    return artefatos.get("excel") or artefatos.get("html")
+
+# Função para carregar as falas de uma reunião a partir do nome
+def carregar_reuniao(nome, diretorio=DIRETORIO_SAIDAS):
+    artefatos = listar_reunioes(diretorio).get(nome)
+    if not artefatos:
+        raise FileNotFoundError(f"Reunião não encontrada: {nome}")
+    return carregar_falas(caminho_fonte(artefatos))
+
+# Função para escolher o texto exibido de cada fala
+def textos_falas(df):
+    if 'frase_corrigida' in df.columns:
+        return df['frase_corrigida'].fillna(df['paragrafo']).astype(str)
+    return df['paragrafo'].fillna("").astype(str)
+
+# Função para formatar segundos como "HH:MM:SS"
+def formatar_hms(segundos):
+    segundos = int(segundos)
+    return f"{segundos // 3600:02d}:{segundos % 3600 // 60:02d}:{segundos % 60:02d}"
+
+# Função para montar o texto corrido da reunião (usado nos prompts)
+def texto_reuniao(df):
+    linhas = [
+        f"{locutor} ({formatar_hms(inicio)} - {formatar_hms(fim)}): {texto}"
+        for locutor, inicio, fim, texto in zip(df['locutor'], df['inicio'], df['fim'], textos_falas(df))
+    ]
+    return "\n".join(linhas)
+
+
+@lru_cache(maxsize=512)
+def _texto_arquivo(file_path, versao):
+    return texto_reuniao(carregar_falas(file_path))
+
+# Função para obter o texto de todas as reuniões (contexto do chat)
+def documentos_reunioes(diretorio=DIRETORIO_SAIDAS):
+    """Retorna {nome: {"filename", "content", "path"}} de cada reunião.
+
+    O texto de cada arquivo fica em cache pela versão (mtime e tamanho), então
+    arquivos novos ou alterados aparecem sem recarregar os demais.
+    """
+    documentos = {}
+    for nome, artefatos in listar_reunioes(diretorio).items():
+        file_path = caminho_fonte(artefatos)
+        documentos[nome] = {
+            "filename": os.path.basename(file_path),
+            "content": _texto_arquivo(file_path, versao_falas(file_path)),
+            "path": file_path
+        }
+    return documentos
@@ -0,0 +1,404 @@
+"""Roteador de perguntas do chat: responde localmente o que os dados resolvem.
+
+Perguntas como "quem falou mais na 3ª reunião", "quantos minutos o Dario
+falou" ou "padrões de participação" são respondidas com agregados das
+colunas locutor/duracao/palavras (as mesmas da página de análise), e as
+ações em aberto vêm das extrações do banco. Perguntas com horário ("quem
+estava falando aos 42:10 na 2ª reunião", "entre o minuto 30 e 40") usam o
+índice de intervalos da reunião (nucleo/intervalos.py), e uma janela citada
+em uma pergunta agregada ("quem falou menos nos primeiros 10 minutos")
+restringe os agregados a ela. A classificação é feita por regras, na ordem
+de INTENCOES. Perguntas sobre o conteúdo ("sobre", "o que",
+"resumo"...) e tudo o que as regras não reconhecem seguem para o LLM.
+Opcionalmente o LLM reescreve a resposta local a partir da tabela, que
+tem poucas linhas.
+
+`ESTATISTICAS_ROTEADOR` acumula, por processo, a taxa de perguntas
+respondidas localmente e a latência de cada caminho.
+"""
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+from nucleo.dados import DIRETORIO_SAIDAS, carregar_falas
+from nucleo.estatisticas import resumo_corpus
+from nucleo.extracao import consultar_acoes, consultar_decisoes, reunioes_pendentes
+from nucleo.intervalos import indice_intervalos, interpretar_horario
+from nucleo.locutores import NOME_ARQUIVO_LOCUTORES, carregar_registro, chave_nome
+from nucleo.prompts import prompt_frasear_resposta
+from nucleo.repositorio import caminho_fonte, formatar_hms, listar_reunioes, textos_falas
+from nucleo.serie import ordem_reuniao
+from nucleo.tokenizacao import STOPWORDS
+
+# Números por extenso das reuniões ("terceira reunião", "third meeting")
+ORDINAIS = {
+    "primeira": 1, "segunda": 2, "terceira": 3, "quarta": 4, "quinta": 5,
+    "sexta": 6, "setima": 7, "oitava": 8, "nona": 9, "decima": 10,
+    "first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5,
+    "sixth": 6, "seventh": 7, "eighth": 8, "ninth": 9, "tenth": 10
+}
+
+# "3ª reunião", "3a reuniao", "reunião 3", "3rd meeting", "terceira reunião" e listas
+# ("reuniões 2 e 3", "2ª e 3ª reuniões"). "8 reuniões", sem ordinal, é uma contagem
+_ORDINAL = r"(?:\d+\s*(?:a|o|st|nd|rd|th)\b|\d+|" + "|".join(ORDINAIS) + r")"
+PADRAO_REUNIAO = re.compile(
+    r"\b(?P<antes>" + _ORDINAL + r"(?:\s*(?:,|\be\b|\band\b)\s*" + _ORDINAL + r")*)"
+    r"\s+(?P<nome_antes>reuniao|reunioes|meetings?)\b"
+    r"|\b(?:reuniao|reunioes|meetings?)\s+(?:n\.?\s*)?(?P<depois>\d+(?:\s*(?:,|\be\b|\band\b)\s*\d+)*)\b"
+)
+PADRAO_NUMERO_REUNIAO = re.compile(r"\d+|\b(?:" + "|".join(ORDINAIS) + r")\b")
+
+# Horários citados: "00:42:10", "42:10"; sem eles, os números da pergunta são minutos
+PADRAO_HORARIO_CITADO = re.compile(r"\b\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d+)?")
+PADRAO_NUMERO = re.compile(r"\b\d+(?:[.,]\d+)?\b")
+
+# Janelas citadas: "primeiros 10 minutos", "últimos 5 minutos", "entre 10 e 20 minutos",
+# "entre o minuto 30 e 40", "entre 10:00 e 10:30"
+_VALOR_HORARIO = r"\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d+)?|\d+(?:[.,]\d+)?"
+PADRAO_JANELA = re.compile(
+    r"\b(?P<extremo>primeiros|ultimos|first|last) (?P<minutos>\d+(?:[.,]\d+)?) (?:minutos|minutes)\b"
+    r"|\b(?:entre|between) (?:os? |the )?(?:minutos? |minutes? )?(?P<de>" + _VALOR_HORARIO + r") (?:e|and) "
+    r"(?:o |the )?(?:minuto |minute )?(?P<ate>" + _VALOR_HORARIO + r")\b"
+)
+# Instantes citados: "42:10", "minuto 42"
+PADRAO_INSTANTE = re.compile(r"\b\d{1,2}:\d{2}\b|\bminut[oe]s? \d+")
+
+# Intenções agregadas (somas por participante), que uma janela citada restringe
+INTENCOES_AGREGADAS = ("tempo", "palavras", "falas", "ranking", "participacao")
+
+# Caracteres de cada fala na tabela da resposta por horário
+LIMITE_TEXTO_FALA = 200
+
+# Perguntas sobre o conteúdo das falas: sempre vão para o LLM
+PADRAO_CONTEUDO = re.compile(
+    r"\bsobre\b|\bo que\b|\bresum|\bdisse|\bopin|\bexplic|\bpor que\b|\bporque\b|\bcomo foi\b|\bwhat\b|\babout\b"
+)
+
+# Intenções reconhecidas, na ordem em que as regras são testadas
+INTENCOES = [
+    ("acoes", re.compile(r"\b(acoes|pontos de acao|tarefas|encaminhamentos|action items?)\b")),
+    ("decisoes", re.compile(r"\b(decisoes|decidido|decidimos|decisions?)\b")),
+    ("reunioes", re.compile(r"\bquantas reunioes\b|\bduracao da(s)? reunio(es|ao)\b|\bquanto (tempo )?durou\b")),
+    ("tempo", re.compile(r"\bquant[oa]s? (tempo|minutos|segundos|horas)\b|\btempo de fala\b|\bhow (long|many minutes)\b")),
+    ("palavras", re.compile(r"\bquantas palavras\b|\bhow many words\b")),
+    ("falas", re.compile(r"\bquantas (falas|vezes|intervencoes)\b|\bhow many (times|turns)\b")),
+    ("ranking", re.compile(r"\b(quem|who)\b.*\b(mais|menos|most|least)\b|\b(mais|menos) (falou|participou|ativo)")),
+    ("participacao", re.compile(
+        r"\bpadro?(ao|oes|es) de participacao\b|\bdistribuicao d[ae] (fala|participacao)\b|\bparticipantes\b"
+        r"|\bquem participou\b|\bparticipation\b|\bwho (spoke|talked)\b")),
+    ("instante", re.compile(PADRAO_JANELA.pattern + "|" + PADRAO_INSTANTE.pattern))
+]
+
+# Função para obter os números de sequência das reuniões citadas na pergunta
+def numeros_reunioes_citadas(pergunta):
+    numeros = []
+    for encontrado in PADRAO_REUNIAO.finditer(chave_nome(pergunta)):
+        lista = encontrado.group("antes") or encontrado.group("depois")
+        if encontrado.group("nome_antes") in ("reunioes", "meetings") and lista.isdigit():
+            continue  # "nas 8 reuniões": contagem, não citação
+        numeros += [int(v) if v.isdigit() else ORDINAIS[v] for v in PADRAO_NUMERO_REUNIAO.findall(lista)]
+    return list(dict.fromkeys(numeros))
+
+# Função para encontrar a reunião citada pelo número de sequência
+def reuniao_citada(pergunta, nomes):
+    """Returns:
+        Nome da reunião, ou None se a pergunta não cita exatamente uma
+        reunião existente (ver `numeros_reunioes_citadas`).
+    """
+    numeros = numeros_reunioes_citadas(pergunta)
+    if len(numeros) != 1:
+        return None
+    candidatas = [nome for nome in nomes if ordem_reuniao(nome)[0] == numeros[0]]
+    return candidatas[0] if len(candidatas) == 1 else None
+
+# Função para extrair a janela citada na pergunta, em segundos
+def janela_citada(pergunta, duracao=0.0):
+    """Args:
+        duracao: fim da reunião em segundos, referência de "últimos N minutos".
+
+    Returns:
+        (inicio, fim), ou None se a pergunta não cita uma janela.
+    """
+    encontrado = PADRAO_JANELA.search(PADRAO_REUNIAO.sub(" ", chave_nome(pergunta)))
+    if not encontrado:
+        return None
+    if encontrado.group("extremo"):
+        segundos = interpretar_horario(encontrado.group("minutos"))
+        if encontrado.group("extremo") in ("primeiros", "first"):
+            return 0.0, segundos
+        return max(0.0, duracao - segundos), duracao
+    return tuple(sorted(interpretar_horario(encontrado.group(g)) for g in ("de", "ate")))
+
+# Função para extrair o instante (um valor) ou a janela (dois valores) citados, em segundos
+def horarios_citados(pergunta, duracao=0.0):
+    janela = janela_citada(pergunta, duracao)
+    if janela is not None:
+        return list(janela)
+    texto = PADRAO_REUNIAO.sub(" ", chave_nome(pergunta))
+    valores = PADRAO_HORARIO_CITADO.findall(texto) or PADRAO_NUMERO.findall(texto)
+    return sorted(interpretar_horario(v) for v in valores[:2])
+
+# Função para encontrar os participantes citados (por qualquer palavra do nome ou apelido)
+def locutores_citados(pergunta, registro):
+    palavras = set(chave_nome(pergunta).split())
+    citados = []
+    for id_locutor, locutor in registro.locutores.items():
+        variantes = [locutor["nome"], *locutor["apelidos"]]
+        partes = {p for v in variantes for p in chave_nome(v).split() if len(p) >= 3 and p not in STOPWORDS}
+        if partes & palavras:
+            citados.append(locutor["nome"])
+    return citados
+
+# Função para formatar um DataFrame como tabela Markdown (sem dependências extras)
+def tabela_markdown(df):
+    linhas = ["| " + " | ".join(map(str, df.columns)) + " |", "|" + " --- |" * len(df.columns)]
+    for valores in df.itertuples(index=False, name=None):
+        linhas.append("| " + " | ".join("" if pd.isna(v) else str(v) for v in valores) + " |")
+    return "\n".join(linhas)
+
+# Função para montar a tabela por participante (minutos, falas, palavras, % do tempo)
+def _tabela_participantes(reunioes):
+    _, resumo = resumo_corpus(reunioes)
+    tabela = pd.DataFrame({
+        "Participante": resumo.index,
+        "Minutos": (resumo['duracao_total_s'] / 60).round(1).to_numpy(),
+        "% do tempo": resumo['percentual_tempo'].round(1).to_numpy(),
+        "Falas": resumo['falas'].astype(int).to_numpy(),
+        "Palavras": resumo['palavras_total'].astype(int).to_numpy()
+    })
+    if len(reunioes) > 1:
+        tabela["Reuniões"] = resumo['reunioes'].astype(int).to_numpy()
+    return tabela.sort_values("Minutos", ascending=False, ignore_index=True)
+
+# Função para restringir as falas de cada reunião à janela citada na pergunta
+def _recortar_janela(pergunta, dados, reunioes):
+    """Mantém as falas que se sobrepõem à janela (índice de intervalos) e
+    conta como duração só o trecho de cada fala dentro dela.
+
+    Returns:
+        Tupla (dados recortados, descrição da janela); a descrição é vazia
+        e os dados voltam inalterados se a pergunta não cita uma janela.
+    """
+    recortes, janelas = {}, set()
+    for nome, df in dados.items():
+        janela = janela_citada(pergunta, df['fim'].max() if len(df) else 0.0)
+        if janela is None:
+            return dados, ""
+        inicio, fim = janela
+        falas = df.iloc[indice_intervalos(caminho_fonte(reunioes[nome])).na_janela(inicio, fim)].copy()
+        falas['duracao'] = falas['fim'].clip(upper=fim) - falas['inicio'].clip(lower=inicio)
+        recortes[nome] = falas
+        janelas.add(janela)
+    if len(janelas) == 1:
+        inicio, fim = janelas.pop()
+        return recortes, f"entre {formatar_hms(inicio)} e {formatar_hms(fim)}"
+    return recortes, "na janela citada de cada reunião"
+
+class EstatisticasRoteador:
+    """Contadores do roteador: perguntas, respostas locais por intenção e
+    latência média de cada caminho (local e LLM)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.perguntas = 0
+        self.por_intencao = {}
+        self.segundos_local = 0.0
+        self.respostas_llm = 0
+        self.segundos_llm = 0.0
+
+    def registrar_local(self, intencao, segundos):
+        with self._lock:
+            self.perguntas += 1
+            self.por_intencao[intencao] = self.por_intencao.get(intencao, 0) + 1
+            self.segundos_local += segundos
+
+    def registrar_llm(self, segundos):
+        with self._lock:
+            self.perguntas += 1
+            self.respostas_llm += 1
+            self.segundos_llm += segundos
+
+    def resumo(self):
+        with self._lock:
+            locais = sum(self.por_intencao.values())
+            return {
+                "perguntas": self.perguntas,
+                "locais": locais,
+                "taxa_local": locais / self.perguntas if self.perguntas else None,
+                "por_intencao": dict(self.por_intencao),
+                "latencia_local_ms": 1000 * self.segundos_local / locais if locais else None,
+                "latencia_llm_s": self.segundos_llm / self.respostas_llm if self.respostas_llm else None
+            }
+
+ESTATISTICAS_ROTEADOR = EstatisticasRoteador()
+
+# Função para classificar a pergunta: nome da intenção ou None (segue para o LLM)
+def classificar(pergunta):
+    """Uma janela citada ("primeiros 10 minutos", "entre 10 e 20 minutos")
+    mantém a intenção agregada, que é calculada só dentro dela; um instante
+    ("aos 42:10", "no minuto 42") leva a pergunta agregada para "instante".
+    A duração das reuniões com horário segue para o LLM.
+    """
+    texto = chave_nome(pergunta)
+    janela = PADRAO_JANELA.search(texto)
+    instante = not janela and PADRAO_INSTANTE.search(texto)
+    for intencao, padrao in INTENCOES:
+        if padrao.search(texto):
+            # Ações e decisões são consultadas no banco mesmo quando a pergunta cita um assunto
+            if intencao not in ("acoes", "decisoes") and PADRAO_CONTEUDO.search(texto):
+                return None
+            if intencao == "reunioes" and (janela or instante):
+                return None
+            if intencao in INTENCOES_AGREGADAS and instante:
+                return "instante"
+            return intencao
+    return None
+
+# Função para responder quem falava em um instante ou o que foi dito em uma janela
+def _responder_horario(pergunta, reunioes, reuniao):
+    if reuniao is None and len(reunioes) == 1:
+        reuniao = next(iter(reunioes))
+    if reuniao is None:
+        return "Indique a reunião e o horário (ex.: \"quem falava aos 42:10 na 2ª reunião\").", pd.DataFrame()
+
+    file_path = caminho_fonte(reunioes[reuniao])
+    df = carregar_falas(file_path)
+    try:
+        horarios = horarios_citados(pergunta, df['fim'].max() if len(df) else 0.0)
+    except ValueError as e:
+        return f"{e}.", pd.DataFrame()
+    if not horarios:
+        return "Indique a reunião e o horário (ex.: \"quem falava aos 42:10 na 2ª reunião\").", pd.DataFrame()
+    indice = indice_intervalos(file_path)
+    if len(horarios) == 1:
+        posicoes = indice.no_instante(horarios[0])
+        momento = f"às {formatar_hms(horarios[0])}"
+    else:
+        posicoes = indice.na_janela(horarios[0], horarios[1])
+        momento = f"entre {formatar_hms(horarios[0])} e {formatar_hms(horarios[1])}"
+
+    falas = df.iloc[posicoes]
+    tabela = pd.DataFrame({
+        "Participante": falas['locutor'].astype(str).to_numpy(),
+        "Início": [formatar_hms(v) for v in falas['inicio']],
+        "Fim": [formatar_hms(v) for v in falas['fim']],
+        "Fala": [t[:LIMITE_TEXTO_FALA] + ("…" if len(t) > LIMITE_TEXTO_FALA else "") for t in textos_falas(falas)]
+    })
+    if len(tabela) == 0:
+        proxima = indice.mais_proxima(horarios[-1])
+        resumo = f"Ninguém estava falando {momento} em **{reuniao}**."
+        if proxima is not None:
+            fala = df.iloc[proxima]
+            resumo += f" A fala mais próxima é de **{fala['locutor']}** às {formatar_hms(fala['inicio'])}."
+        return resumo, tabela
+    if len(horarios) == 1:
+        nomes = [f"**{nome}**" for nome in dict.fromkeys(tabela["Participante"])]
+        verbo = "estava" if len(nomes) == 1 else "estavam"
+        return f"{', '.join(nomes)} {verbo} falando {momento} em **{reuniao}**.", tabela
+    return f"{len(tabela)} fala(s) {momento} em **{reuniao}**.", tabela
+
+# Função para responder localmente uma pergunta classificada
+def _responder(intencao, pergunta, diretorio):
+    reunioes = listar_reunioes(diretorio)
+    reuniao = reuniao_citada(pergunta, reunioes)
+    numeros = numeros_reunioes_citadas(pergunta)
+    if len(numeros) > 1:
+        return None  # Várias reuniões citadas: o LLM responde (as regras tratam uma ou todas)
+    if numeros and reuniao is None:
+        return f"Não encontrei a reunião {numeros[0]} ({len(reunioes)} reuniões disponíveis).", pd.DataFrame()
+    registro = carregar_registro(os.path.join(diretorio, NOME_ARQUIVO_LOCUTORES))
+    citados = locutores_citados(pergunta, registro)
+    escopo = f"em **{reuniao}**" if reuniao else f"nas {len(reunioes)} reuniões"
+
+    if intencao in ("acoes", "decisoes") and len(reunioes_pendentes(diretorio)) == len(reunioes):
+        return None  # Nenhuma reunião extraída ainda: o LLM lê as transcrições
+
+    if intencao == "decisoes":
+        tabela = consultar_decisoes(reuniao, diretorio)[["reuniao", "decisao"]].rename(
+            columns={"reuniao": "Reunião", "decisao": "Decisão"})
+        return f"{len(tabela)} decisão(ões) registrada(s) {escopo}.", tabela
+
+    if intencao == "acoes":
+        texto = chave_nome(pergunta)
+        status = "aberta" if re.search(r"\b(abert|pendent|open)", texto) else (
+            "concluida" if re.search(r"\b(conclu|feit|done)", texto) else None)
+        acoes = consultar_acoes(citados[0] if len(citados) == 1 else None, status, reuniao, diretorio)
+        tabela = acoes[["reuniao", "acao", "responsavel", "prazo", "status"]].rename(columns={
+            "reuniao": "Reunião", "acao": "Ação", "responsavel": "Responsável", "prazo": "Prazo", "status": "Status"})
+        filtro = f" de **{citados[0]}**" if len(citados) == 1 else ""
+        descricao = {"aberta": " em aberto", "concluida": " concluídas"}.get(status, "")
+        return f"{len(tabela)} ação(ões){descricao}{filtro} {escopo}.", tabela
+
+    if intencao == "instante":
+        return _responder_horario(pergunta, reunioes, reuniao)
+
+    dados = {nome: carregar_falas(caminho_fonte(reunioes[nome])) for nome in ([reuniao] if reuniao else reunioes)}
+    if intencao == "reunioes":
+        metricas, _ = resumo_corpus(dados)
+        tabela = pd.DataFrame([
+            {"Reunião": nome, "Minutos de fala": round(m["duracao_min"], 1), "Falas": m["falas"],
+             "Participantes": m["participantes"], "Palavras": m["palavras"]}
+            for nome, m in metricas.items()
+        ])
+        total = tabela["Minutos de fala"].sum()
+        return f"{len(tabela)} reunião(ões), {total:.0f} minutos de fala no total.", tabela
+
+    try:
+        dados, momento = _recortar_janela(pergunta, dados, reunioes)
+    except ValueError as e:
+        return f"{e}.", pd.DataFrame()
+    if momento:
+        escopo = f"{momento} {escopo}"
+    tabela = _tabela_participantes(dados)
+    if len(tabela) == 0:
+        return f"Nenhuma fala encontrada {escopo}.", tabela
+    if intencao == "ranking":
+        coluna = "Palavras" if "palavra" in chave_nome(pergunta) else "Minutos"
+        menos = bool(re.search(r"\b(menos|least)\b", chave_nome(pergunta)))
+        tabela = tabela.sort_values(coluna, ascending=menos, ignore_index=True)
+        primeiro = tabela.iloc[0]
+        return (f"**{primeiro['Participante']}** foi quem {'menos' if menos else 'mais'} falou {escopo}: "
+                f"{primeiro[coluna]} {coluna.lower()} ({primeiro['% do tempo']}% do tempo)."), tabela
+
+    if intencao in ("tempo", "palavras", "falas") and citados:
+        tabela = tabela[tabela["Participante"].isin(citados)].reset_index(drop=True)
+        coluna = {"tempo": "Minutos", "palavras": "Palavras", "falas": "Falas"}[intencao]
+        partes = [f"**{linha['Participante']}**: {linha[coluna]} {coluna.lower()}" for _, linha in tabela.iterrows()]
+        return "; ".join(partes) + f" {escopo}." if partes else f"Nenhuma fala encontrada {escopo}.", tabela
+
+    # Participação geral (ou tempo/palavras/falas sem um participante citado)
+    if citados:
+        tabela = tabela[tabela["Participante"].isin(citados)].reset_index(drop=True)
+    mais = tabela.iloc[0] if len(tabela) else None
+    resumo = f"Participação {escopo}: {len(tabela)} participante(s)"
+    if mais is not None:
+        resumo += f"; **{mais['Participante']}** concentra {mais['% do tempo']}% do tempo de fala"
+    return resumo + ".", tabela
+
+# Função para tentar responder a pergunta sem o LLM
+def rotear(pergunta, diretorio=DIRETORIO_SAIDAS):
+    """Returns:
+        None se a pergunta deve seguir para o LLM; caso contrário um
+        dicionário {"intencao", "texto" (Markdown), "tabela" (DataFrame),
+        "segundos"}. A resposta local é registrada em ESTATISTICAS_ROTEADOR;
+        a do LLM deve ser registrada por quem a gerar (`registrar_llm`).
+    """
+    inicio = time.perf_counter()
+    intencao = classificar(pergunta)
+    if intencao is None:
+        return None
+    resposta = _responder(intencao, pergunta, diretorio)
+    if resposta is None:
+        return None
+    resumo, tabela = resposta
+    segundos = time.perf_counter() - inicio
+    ESTATISTICAS_ROTEADOR.registrar_local(intencao, segundos)
+    texto = f"{resumo}\n\n{tabela_markdown(tabela)}" if len(tabela) else resumo
+    return {"intencao": intencao, "texto": texto, "tabela": tabela, "segundos": segundos}
+
+# Função para reescrever a resposta local em linguagem natural com o LLM (entrada de poucos KB)
+def frasear(model, pergunta, resposta):
+    return model.generate_content(prompt_frasear_resposta(pergunta, resposta["texto"])).text
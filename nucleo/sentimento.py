@@ -0,0 +1,115 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from nucleo.dados import carregar_falas, versao_falas
+from nucleo.participacao import indices_bins
+from nucleo.repositorio import textos_falas
+from nucleo.tokenizacao import tokens_brutos
+
+# Versão do léxico: entra na chave dos caches e do banco, então alterar as
+# listas abaixo exige incrementá-la
+VERSAO_LEXICO = 1
+
+PALAVRAS_POSITIVAS = frozenset("""
+bom boa bons boas ótimo ótima ótimos ótimas excelente excelentes positivo positiva feliz felizes
+concordo concordamos aprovado aprovada sucesso eficiente eficaz melhor melhores progresso avanço
+avanços legal legais interessante interessantes bacana perfeito perfeita perfeitamente certo certa
+correto correta exato exatamente gostei gosto gostaram adorei maravilhoso maravilhosa incrível
+parabéns obrigado obrigada tranquilo tranquila funciona funcionou conseguiu conseguiram consegui
+beleza fácil ajudou ajuda animado animada acertou acertaram bonito bonita claro clara
+""".split())
+
+PALAVRAS_NEGATIVAS = frozenset("""
+ruim ruins péssimo péssima negativo negativa triste discordo reprovado reprovada fracasso
+ineficiente ineficaz pior piores problema problemas dificuldade dificuldades difícil difíceis
+errado errada errados erradas erro erros errou erraram complicado complicada confuso confusa
+preocupado preocupada preocupação chato chata infelizmente falha falhou pena cansado cansada
+atrasado atrasada atraso medo perdido perdida perderam frustrante estranho estranha
+""".split())
+
+# Palavras que invertem a polaridade das próximas JANELA_NEGACAO palavras ("não é bom")
+NEGACOES = frozenset(["não", "nem", "nunca", "jamais", "nada"])
+JANELA_NEGACAO = 2
+
+# Léxico como tabela hash: palavra -> +1 / -1
+LEXICO = {**{p: 1 for p in PALAVRAS_POSITIVAS}, **{p: -1 for p in PALAVRAS_NEGATIVAS}}
+
+# Função para pontuar o sentimento de cada fala
+def pontuar_falas(textos):
+    """Conta palavras positivas e negativas de cada fala.
+
+    Cada token distinto é procurado no léxico uma única vez; a polaridade de
+    cada ocorrência vem por indexação e a soma por fala com `bincount`. Uma
+    negação até JANELA_NEGACAO palavras antes (na mesma fala) inverte a
+    polaridade.
+
+    Returns:
+        DataFrame com `positivas`, `negativas` e `polaridade` =
+        (positivas - negativas) / (positivas + negativas), 0 sem palavras do léxico.
+    """
+    linhas, codigos, distintos = tokens_brutos(textos)
+    n_falas = len(textos)
+    polaridade = np.fromiter((LEXICO.get(t, 0) for t in distintos), dtype=np.int8, count=len(distintos))[codigos]
+    negacao = np.fromiter((t in NEGACOES for t in distintos), dtype=bool, count=len(distintos))[codigos]
+
+    negado = np.zeros(len(polaridade), dtype=bool)
+    for distancia in range(1, JANELA_NEGACAO + 1):
+        negado[distancia:] |= negacao[:-distancia] & (linhas[distancia:] == linhas[:-distancia])
+    polaridade = np.where(negado, -polaridade, polaridade)
+
+    positivas = np.bincount(linhas, weights=polaridade > 0, minlength=n_falas).astype(np.int64)
+    negativas = np.bincount(linhas, weights=polaridade < 0, minlength=n_falas).astype(np.int64)
+    total = positivas + negativas
+    return pd.DataFrame({
+        "positivas": positivas,
+        "negativas": negativas,
+        "polaridade": np.divide(positivas - negativas, total, out=np.zeros(n_falas), where=total > 0)
+    })
+
+@lru_cache(maxsize=512)
+def _sentimento_reuniao(file_path, versao, versao_lexico):
+    df = carregar_falas(file_path)
+    sentimento = pontuar_falas(textos_falas(df))
+    sentimento.insert(0, "locutor", df['locutor'].astype(str).to_numpy())
+    sentimento.insert(1, "inicio", df['inicio'].to_numpy(dtype=np.float64))
+    return sentimento
+
+# Função para obter o sentimento das falas de uma reunião (cache pela versão do arquivo)
+def sentimento_reuniao(file_path):
+    return _sentimento_reuniao(file_path, versao_falas(file_path), VERSAO_LEXICO)
+
+# Função para agregar a polaridade: soma das positivas e negativas do grupo
+def _polaridade_agrupada(sentimento, chaves):
+    grupos = sentimento.groupby(chaves, sort=False)[["positivas", "negativas"]].sum()
+    total = grupos["positivas"] + grupos["negativas"]
+    return ((grupos["positivas"] - grupos["negativas"]) / total.where(total > 0)).rename("polaridade")
+
+# Função para calcular o sentimento ao longo de uma reunião
+def serie_sentimento(file_path, n_bins=10, por_locutor=True):
+    """Polaridade em `n_bins` intervalos iguais da reunião.
+
+    Returns:
+        DataFrame intervalos (início em min) × locutores (ou uma coluna
+        "Todos"); NaN onde não houve palavras do léxico.
+    """
+    sentimento = sentimento_reuniao(file_path)
+    bins, bordas = indices_bins(sentimento['inicio'].to_numpy(), n_bins)
+    chaves = [bins, sentimento['locutor'] if por_locutor else np.full(len(sentimento), "Todos")]
+    serie = _polaridade_agrupada(sentimento, chaves).unstack()
+    return serie.reindex(range(n_bins)).set_axis(np.round(bordas[:-1] / 60, 1), axis=0)
+
+# Função para calcular o sentimento de cada reunião, por locutor
+def sentimento_por_reuniao(arquivos, por_locutor=True):
+    """Returns:
+        DataFrame reuniões (na ordem de `arquivos`) × locutores (ou "Todos").
+    """
+    partes = []
+    for arquivo in arquivos:
+        sentimento = sentimento_reuniao(arquivo)
+        locutores = sentimento['locutor'] if por_locutor else np.full(len(sentimento), "Todos")
+        partes.append(_polaridade_agrupada(sentimento, locutores).rename(arquivo))
+    if not partes:
+        return pd.DataFrame()
+    return pd.DataFrame(partes)
@@ -0,0 +1,203 @@
+"""Resumo consolidado da série de reuniões, atualizado de forma incremental.
+
+Cada reunião tem um resumo ("resumo" no cache de relatórios de
+nucleo/pre_geracao.py). A visão geral da série é guardada no
+cache/relatorios/ do projeto junto com a lista de reuniões já incorporadas e a chave do
+resumo de cada uma. Quando chega uma reunião nova, só o resumo dela é
+incorporado à visão geral: uma chamada com alguns kilobytes, em vez de todas
+as transcrições. Se uma reunião já incorporada muda ou sai do diretório, a
+visão geral é refeita a partir dos resumos (uma chamada).
+
+Uso:
+    python -m nucleo.serie [--diretorio saidas]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+from nucleo.dados import DIRETORIO_SAIDAS
+from nucleo.llm import MODELO_PADRAO, obter_genai
+from nucleo.pre_geracao import chave_relatorio, diretorio_relatorios, nome_modelo, pre_gerador
+from nucleo.prompts import (
+    limpar_relatorio, prompt_chat_resumos, prompt_incorporar_serie, prompt_resumo_serie
+)
+from nucleo.repositorio import carregar_reuniao, listar_reunioes, texto_reuniao
+
+# Tipo de relatório usado como resumo de cada reunião
+TIPO_RESUMO_REUNIAO = "resumo"
+
+# Perguntas que comparam reuniões ou pedem uma visão do conjunto
+PADRAO_PERGUNTA_SERIE = re.compile(
+    r"compar|todas as reuni|entre as reuni|ao longo|evolu|visão geral|panorama|série|recorrent|tendência",
+    re.IGNORECASE
+)
+
+# Função para ordenar as reuniões pelo número de sequência ("2ª Reunião" antes de "10ª Reunião")
+def ordem_reuniao(nome):
+    numero = re.match(r"\s*(\d+)", nome)
+    return (int(numero.group(1)) if numero else float("inf"), nome)
+
+# Função para verificar se uma pergunta é sobre o conjunto das reuniões
+def pergunta_sobre_serie(pergunta):
+    return bool(PADRAO_PERGUNTA_SERIE.search(pergunta))
+
+class ResumoSerie:
+    """Visão geral de um diretório de reuniões para um modelo.
+
+    O estado em disco tem o formato {"modelo", "reunioes": [[nome, chave do
+    resumo], ...], "resumo", "atualizado_em"}; a lista segue a ordem
+    cronológica e cada reunião incorporada é gravada logo em seguida.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_SAIDAS):
+        self.diretorio = diretorio
+        self.diretorio_cache = diretorio_relatorios(diretorio)
+        self._lock = threading.Lock()
+
+    def _caminho(self, model):
+        chave = hashlib.sha256(f"{os.path.abspath(self.diretorio)}\n{nome_modelo(model)}".encode("utf-8"))
+        return os.path.join(self.diretorio_cache, f"serie_{chave.hexdigest()[:16]}.json")
+
+    def estado(self, model):
+        try:
+            with open(self._caminho(model), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"modelo": nome_modelo(model), "reunioes": [], "resumo": "", "atualizado_em": None}
+
+    def _gravar(self, model, estado):
+        estado["atualizado_em"] = datetime.now().isoformat(timespec="seconds")
+        file_path = self._caminho(model)
+        os.makedirs(self.diretorio_cache, exist_ok=True)
+        temporario = file_path + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as file:
+            json.dump(estado, file, ensure_ascii=False, indent=2)
+        os.replace(temporario, file_path)
+
+    # Função para listar as reuniões em ordem cronológica com a chave do resumo de cada uma
+    def reunioes(self, model):
+        reunioes = []
+        for nome in sorted(listar_reunioes(self.diretorio), key=ordem_reuniao):
+            content = texto_reuniao(carregar_reuniao(nome, self.diretorio))
+            reunioes.append((nome, content, chave_relatorio(model, content, TIPO_RESUMO_REUNIAO)))
+        return reunioes
+
+    # Função para obter o resumo de cada reunião (do cache ou gerado agora)
+    def resumos(self, model, reunioes=None):
+        resumos, chamadas = {}, 0
+        for nome, content, _ in reunioes if reunioes is not None else self.reunioes(model):
+            relatorios, _, n = pre_gerador(self.diretorio).obter_relatorios(
+                model, content, [TIPO_RESUMO_REUNIAO], nome, contar_uso=False)
+            resumos[nome] = relatorios[TIPO_RESUMO_REUNIAO]
+            chamadas += n
+        return resumos, chamadas
+
+    # Função para verificar quais reuniões faltam incorporar (sem chamar o modelo)
+    def pendentes(self, model):
+        """Returns:
+            Tupla (nomes a incorporar, refazer): `refazer` indica que uma
+            reunião já incorporada mudou ou saiu e a visão geral será refeita.
+        """
+        atuais = [[nome, chave] for nome, _, chave in self.reunioes(model)]
+        incorporadas = self.estado(model)["reunioes"]
+        if atuais[:len(incorporadas)] != incorporadas:
+            return [nome for nome, _ in atuais], True
+        return [nome for nome, _ in atuais[len(incorporadas):]], False
+
+    # Função para atualizar a visão geral incorporando só as reuniões novas
+    def atualizar(self, model, ao_incorporar=None):
+        """Args:
+            ao_incorporar: Função opcional chamada com o nome de cada reunião
+                incorporada (barra de progresso).
+
+        Returns:
+            Dicionário {"resumo", "reunioes", "incorporadas", "refeito",
+            "chamadas"}.
+        """
+        with self._lock:
+            reunioes = self.reunioes(model)
+            estado = self.estado(model)
+            atuais = [[nome, chave] for nome, _, chave in reunioes]
+            refeito = atuais[:len(estado["reunioes"])] != estado["reunioes"]
+            novas = reunioes if refeito else reunioes[len(estado["reunioes"]):]
+            resumos, chamadas = self.resumos(model, novas)
+
+            if (refeito or not estado["reunioes"]) and len(novas) > 1:
+                # Do zero: uma chamada com todos os resumos
+                resposta = model.generate_content(prompt_resumo_serie(resumos))
+                estado = {"modelo": nome_modelo(model), "reunioes": atuais, "resumo": limpar_relatorio(resposta.text)}
+                self._gravar(model, estado)
+                chamadas += 1
+                if ao_incorporar:
+                    for nome in resumos:
+                        ao_incorporar(nome)
+            else:
+                if refeito:
+                    estado = {"modelo": nome_modelo(model), "reunioes": [], "resumo": ""}
+                for nome, _, chave in novas:
+                    if estado["resumo"]:
+                        resposta = model.generate_content(prompt_incorporar_serie(estado["resumo"], nome, resumos[nome]))
+                        estado["resumo"] = limpar_relatorio(resposta.text)
+                        chamadas += 1
+                    else:
+                        # Primeira reunião: a visão geral começa pelo próprio resumo
+                        estado["resumo"] = resumos[nome]
+                    estado["reunioes"].append([nome, chave])
+                    self._gravar(model, estado)
+                    if ao_incorporar:
+                        ao_incorporar(nome)
+
+            return {
+                "resumo": estado["resumo"],
+                "reunioes": [nome for nome, _ in estado["reunioes"]],
+                "incorporadas": [nome for nome, _, _ in novas],
+                "refeito": refeito,
+                "chamadas": chamadas
+            }
+
+    # Função para responder uma pergunta sobre a série a partir dos resumos
+    def responder(self, model, question, documents=None):
+        """Atualiza a visão geral se preciso e responde com ela e os resumos.
+
+        Args:
+            documents: Transcrições completas adicionais (ex.: reuniões em andamento).
+
+        Returns:
+            Tupla (resposta, caracteres do prompt).
+        """
+        serie = self.atualizar(model)
+        resumos, _ = self.resumos(model)
+        prompt = prompt_chat_resumos(question, serie["resumo"], resumos, documents)
+        return model.generate_content(prompt).text, len(prompt)
+
+_series = {}
+_lock_series = threading.Lock()
+
+# Função para obter a visão geral de um diretório (uma instância por diretório)
+def resumo_serie(diretorio=DIRETORIO_SAIDAS):
+    with _lock_series:
+        if diretorio not in _series:
+            _series[diretorio] = ResumoSerie(diretorio)
+        return _series[diretorio]
+
+# Função para descartar a visão geral de um diretório (projeto ocioso)
+def descartar_resumo_serie(diretorio):
+    with _lock_series:
+        return _series.pop(diretorio, None) is not None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Atualiza o resumo consolidado da série de reuniões")
+    parser.add_argument("--diretorio", default=DIRETORIO_SAIDAS)
+    args = parser.parse_args()
+
+    genai = obter_genai(os.environ.get("GEMINI_API_KEY"))
+    if genai is None:
+        raise SystemExit("Biblioteca google-generativeai não instalada. Execute: pip install google-generativeai")
+    serie = resumo_serie(args.diretorio).atualizar(genai.GenerativeModel(MODELO_PADRAO),
+                                                   ao_incorporar=lambda nome: print(f"Incorporada: {nome}"))
+    print(f"{len(serie['reunioes'])} reunião(ões) na visão geral, {serie['chamadas']} chamada(s), "
+          f"{len(serie['resumo']):,} caracteres")
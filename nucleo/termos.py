@@ -0,0 +1,204 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from nucleo.banco import data_reuniao
+from nucleo.dados import DIRETORIO_SAIDAS, carregar_falas, versao_falas
+from nucleo.repositorio import caminho_fonte, listar_reunioes
+from nucleo.tokenizacao import tokens_reuniao
+
+class Vocabulario:
+    """Termo -> id inteiro. Os ids só crescem, então matrizes já montadas
+    continuam válidas quando reuniões novas trazem termos novos."""
+
+    def __init__(self):
+        self.ids = {}
+        self.termos = []
+
+    # Função para converter termos distintos em ids, registrando os novos
+    def codificar(self, distintos):
+        ids = np.empty(len(distintos), dtype=np.int64)
+        for posicao, termo in enumerate(distintos):
+            id_termo = self.ids.get(termo)
+            if id_termo is None:
+                id_termo = self.ids[termo] = len(self.termos)
+                self.termos.append(termo)
+            ids[posicao] = id_termo
+        return ids
+
+# Função para montar a matriz esparsa falas × termos (formato CSR) de uma reunião
+def matriz_termos(tokens, n_falas, vocabulario):
+    """Conta os termos de cada fala a partir dos tokens da reunião.
+
+    Returns:
+        Dicionário {"indptr", "indices", "contagens"}: as contagens da fala i
+        ficam em indices/contagens[indptr[i]:indptr[i + 1]].
+    """
+    ids = vocabulario.codificar(tokens["termos"])[tokens["codigos"]]
+    # Chave única (fala, termo) ordenada por fala e depois por termo
+    chaves, contagens = np.unique((tokens["linhas"].astype(np.int64) << 32) | ids, return_counts=True)
+    return {
+        "indptr": np.searchsorted(chaves >> 32, np.arange(n_falas + 1)),
+        "indices": chaves & 0xFFFFFFFF,
+        "contagens": contagens.astype(np.float64)
+    }
+
+class IndiceTermos:
+    """Índice TF-IDF do corpus, atualizado reunião a reunião.
+
+    Guarda a matriz falas × termos de cada reunião e as frequências de
+    documento em dois níveis: falas (para termos de um locutor ou trecho) e
+    reuniões (para termos característicos de cada reunião). Ao atualizar, só
+    as reuniões novas ou alteradas são tokenizadas, e as frequências são
+    ajustadas somando e subtraindo a contribuição de cada uma.
+    """
+
+    def __init__(self):
+        self.vocabulario = Vocabulario()
+        self.reunioes = {}
+        self.df_falas = np.zeros(0)
+        self.df_reunioes = np.zeros(0)
+        self.total_falas = 0
+        self._lock = threading.Lock()
+
+    # Função para somar (sinal=1) ou subtrair (sinal=-1) uma reunião das frequências
+    def _contabilizar(self, reuniao, sinal):
+        n = len(self.vocabulario.termos)
+        if len(self.df_falas) < n:
+            self.df_falas = np.pad(self.df_falas, (0, n - len(self.df_falas)))
+            self.df_reunioes = np.pad(self.df_reunioes, (0, n - len(self.df_reunioes)))
+        matriz = reuniao["matriz"]
+        self.df_falas += sinal * np.bincount(matriz["indices"], minlength=n)
+        self.df_reunioes[np.unique(matriz["indices"])] += sinal
+        self.total_falas += sinal * (len(matriz["indptr"]) - 1)
+
+    # Função para sincronizar o índice com as fontes {nome: caminho}
+    def atualizar(self, fontes):
+        """Retorna o número de reuniões (re)tokenizadas."""
+        with self._lock:
+            alteradas = 0
+            for nome in [n for n in self.reunioes if n not in fontes]:
+                self._contabilizar(self.reunioes.pop(nome), -1)
+            for nome, file_path in fontes.items():
+                versao = versao_falas(file_path)
+                anterior = self.reunioes.get(nome)
+                if anterior and anterior["versao"] == versao and anterior["arquivo"] == file_path:
+                    continue
+                if anterior:
+                    self._contabilizar(anterior, -1)
+                df = carregar_falas(file_path)
+                reuniao = {
+                    "arquivo": file_path,
+                    "versao": versao,
+                    "data": data_reuniao(nome),
+                    "locutor": df['locutor'].astype(str).to_numpy(),
+                    "inicio": df['inicio'].to_numpy(dtype=np.float64),
+                    "matriz": matriz_termos(tokens_reuniao(file_path), len(df), self.vocabulario)
+                }
+                self.reunioes[nome] = reuniao
+                self._contabilizar(reuniao, 1)
+                alteradas += 1
+            # Ordem cronológica (dia/mês no nome), depois pelo nome
+            self.reunioes = dict(sorted(self.reunioes.items(),
+                                        key=lambda item: ((item[1]["data"][1] or 0, item[1]["data"][0] or 0),
+                                                          item[0])))
+            return alteradas
+
+    # IDF suavizado: log((1 + N) / (1 + df)) + 1
+    def _idf(self, nivel):
+        if nivel == "reunioes":
+            return np.log((1 + len(self.reunioes)) / (1 + self.df_reunioes)) + 1
+        return np.log((1 + self.total_falas) / (1 + self.df_falas)) + 1
+
+    # Função para somar as linhas selecionadas da matriz de uma reunião
+    def _frequencias(self, nome, mascara=None):
+        reuniao = self.reunioes[nome]
+        matriz = reuniao["matriz"]
+        indices, contagens = matriz["indices"], matriz["contagens"]
+        if mascara is not None:
+            linhas = np.repeat(mascara, np.diff(matriz["indptr"]))
+            indices, contagens = indices[linhas], contagens[linhas]
+        return np.bincount(indices, weights=contagens, minlength=len(self.vocabulario.termos))
+
+    # Função para ordenar os termos de um vetor de frequências pelo TF-IDF
+    def _melhores(self, frequencias, nivel, n):
+        pesos = frequencias * self._idf(nivel)
+        melhores = np.argsort(-pesos, kind='stable')[:n]
+        melhores = melhores[pesos[melhores] > 0]
+        termos = self.vocabulario.termos
+        return pd.DataFrame({
+            "termo": [termos[i] for i in melhores],
+            "ocorrencias": frequencias[melhores].astype(np.int64),
+            "tfidf": pesos[melhores]
+        })
+
+    # Função para obter os termos característicos de uma reunião
+    def termos_reuniao(self, nome, n=20):
+        return self._melhores(self._frequencias(nome), "reunioes", n)
+
+    # Função para obter os termos característicos de um locutor
+    def termos_locutor(self, locutor, n=20, reunioes=None):
+        frequencias = np.zeros(len(self.vocabulario.termos))
+        for nome in reunioes or self.reunioes:
+            mascara = self.reunioes[nome]["locutor"] == locutor
+            if mascara.any():
+                frequencias += self._frequencias(nome, mascara)
+        return self._melhores(frequencias, "falas", n)
+
+    # Função para obter os termos de um trecho [inicio_s, fim_s) de uma reunião
+    def termos_trecho(self, nome, inicio_s, fim_s, n=20):
+        inicio = self.reunioes[nome]["inicio"]
+        return self._melhores(self._frequencias(nome, (inicio >= inicio_s) & (inicio < fim_s)), "falas", n)
+
+    # Função para obter os termos que atravessam a série de reuniões
+    def termos_recorrentes(self, n=20, minimo_reunioes=2):
+        """Termos frequentes que aparecem em várias reuniões.
+
+        Ordena pelo TF-IDF das falas (penaliza palavras onipresentes) somado no
+        corpus, considerando só termos presentes em `minimo_reunioes` ou mais.
+        """
+        frequencias = sum((self._frequencias(nome) for nome in self.reunioes),
+                          np.zeros(len(self.vocabulario.termos)))
+        frequencias = np.where(self.df_reunioes >= minimo_reunioes, frequencias, 0.0)
+        resultado = self._melhores(frequencias, "falas", n)
+        resultado["reunioes"] = self.df_reunioes[
+            [self.vocabulario.ids[t] for t in resultado["termo"]]
+        ].astype(np.int64)
+        return resultado
+
+    # Função para listar os termos em destaque de cada reunião, em ordem cronológica
+    def termos_por_reuniao(self, n=5):
+        return {nome: self.termos_reuniao(nome, n)["termo"].tolist() for nome in self.reunioes}
+
+    # Função para calcular a frequência de termos em cada reunião (ocorrências por mil termos)
+    def tendencia_termos(self, termos):
+        """Returns:
+            DataFrame reuniões (ordem cronológica) × termos; termos fora do
+            vocabulário ficam com zero.
+        """
+        ids = [self.vocabulario.ids.get(t.lower().strip(), -1) for t in termos]
+        linhas = {}
+        for nome in self.reunioes:
+            frequencias = self._frequencias(nome)
+            total = frequencias.sum()
+            linhas[nome] = [1000 * frequencias[i] / total if i >= 0 and total else 0.0 for i in ids]
+        return pd.DataFrame.from_dict(linhas, orient="index", columns=list(termos))
+
+_indices = {}
+_lock_indices = threading.Lock()
+
+# Função para obter o índice de termos do diretório, atualizado com as reuniões atuais
+def indice_termos(diretorio=DIRETORIO_SAIDAS):
+    diretorio = os.path.abspath(diretorio)
+    with _lock_indices:
+        indice = _indices.setdefault(diretorio, IndiceTermos())
+    indice.atualizar({nome: os.path.abspath(caminho_fonte(artefatos))
+                      for nome, artefatos in listar_reunioes(diretorio).items()})
+    return indice
+
+# Função para descartar o índice de termos de um diretório (projeto ocioso)
+def descartar_indice_termos(diretorio):
+    with _lock_indices:
+        return _indices.pop(os.path.abspath(diretorio), None) is not None
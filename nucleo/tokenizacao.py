@@ -0,0 +1,123 @@
+import io
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from nucleo.ao_vivo import PADRAO_TOKEN
+from nucleo.dados import carregar_falas, versao_falas
+from nucleo.repositorio import textos_falas
+
+# Palavras sem conteúdo temático: lista usual do português mais marcas da fala
+STOPWORDS = frozenset("""
+a à ao aos aquela aquelas aquele aqueles aquilo as às até com como da das de dela delas dele deles
+depois do dos e é ela elas ele eles em entre era eram éramos essa essas esse esses esta está estamos
+estão estar estas estava estavam estávamos este esteja estejam estejamos estes esteve estive estivemos
+estiver estivera estiveram estivéramos estiverem estivermos estivesse estivessem estivéssemos estou eu
+foi fomos for fora foram fôramos forem formos fosse fossem fôssemos fui há haja hajam hajamos hão
+havemos haver hei houve houvemos houver houvera houverá houveram houvéramos houverão houverei houverem
+houveremos houveria houveriam houveríamos houvermos houvesse houvessem houvéssemos isso isto já lhe
+lhes mais mas me mesmo meu meus minha minhas muito na não nas nem no nos nós nossa nossas nosso
+nossos num numa o os ou para pela pelas pelo pelos por qual quando que quem são se seja sejam sejamos
+sem ser será serão serei seremos seria seriam seríamos seu seus só somos sou sua suas também te tem
+tém temos tenha tenham tenhamos tenho terá terão terei teremos teria teriam teríamos teu teus teve
+tinha tinham tínhamos tive tivemos tiver tivera tiveram tivéramos tiverem tivermos tivesse tivessem
+tivéssemos tu tua tuas um uma você vocês vos
+né aí tá pra pro daí então assim aqui ali lá acho gente coisa coisas vai vou vão vamos ver fazer faz
+fez dar dá pode podem poderia posso porque sim bom boa bem tudo todo todos toda todas agora
+ah eh hum olha sabe sei tipo nessa nesse dessa desse essa outro outra outros outras cada ainda
+mesma mesmos mesmas quer acha achei falar falou falei fala falando dizer disse ter tinha teve fica
+ficou ficar estava estou certo claro realmente talvez alguma algum alguns algumas algo sobre antes
+hoje pouco meio vez vezes deve deixa deixar pegar pensar pensando entendeu entendi quanto onde
+""".split())
+
+# Tamanho mínimo de um termo (descarta "la", "ok", siglas de uma letra etc.)
+TAMANHO_MINIMO_TERMO = 3
+
+# Função para verificar se um token é um termo de conteúdo
+def termo_valido(token):
+    return len(token) >= TAMANHO_MINIMO_TERMO and token.isalpha() and token not in STOPWORDS
+
+# Função para quebrar as falas em tokens, sem nenhum filtro
+def tokens_brutos(textos):
+    """Returns:
+        Tupla (linhas, codigos, distintos): para cada ocorrência, o número da
+        fala e o código do token em `distintos` (`pd.factorize`), na ordem do
+        texto.
+    """
+    tokens = [PADRAO_TOKEN.findall(texto.lower()) for texto in textos]
+    tamanhos = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=len(tokens))
+    codigos, distintos = pd.factorize(np.fromiter((p for t in tokens for p in t), dtype=object,
+                                                  count=int(tamanhos.sum())))
+    linhas = np.repeat(np.arange(len(tokens), dtype=np.int32), tamanhos)
+    return linhas, codigos, np.asarray(distintos, dtype=object)
+
+# Função para tokenizar as falas de uma reunião
+def tokenizar_falas(textos):
+    """Quebra as falas em termos, já sem stopwords, números e termos curtos.
+
+    Cada token distinto é filtrado uma única vez, não a cada ocorrência.
+
+    Returns:
+        Dicionário {"linhas", "codigos", "termos"}: para cada ocorrência, o
+        número da fala e o código do termo em `termos` (array de strings).
+    """
+    linhas, codigos, distintos = tokens_brutos(textos)
+    validos = np.fromiter((termo_valido(t) for t in distintos), dtype=bool, count=len(distintos))
+    # Renumera só os termos válidos; os descartados ficam com -1
+    novos_codigos = np.where(validos, np.cumsum(validos) - 1, -1)[codigos]
+    mantidos = novos_codigos >= 0
+    return {
+        "linhas": linhas[mantidos],
+        "codigos": novos_codigos[mantidos].astype(np.int32),
+        "termos": distintos[validos]
+    }
+
+@lru_cache(maxsize=64)
+def _tokens_reuniao(file_path, versao):
+    tokens = tokenizar_falas(textos_falas(carregar_falas(file_path)))
+    contagens = np.bincount(tokens["codigos"], minlength=len(tokens["termos"]))
+    # Contagem compacta: termos em ordem alfabética e contagens int32 alinhadas
+    ordem = np.argsort(tokens["termos"])
+    tokens["contagem"] = (tokens["termos"][ordem], contagens[ordem].astype(np.int32))
+    return tokens
+
+# Função para obter os tokens de uma reunião (tokenizada uma vez por versão do arquivo)
+def tokens_reuniao(file_path):
+    return _tokens_reuniao(file_path, versao_falas(file_path))
+
+# Função para somar as contagens de termos de várias reuniões
+def frequencias_termos(arquivos, n=None):
+    """Junta as contagens já calculadas de cada reunião, sem retokenizar.
+
+    Returns:
+        Series termo -> ocorrências, em ordem decrescente.
+    """
+    contagens = [tokens_reuniao(f)["contagem"] for f in arquivos]
+    if not contagens:
+        return pd.Series(dtype=np.int64, name="ocorrencias")
+    termos, inverso = np.unique(np.concatenate([t for t, _ in contagens]), return_inverse=True)
+    totais = np.bincount(inverso, weights=np.concatenate([c for _, c in contagens])).astype(np.int64)
+    ordem = np.argsort(-totais, kind='stable')[:n]
+    return pd.Series(totais[ordem], index=termos[ordem], name="ocorrencias")
+
+# Função para verificar se a biblioteca de nuvem de palavras está disponível
+def nuvem_disponivel():
+    try:
+        import wordcloud  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+# Função para gerar a nuvem de palavras (PNG) a partir das frequências
+def gerar_nuvem_palavras(frequencias, max_palavras=100, largura=800, altura=400):
+    try:
+        from wordcloud import WordCloud
+    except ImportError:
+        raise RuntimeError("Biblioteca wordcloud não instalada. Execute: pip install wordcloud")
+    nuvem = WordCloud(width=largura, height=altura, background_color='white',
+                      colormap='viridis', max_words=max_palavras)
+    nuvem.generate_from_frequencies(frequencias.head(max_palavras).to_dict())
+    buffer = io.BytesIO()
+    nuvem.to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -0,0 +1,108 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from nucleo.dados import carregar_falas, versao_falas
+
+# Métricas disponíveis na matriz locutor × locutor
+METRICAS_TURNOS = {
+    "transicoes": "Transições de turno",
+    "interrupcoes": "Interrupções",
+    "sobreposicao_s": "Sobreposição (s)"
+}
+
+# Função para gerar os pares (i, j) com i em [inicio_faixa[j], fim_faixa[j]) sem laço em Python
+def _pares_por_faixa(inicio_faixa, fim_faixa):
+    tamanhos = fim_faixa - inicio_faixa
+    total = int(tamanhos.sum())
+    if total == 0:
+        vazio = np.empty(0, dtype=np.int64)
+        return vazio, vazio
+    j = np.repeat(np.arange(len(tamanhos)), tamanhos)
+    # Posição de cada par dentro da sua faixa (0, 1, 2, ... reiniciando por j)
+    inicio_grupo = np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+    i = np.repeat(inicio_faixa, tamanhos) + (np.arange(total) - inicio_grupo)
+    return i, j
+
+# Função para calcular transições e sobreposições de uma reunião
+def calcular_turnos(locutores, inicio, fim):
+    """Calcula a tomada de turnos entre locutores com varredura de intervalos.
+
+    Args:
+        locutores: Sequência com o locutor de cada fala
+        inicio: Início de cada fala (s)
+        fim: Fim de cada fala (s)
+
+    Returns:
+        DataFrame em formato longo com as colunas 'origem', 'destino',
+        'transicoes', 'interrupcoes' e 'sobreposicao_s'. Uma transição é a
+        passagem da fala de `origem` para a fala seguinte, de outro locutor
+        `destino` (falas seguidas do mesmo locutor não contam); uma
+        interrupção é `destino` começando a falar antes de `origem` terminar.
+    """
+    colunas = ['origem', 'destino'] + list(METRICAS_TURNOS)
+    inicio = np.asarray(inicio, dtype=np.float64)
+    fim = np.asarray(fim, dtype=np.float64)
+    if len(inicio) == 0:
+        return pd.DataFrame(columns=colunas)
+
+    ordem = np.argsort(inicio, kind='stable')
+    codigos, nomes = pd.factorize(np.asarray(locutores)[ordem])
+    inicio, fim = inicio[ordem], fim[ordem]
+    k = len(nomes)
+
+    # Transições: fala n -> fala n+1 de outro locutor, na ordem de início
+    troca = codigos[:-1] != codigos[1:]
+    transicoes = np.bincount((codigos[:-1] * k + codigos[1:])[troca], minlength=k * k)
+
+    # Sobreposições: para cada fala i, as falas j seguintes que começam antes de
+    # i terminar. Na ordem de início elas formam uma faixa contígua (uma busca
+    # binária), e cada par gerado é uma sobreposição: uma fala longa gera só os
+    # seus pares, sem tornar candidatas as falas que vêm depois dela
+    posicoes = np.arange(len(inicio))
+    ultima = np.maximum(np.searchsorted(inicio, fim, side='left'), posicoes + 1)
+    j, i = _pares_por_faixa(posicoes + 1, ultima)
+    sobrepoe = codigos[i] != codigos[j]
+    i, j = i[sobrepoe], j[sobrepoe]
+    segundos = np.minimum(fim[i], fim[j]) - inicio[j]
+
+    pares = codigos[i] * k + codigos[j]
+    interrupcoes = np.bincount(pares, minlength=k * k)
+    sobreposicao = np.bincount(pares, weights=segundos, minlength=k * k)
+
+    origem, destino = np.divmod(np.arange(k * k), k)
+    resultado = pd.DataFrame({
+        'origem': np.asarray(nomes)[origem],
+        'destino': np.asarray(nomes)[destino],
+        'transicoes': transicoes,
+        'interrupcoes': interrupcoes,
+        'sobreposicao_s': sobreposicao
+    })
+    # Formato longo e esparso: só os pares com alguma interação
+    return resultado[(resultado[list(METRICAS_TURNOS)] != 0).any(axis=1)].reset_index(drop=True)
+
+@lru_cache(maxsize=512)
+def _turnos_reuniao(file_path, versao):
+    df = carregar_falas(file_path)
+    df = df[df['locutor'].notna() & df['inicio'].notna() & df['fim'].notna()]
+    return calcular_turnos(df['locutor'].astype(str), df['inicio'], df['fim'])
+
+# Função para obter a tomada de turnos de uma reunião (cache pela versão das falas)
+def turnos_reuniao(file_path):
+    return _turnos_reuniao(file_path, versao_falas(file_path))
+
+# Função para agregar a tomada de turnos de várias reuniões
+def turnos_agregados(arquivos):
+    partes = [turnos_reuniao(f) for f in arquivos]
+    partes = [p for p in partes if len(p) > 0]
+    if not partes:
+        return pd.DataFrame(columns=['origem', 'destino'] + list(METRICAS_TURNOS))
+    return pd.concat(partes, ignore_index=True).groupby(['origem', 'destino'], as_index=False).sum()
+
+# Função para transformar o formato longo em matriz locutor × locutor
+def matriz_turnos(turnos, metrica="transicoes"):
+    locutores = sorted(set(turnos['origem']) | set(turnos['destino']))
+    matriz = turnos.pivot_table(index='origem', columns='destino', values=metrica,
+                                aggfunc='sum', fill_value=0)
+    return matriz.reindex(index=locutores, columns=locutores, fill_value=0)
@@ -1,9 +1,22 @@
 import streamlit as st
-import pandas as pd
 import os
 import plotly.express as px
 import plotly.graph_objects as go
 import re
+from nucleo.ao_vivo import diretorio_ao_vivo, listar_ao_vivo, obter_reuniao_ao_vivo
+from nucleo.dados import carregar_falas, versao_falas
+from nucleo.estatisticas import resumo_por_locutor
+from nucleo.intervalos import indice_intervalos
+from nucleo.linha_tempo import montar_linha_tempo, LARGURA_PADRAO_PX
+from nucleo.participacao import (
+    METRICAS_PARTICIPACAO, participacao_por_bins, participacao_janela_movel, participacao_corpus
+)
+from nucleo.projetos import PROJETO_PADRAO, gerenciador_projetos
+from nucleo.repositorio import caminho_fonte, formatar_hms, listar_reunioes, textos_falas
+from nucleo.sentimento import serie_sentimento, sentimento_por_reuniao
+from nucleo.termos import indice_termos
+from nucleo.tokenizacao import frequencias_termos, gerar_nuvem_palavras, nuvem_disponivel
+from nucleo.turnos import METRICAS_TURNOS, turnos_reuniao, turnos_agregados, matriz_turnos
 
 # Configuração da página
 st.set_page_config(
@@ -16,8 +29,8 @@ st.set_page_config(
 st.title("📊 Análise de Dados")
 st.markdown("### Estatísticas das reuniões")
 
-# Diretório de saída
-output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "saidas")
+# Diretório de saída do projeto selecionado na barra lateral (app.py)
+output_dir = gerenciador_projetos().obter(st.session_state.get("projeto", PROJETO_PADRAO)).diretorio
 
 # Função para extrair informações do nome do arquivo
 def extrair_info_arquivo(filename):
@@ -32,19 +45,250 @@ def extrair_info_arquivo(filename):
         }
     return None
 
-# Função para formatar nome do arquivo (remover excel_)
+# Função para formatar nome do arquivo (somente o nome da reunião)
 def formatar_nome_arquivo(filename):
-    if filename.startswith('excel_'):
-        return filename[6:]  # Remove "excel_"
-    return filename
+    file_info = extrair_info_arquivo(filename)
+    return file_info["meeting_name"] if file_info else filename
 
-# Função para ler arquivos Excel
+# Função para ler as falas da reunião (compartilhadas em cache: não alterar o DataFrame)
 def carregar_excel(file_path):
-    return pd.read_excel(file_path, sheet_name=None)
+    return carregar_falas(file_path)
+
+# Função para montar a linha do tempo reduzida (cache pela versão dos arquivos)
+@st.cache_data(max_entries=32)
+def calcular_linha_tempo(arquivos, versoes, largura_px, folga):
+    reunioes = []
+    for arquivo in arquivos:
+        info = extrair_info_arquivo(arquivo)
+        nome = info["meeting_name"] if info else arquivo
+        reunioes.append((nome, carregar_falas(os.path.join(output_dir, arquivo))))
+    return montar_linha_tempo(reunioes, largura_px=largura_px, folga=folga)
+
+# Função para desenhar a linha do tempo (Gantt) dos participantes
+def grafico_linha_tempo(segmentos, limites):
+    fig = go.Figure()
+    
+    # Um traço por participante: cada barra horizontal é um segmento de fala
+    for locutor, grupo in segmentos.groupby('locutor', sort=False):
+        inicio_min = grupo['inicio'] / 60
+        duracao_min = (grupo['fim'] - grupo['inicio']) / 60
+        fig.add_trace(go.Bar(
+            y=[locutor] * len(grupo),
+            x=duracao_min,
+            base=inicio_min,
+            orientation='h',
+            name=locutor,
+            hovertemplate="%{y}<br>%{base:.1f} min → %{customdata:.1f} min<extra></extra>",
+            customdata=inicio_min + duracao_min
+        ))
+    
+    # Separadores entre reuniões na visão com várias reuniões
+    if len(limites) > 1:
+        for nome, inicio, fim in limites:
+            fig.add_vrect(x0=inicio / 60, x1=fim / 60, fillcolor="#d2ddff", opacity=0.15,
+                          line_width=0, annotation_text=nome, annotation_position="top left")
+    
+    fig.update_layout(barmode='overlay', height=120 + 40 * segmentos['locutor'].nunique(),
+                      xaxis_title="Tempo (minutos)", showlegend=False, bargap=0.3)
+    return fig
+
+# Seção de evolução da participação (fragmento: o slider só reexecuta esta parte)
+@st.fragment
+def secao_evolucao_participacao(df):
+    ev_col1, ev_col2 = st.columns(2)
+    with ev_col1:
+        modo = st.radio("Agrupamento:", ["Intervalos", "Janela móvel"], horizontal=True)
+    with ev_col2:
+        metrica = st.selectbox("Métrica:", list(METRICAS_PARTICIPACAO), format_func=str.capitalize)
+    
+    if modo == "Intervalos":
+        n_bins = st.slider("Número de intervalos:", min_value=2, max_value=60, value=3)
+        participacao = participacao_por_bins(df, n_bins, metrica)
+    else:
+        janela_min = st.slider("Tamanho da janela (min):", min_value=1, max_value=30, value=5)
+        participacao = participacao_janela_movel(df, janela_min * 60.0, 60.0, metrica)
+    
+    # Usar degradê de azuis (6 tons)
+    azuis_degrade = ['#e3f2fd', '#bbdefb', '#90caf9', '#64b5f6', '#42a5f5', '#2196f3']
+    
+    fig = px.bar(participacao,
+               title="Participação ao Longo da Reunião",
+               labels={'value': metrica.capitalize(), 'index': 'Minuto', 'variable': 'Participante'},
+               color_discrete_sequence=azuis_degrade)
+    fig.update_layout(height=400)
+    st.plotly_chart(fig, use_container_width=True)
+
+# Seção com o mapa de calor locutores × reuniões × intervalos
+@st.fragment
+def secao_participacao_corpus():
+    mc_col1, mc_col2, mc_col3 = st.columns(3)
+    with mc_col1:
+        n_bins = st.slider("Partes por reunião:", min_value=2, max_value=40, value=10)
+    with mc_col2:
+        metrica = st.selectbox("Métrica do mapa:", list(METRICAS_PARTICIPACAO), format_func=str.capitalize)
+    
+    arquivos = [os.path.join(output_dir, f) for f in arquivos_fonte]
+    cubo, locutores = participacao_corpus(arquivos, n_bins, metrica)
+    if cubo.size == 0:
+        st.info("Nenhuma reunião disponível.")
+        return
+    
+    with mc_col3:
+        locutor = st.selectbox("Participante:", ["Todos"] + list(locutores))
+    matriz = cubo.sum(axis=0) if locutor == "Todos" else cubo[list(locutores).index(locutor)]
+    
+    fig = px.imshow(matriz,
+                  x=[f"{100 * i // n_bins}%" for i in range(n_bins)],
+                  y=[formatar_nome_arquivo(f) for f in arquivos_fonte],
+                  labels=dict(x="Momento da Reunião", y="Reunião", color=metrica.capitalize()),
+                  color_continuous_scale="Blues", aspect="auto")
+    fig.update_layout(height=150 + 35 * len(arquivos_fonte))
+    st.plotly_chart(fig, use_container_width=True)
+
+# Seção com os termos característicos (TF-IDF) e a evolução de termos na série
+@st.fragment
+def secao_termos(nome_reuniao, df):
+    indice = indice_termos(output_dir)
+    te_col1, te_col2 = st.columns([3, 1])
+    with te_col1:
+        escopo = st.radio("Termos de:", ["Esta reunião", "Participante", "Trecho da reunião", "Todas as reuniões"],
+                          horizontal=True)
+    with te_col2:
+        n_termos = st.number_input("Quantidade de termos:", min_value=5, max_value=50, value=15, step=5)
+    
+    if escopo == "Esta reunião" and nome_reuniao in indice.reunioes:
+        termos = indice.termos_reuniao(nome_reuniao, n_termos)
+    elif escopo == "Participante":
+        locutor = st.selectbox("Participante:", sorted(df['locutor'].dropna().unique()))
+        abrangencia = st.radio("Falas consideradas:", ["Esta reunião", "Todas as reuniões"], horizontal=True,
+                               key="abrangencia_termos")
+        reunioes = [nome_reuniao] if abrangencia == "Esta reunião" and nome_reuniao in indice.reunioes else None
+        termos = indice.termos_locutor(locutor, n_termos, reunioes)
+    elif escopo == "Trecho da reunião" and nome_reuniao in indice.reunioes:
+        duracao_min = max(1, int(df['fim'].max() // 60) + 1)
+        inicio_min, fim_min = st.slider("Trecho (min):", 0, duracao_min, (0, min(10, duracao_min)))
+        termos = indice.termos_trecho(nome_reuniao, inicio_min * 60.0, fim_min * 60.0, n_termos)
+    else:
+        termos = indice.termos_recorrentes(n_termos)
+    
+    if len(termos) > 0:
+        fig = px.bar(termos.iloc[::-1], x='tfidf', y='termo', orientation='h',
+                   hover_data=['ocorrencias'],
+                   labels={'tfidf': 'Relevância (TF-IDF)', 'termo': 'Termo', 'ocorrencias': 'Ocorrências'},
+                   color_discrete_sequence=['#2196f3'])
+        fig.update_layout(height=120 + 22 * len(termos))
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Não há termos para exibir.")
+    
+    # Evolução de termos ao longo das reuniões
+    sugeridos = ", ".join(indice.termos_recorrentes(3)["termo"])
+    termos_tendencia = st.text_input("Evolução dos termos (separados por vírgula):", value=sugeridos)
+    termos_tendencia = [t.strip() for t in termos_tendencia.split(",") if t.strip()]
+    if termos_tendencia and indice.reunioes:
+        tendencia = indice.tendencia_termos(termos_tendencia)
+        fig = px.line(tendencia, markers=True,
+                    labels={'value': 'Ocorrências por mil termos', 'index': 'Reunião', 'variable': 'Termo'})
+        fig.update_layout(height=400)
+        st.plotly_chart(fig, use_container_width=True)
+
+# Seção com a nuvem de palavras de um conjunto de reuniões
+@st.fragment
+def secao_nuvem_palavras(arquivo_atual):
+    nv_col1, nv_col2 = st.columns([3, 1])
+    with nv_col1:
+        arquivos_nuvem = st.multiselect(
+            "Reuniões na nuvem:",
+            arquivos_fonte,
+            default=[arquivo_atual],
+            format_func=formatar_nome_arquivo
+        )
+    with nv_col2:
+        max_palavras = st.number_input("Máximo de palavras:", min_value=10, max_value=300, value=100, step=10)
+    
+    # Soma as contagens já calculadas de cada reunião
+    frequencias = frequencias_termos([os.path.join(output_dir, f) for f in arquivos_nuvem], max_palavras)
+    if len(frequencias) == 0:
+        st.info("Selecione ao menos uma reunião com falas.")
+        return
+    
+    nuvem_col, tabela_col = st.columns([3, 1])
+    with nuvem_col:
+        if nuvem_disponivel():
+            st.image(gerar_nuvem_palavras(frequencias, max_palavras), use_container_width=True)
+        else:
+            st.info("Instale a biblioteca wordcloud com 'pip install wordcloud' para habilitar a nuvem de palavras.")
+            fig = px.bar(frequencias.head(30).iloc[::-1], orientation='h',
+                       labels={'value': 'Ocorrências', 'index': 'Palavra'},
+                       color_discrete_sequence=['#2196f3'])
+            fig.update_layout(height=700, showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
+    with tabela_col:
+        st.dataframe(frequencias.rename("Ocorrências").rename_axis("Palavra"), use_container_width=True, height=400)
 
-# Listar arquivos Excel
-excel_files = [f for f in os.listdir(output_dir) if f.endswith('.xlsx')]
-excel_files.sort()
+# Seção com a polaridade (léxico) ao longo da reunião e da série de reuniões
+@st.fragment
+def secao_sentimento(file_path):
+    se_col1, se_col2, se_col3 = st.columns(3)
+    with se_col1:
+        escopo = st.radio("Sentimento em:", ["Esta reunião", "Todas as reuniões"], horizontal=True)
+    with se_col2:
+        por_locutor = st.toggle("Separar por participante", value=True)
+    with se_col3:
+        n_bins = st.slider("Intervalos da reunião:", min_value=2, max_value=30, value=8,
+                           disabled=escopo != "Esta reunião")
+    
+    if escopo == "Esta reunião":
+        serie = serie_sentimento(file_path, n_bins, por_locutor)
+        eixo_x = "Minuto"
+    else:
+        serie = sentimento_por_reuniao([os.path.join(output_dir, f) for f in arquivos_fonte], por_locutor)
+        serie.index = [formatar_nome_arquivo(os.path.basename(f)) for f in serie.index]
+        eixo_x = "Reunião"
+    
+    if serie.notna().any().any():
+        fig = px.line(serie, markers=True, range_y=[-1.05, 1.05],
+                    labels={'value': 'Polaridade', 'index': eixo_x, 'variable': 'Participante'})
+        fig.add_hline(y=0, line_dash="dot", line_color="gray")
+        fig.update_layout(height=400)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Nenhuma palavra do léxico de sentimento encontrada.")
+
+# Painel da reunião em andamento (atualizado a cada poucos segundos)
+@st.fragment(run_every=5)
+def painel_ao_vivo(arquivo):
+    reuniao = obter_reuniao_ao_vivo(os.path.join(diretorio_ao_vivo(output_dir), arquivo))
+    df_vivo = reuniao.dataframe()
+    
+    if len(df_vivo) == 0:
+        st.info("Aguardando as primeiras falas...")
+        return
+    
+    resumo = reuniao.resumo()
+    vivo_col1, vivo_col2, vivo_col3, vivo_col4 = st.columns(4)
+    vivo_col1.metric("👥 Participantes", len(resumo))
+    vivo_col2.metric("💬 Falas", len(df_vivo))
+    vivo_col3.metric("⏱️ Duração", f"{df_vivo['fim'].max() / 60:.1f} min")
+    vivo_col4.metric("📝 Palavras", f"{int(resumo['palavras'].sum()):,}")
+    
+    segmentos, limites = montar_linha_tempo([(arquivo, df_vivo)], folga=2.0)
+    st.plotly_chart(grafico_linha_tempo(segmentos, limites), use_container_width=True)
+    
+    ultima = df_vivo.iloc[-1]
+    st.caption(f"Última fala: **{ultima['locutor']}** — {ultima['paragrafo'][:200]}")
+    if reuniao.leitor.linhas_invalidas:
+        st.warning(f"{reuniao.leitor.linhas_invalidas} linha(s) inválida(s) ignorada(s) no arquivo")
+    
+    consulta = st.text_input("🔎 Buscar na reunião em andamento:")
+    if consulta:
+        encontradas = reuniao.buscar(consulta)
+        st.markdown(f"{len(encontradas)} fala(s) encontrada(s)")
+        for fala in encontradas[-20:]:
+            st.markdown(f"- **{fala['locutor']}** ({fala['inicio'] / 60:.1f} min): {fala['paragrafo']}")
+
+# Listar reuniões (uma fonte por reunião: a planilha, ou o HTML quando só ele existe)
+arquivos_fonte = [os.path.basename(caminho_fonte(artefatos)) for artefatos in listar_reunioes(output_dir).values()]
 
 # Layout principal com seletor e métricas
 col1, col2 = st.columns([3, 1])
@@ -52,36 +296,42 @@ col1, col2 = st.columns([3, 1])
 with col1:
     # Seletor de arquivo
     st.markdown("### 📁 Selecionar Arquivo")
-    selected_excel = st.selectbox(
+    arquivo_selecionado = st.selectbox(
         "Escolha o arquivo para análise:",
-        excel_files,
+        arquivos_fonte,
         format_func=formatar_nome_arquivo,
         label_visibility="collapsed"
     )
 
 with col2:
-    # Seletor de arquivo
+    # Acompanhamento de reuniões em andamento
     st.markdown(" ")
+    arquivos_ao_vivo = listar_ao_vivo(diretorio_ao_vivo(output_dir))
+    acompanhar_ao_vivo = st.toggle("📡 Ao vivo", disabled=not arquivos_ao_vivo,
+                                   help="Acompanha uma transcrição em andamento em saidas/ao_vivo")
+
+if acompanhar_ao_vivo:
+    arquivo_ao_vivo = st.selectbox("Reunião em andamento:", arquivos_ao_vivo)
+    st.markdown(f"## 📡 Ao vivo: **{arquivo_ao_vivo}**")
+    painel_ao_vivo(arquivo_ao_vivo)
  
 
-if selected_excel:
-    file_path = os.path.join(output_dir, selected_excel)
+if arquivo_selecionado:
+    file_path = os.path.join(output_dir, arquivo_selecionado)
     
     # Extrair informações do nome do arquivo
-    file_info = extrair_info_arquivo(selected_excel)
+    file_info = extrair_info_arquivo(arquivo_selecionado)
     if file_info:
         meeting_name = file_info["meeting_name"]
         st.markdown("---")
         st.markdown(f"## 📋 Análise de: **{meeting_name}**")
     else:
         st.markdown("---")
-        st.markdown(f"## 📋 Análise de: **{selected_excel}**")
+        st.markdown(f"## 📋 Análise de: **{arquivo_selecionado}**")
     
     # Carregar dados do Excel
     try:
-        dfs = carregar_excel(file_path)
-        first_sheet = list(dfs.keys())[0]
-        df = dfs[first_sheet]
+        df = carregar_excel(file_path)
         
         # Verificar se o dataframe tem as colunas esperadas (formato real)
         expected_columns = ['locutor', 'inicio', 'fim', 'duracao', 'palavras']
@@ -163,10 +413,9 @@ if selected_excel:
                 st.markdown("*Ajuda a identificar se algum participante fala muito rápido ou lento, afetando a compreensão.*")
                 
                 if 'palavras' in df.columns and 'duracao' in df.columns:
-                    df['wpm'] = (df['palavras'] / df['duracao']) * 60
-                    df['wpm'] = df['wpm'].fillna(0).clip(0, 500)
+                    wpm = ((df['palavras'] / df['duracao']) * 60).fillna(0).clip(0, 500)
                     
-                    wpm_by_speaker = df.groupby('locutor')['wpm'].mean().reset_index()
+                    wpm_by_speaker = wpm.groupby(df['locutor']).mean().reset_index()
                     wpm_by_speaker.columns = ['Participante', 'WPM Médio']
                     wpm_by_speaker = wpm_by_speaker.sort_values('WPM Médio', ascending=False)
                     
@@ -181,46 +430,117 @@ if selected_excel:
                 st.markdown("*Mostra se a participação foi consistente ou se houve momentos de maior ou menor engajamento.*")
                 
                 if 'inicio' in df.columns and len(df) > 0:
-                    try:
-                        df_sorted = df.sort_values('inicio')
-                        max_time = df_sorted['inicio'].max()
-                        
-                        df_sorted['fase'] = 'Meio'
-                        df_sorted.loc[df_sorted['inicio'] <= max_time * 0.33, 'fase'] = 'Início'
-                        df_sorted.loc[df_sorted['inicio'] >= max_time * 0.67, 'fase'] = 'Fim'
-                        
-                        participation_by_phase = df_sorted.groupby(['fase', 'locutor']).size().unstack(fill_value=0)
-                        
-                        # Usar degradê de azuis (6 tons)
-                        azuis_degrade = ['#e3f2fd', '#bbdefb', '#90caf9', '#64b5f6', '#42a5f5', '#2196f3']
-                        
-                        fig = px.bar(participation_by_phase, 
-                                   title="Participação por Fase da Reunião",
-                                   labels={'value': 'Falas', 'fase': 'Fase da Reunião'},
-                                   color_discrete_sequence=azuis_degrade)
-                        fig.update_layout(height=400)
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                    except Exception as e:
-                        st.info("Não foi possível analisar a evolução temporal dos dados.")
+                    secao_evolucao_participacao(df)
             
-            # Resumo estatístico
+            # Participação no corpus inteiro
             st.markdown("---")
-            st.markdown("### 📋 Resumo Estatístico por Participante")
-            st.markdown("*Visão consolidada das métricas principais para cada participante.*")
+            st.markdown("### 🗺️ Participação em Todas as Reuniões")
+            st.markdown("*Cada reunião é dividida em partes iguais do seu tempo; o mapa mostra quando cada pessoa participa ao longo da série de reuniões.*")
+            secao_participacao_corpus()
+            
+            # Linha do tempo dos participantes
+            st.markdown("---")
+            st.markdown("### 🕒 Linha do Tempo dos Participantes")
+            st.markdown("*Mostra quem falou em cada momento. Falas seguidas do mesmo participante são unidas e o gráfico é reduzido à resolução da tela.*")
+            
+            tl_col1, tl_col2 = st.columns([3, 1])
+            with tl_col1:
+                arquivos_linha_tempo = st.multiselect(
+                    "Reuniões na linha do tempo:",
+                    arquivos_fonte,
+                    default=[arquivo_selecionado],
+                    format_func=formatar_nome_arquivo
+                )
+            with tl_col2:
+                folga_linha_tempo = st.number_input(
+                    "Unir falas com intervalo de até (s):",
+                    min_value=0.0, max_value=60.0, value=2.0, step=0.5
+                )
             
-            summary_stats = df.groupby('locutor').agg({
-                'locutor': 'count',
-                'palavras': ['sum', 'mean'] if 'palavras' in df.columns else ['count', 'count'],
-                'duracao': ['sum', 'mean'] if 'duracao' in df.columns else ['count', 'count']
-            }).round(1)
+            if arquivos_linha_tempo:
+                arquivos_linha_tempo = tuple(arquivos_linha_tempo)
+                versoes = tuple(versao_falas(os.path.join(output_dir, f)) for f in arquivos_linha_tempo)
+                segmentos, limites = calcular_linha_tempo(
+                    arquivos_linha_tempo, versoes, LARGURA_PADRAO_PX, folga_linha_tempo
+                )
+                if len(segmentos) > 0:
+                    st.plotly_chart(grafico_linha_tempo(segmentos, limites), use_container_width=True)
+                    st.caption(f"{len(segmentos):,} segmentos desenhados")
+                else:
+                    st.info("Não há intervalos de fala para exibir.")
+            
+            # Janela da linha do tempo: falas da reunião selecionada no intervalo escolhido
+            if len(df) > 0 and 'inicio' in df.columns:
+                duracao_min = int(float(df['fim'].max()) // 60) + 1
+                janela = st.slider("Ver as falas entre os minutos:", 0, duracao_min, (0, min(5, duracao_min)))
+                posicoes = indice_intervalos(file_path).na_janela(janela[0] * 60, janela[1] * 60)
+                falas_janela = df.iloc[posicoes]
+                st.caption(f"{len(falas_janela)} fala(s) entre {formatar_hms(janela[0] * 60)} e "
+                           f"{formatar_hms(janela[1] * 60)} em {arquivo_selecionado}")
+                if len(falas_janela):
+                    st.dataframe({
+                        "Participante": falas_janela['locutor'].astype(str).to_numpy(),
+                        "Início": [formatar_hms(v) for v in falas_janela['inicio']],
+                        "Fim": [formatar_hms(v) for v in falas_janela['fim']],
+                        "Fala": textos_falas(falas_janela).to_numpy()
+                    }, use_container_width=True, hide_index=True, height=300)
+            
+            # Tomada de turnos e interrupções
+            st.markdown("---")
+            st.markdown("### 🔄 Tomada de Turnos e Interrupções")
+            st.markdown("*Mostra quem passa a palavra para quem e quem começa a falar antes de o outro terminar.*")
             
-            if 'palavras' in df.columns and 'duracao' in df.columns:
-                summary_stats.columns = ['Falas', 'Total Palavras', 'Média Palavras', 'Total Duração (s)', 'Média Duração (s)']
+            tt_col1, tt_col2 = st.columns(2)
+            with tt_col1:
+                escopo_turnos = st.radio("Escopo:", ["Esta reunião", "Todas as reuniões"], horizontal=True)
+            with tt_col2:
+                metrica_turnos = st.radio("Métrica:", list(METRICAS_TURNOS), horizontal=True,
+                                          format_func=METRICAS_TURNOS.get)
+            
+            if escopo_turnos == "Esta reunião":
+                turnos = turnos_reuniao(file_path)
+            else:
+                turnos = turnos_agregados([os.path.join(output_dir, f) for f in arquivos_fonte])
+            
+            if len(turnos) > 0:
+                matriz = matriz_turnos(turnos, metrica_turnos)
+                fig = px.imshow(matriz,
+                              labels=dict(x="Próximo Falante / Quem Interrompe", y="Falante Atual",
+                                          color=METRICAS_TURNOS[metrica_turnos]),
+                              color_continuous_scale="Blues",
+                              text_auto=".0f")
+                fig.update_layout(height=150 + 45 * len(matriz))
+                st.plotly_chart(fig, use_container_width=True)
             else:
-                summary_stats.columns = ['Falas', 'Col1', 'Col2', 'Col3', 'Col4']
+                st.info("Não há interações suficientes para montar a matriz.")
+            
+            # Termos e temas
+            st.markdown("---")
+            st.markdown("### 🏷️ Termos e Temas")
+            st.markdown("*Palavras que caracterizam a reunião, um participante ou um trecho, em comparação com o restante das falas.*")
+            secao_termos(file_info["meeting_name"] if file_info else arquivo_selecionado, df)
+            
+            # Sentimento
+            st.markdown("---")
+            st.markdown("### 😊 Sentimento ao Longo das Reuniões")
+            st.markdown("*Polaridade de -1 (só palavras negativas) a 1 (só positivas), contada com um léxico de palavras e negações. Trechos sem palavras do léxico ficam em branco.*")
+            secao_sentimento(file_path)
+            
+            # Nuvem de palavras
+            st.markdown("---")
+            st.markdown("### ☁️ Nuvem de Palavras")
+            st.markdown("*Palavras mais frequentes (sem stopwords) nas reuniões escolhidas.*")
+            secao_nuvem_palavras(arquivo_selecionado)
+            
+            # Resumo estatístico
+            st.markdown("---")
+            st.markdown("### 📋 Resumo Estatístico por Participante")
+            st.markdown("*Visão consolidada das métricas principais para cada participante.*")
             
-            summary_stats = summary_stats.sort_values('Falas', ascending=False)
+            summary_stats = resumo_por_locutor(df)[
+                ['falas', 'palavras_total', 'palavras_media', 'duracao_total_s', 'duracao_media_s']
+            ].round(1)
+            summary_stats.columns = ['Falas', 'Total Palavras', 'Média Palavras', 'Total Duração (s)', 'Média Duração (s)']
             
             st.dataframe(summary_stats, use_container_width=True)
         
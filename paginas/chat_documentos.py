@@ -1,7 +1,15 @@
 import streamlit as st
-import pandas as pd
 import os
-import re
+import time
+from nucleo.ao_vivo import diretorio_ao_vivo, listar_ao_vivo, obter_reuniao_ao_vivo
+from nucleo.conversa import Conversa
+from nucleo.llm import MODELO_PADRAO, obter_genai
+from nucleo.prompts import prompt_chat, responder_pergunta
+from nucleo.projetos import PROJETO_PADRAO, gerenciador_projetos
+from nucleo.repositorio import documentos_reunioes
+from nucleo.roteador import ESTATISTICAS_ROTEADOR, frasear, rotear
+from nucleo.serie import pergunta_sobre_serie, resumo_serie
+from nucleo.termos import indice_termos
 
 # Configuração da página
 st.set_page_config(
@@ -26,93 +34,24 @@ st.markdown("""
 - Faça um resumo sobre as participações de Sara Carolayne
 """)
 
-# Diretório de saída
-output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "saidas")
-
-# Função para extrair informações do nome do arquivo
-def extrair_info_arquivo(filename):
-    pattern = r"(html|excel)_(.+)\.(html|xlsx)"
-    match = re.match(pattern, filename)
-    if match:
-        file_type = match.group(1)
-        meeting_name = match.group(2)
-        return {
-            "type": file_type,
-            "meeting_name": meeting_name
-        }
-    return None
-
-# Função para ler arquivos HTML
-def ler_html(file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        return file.read()
-
-# Função para extrair texto limpo do HTML
-def extrair_texto_html(html_content):
-    # Remover tags HTML (implementação simplificada)
-    text = re.sub(r'<.*?>', ' ', html_content)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+# Diretório de saída do projeto selecionado na barra lateral (app.py)
+output_dir = gerenciador_projetos().obter(st.session_state.get("projeto", PROJETO_PADRAO)).diretorio
 
 # Função para configurar a API do Gemini
 def configurar_genai(api_key):
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-        return genai
-    except ImportError:
+    genai = obter_genai(api_key)
+    if genai is None:
         st.error("Biblioteca google-generativeai não instalada. Execute: pip install google-generativeai")
-        return None
+    return genai
 
-# Função para carregar e processar todos os documentos
-@st.cache_data
+# Função para carregar e processar todos os documentos (cache por versão dos arquivos)
 def carregar_documentos():
-    documents = {}
-    html_files = [f for f in os.listdir(output_dir) if f.endswith('.html')]
-    
-    for html_file in html_files:
-        file_path = os.path.join(output_dir, html_file)
-        file_info = extrair_info_arquivo(html_file)
-        
-        if file_info:
-            meeting_name = file_info["meeting_name"]
-            html_content = ler_html(file_path)
-            text_content = extrair_texto_html(html_content)
-            
-            documents[meeting_name] = {
-                "filename": html_file,
-                "content": text_content,
-                "path": file_path
-            }
-    
-    return documents
+    return documentos_reunioes(output_dir)
 
 # Função para responder perguntas com múltiplos documentos
 def responder_multiplos_documentos(model, question, documents):
-    # Construir contexto combinado de todos os documentos
-    combined_context = ""
-    for doc_name, doc_info in documents.items():
-        # Limitar o tamanho de cada documento para não exceder limites de tokens
-        doc_content = doc_info["content"] 
-        combined_context += f"\n\nTranscrição da reunião '{doc_name}':\n{doc_content}\n"
-    
-    # Construir o prompt
-    prompt = f"""Você é um assistente especializado em analisar transcrições de reuniões. 
-    Responda à pergunta com base apenas nas informações contidas nas transcrições fornecidas.
-    Se a resposta não estiver nas transcrições, diga claramente que não consegue responder com base nas informações disponíveis.
-    Quando a informação estiver em uma transcrição específica, mencione qual reunião contém essa informação.
-    
-    Contexto das transcrições:
-    {combined_context}
-    
-    Pergunta: {question}
-    
-    Resposta:"""
-    
     try:
-        # Gerar resposta com o modelo Gemini
-        response = model.generate_content(prompt)
-        return response.text
+        return responder_pergunta(model, question, documents)
     except Exception as e:
         st.error(f"Erro ao gerar resposta: {e}")
         return f"Ocorreu um erro ao processar sua pergunta: {str(e)}"
@@ -140,39 +79,196 @@ except Exception as e:
 # Carregar documentos
 documents = carregar_documentos()
 
-# Interface de chat simplificada
+# Incluir reuniões em andamento (somente as falas novas são lidas a cada execução)
+arquivos_ao_vivo = listar_ao_vivo(diretorio_ao_vivo(output_dir))
+if arquivos_ao_vivo and st.toggle("📡 Incluir reuniões em andamento", value=True):
+    documents = dict(documents)
+    for arquivo in arquivos_ao_vivo:
+        reuniao = obter_reuniao_ao_vivo(os.path.join(diretorio_ao_vivo(output_dir), arquivo))
+        documents[f"{os.path.splitext(arquivo)[0]} (em andamento)"] = {
+            "filename": arquivo,
+            "content": reuniao.texto(),
+            "path": reuniao.file_path
+        }
+    st.caption(f"{len(arquivos_ao_vivo)} reunião(ões) em andamento incluída(s) no contexto")
+
+# Temas recorrentes calculados localmente (índice TF-IDF, sem chamar a IA)
+with st.expander("🏷️ Temas mais recorrentes (calculados localmente)"):
+    indice = indice_termos(output_dir)
+    if indice.reunioes:
+        recorrentes = indice.termos_recorrentes(20)
+        recorrentes.columns = ['Termo', 'Ocorrências', 'Relevância (TF-IDF)', 'Reuniões']
+        st.dataframe(recorrentes.round(1), use_container_width=True, hide_index=True)
+        st.markdown("**Termos em destaque por reunião:**")
+        for nome, termos in indice.termos_por_reuniao(5).items():
+            st.markdown(f"- **{nome}**: {', '.join(termos)}")
+    else:
+        st.info("Nenhuma reunião encontrada no diretório 'saidas'.")
+
+# Roteador: perguntas sobre participação, tempo de fala, ações e decisões são respondidas com os dados locais
 st.markdown("---")
-st.markdown("### 💬 Faça sua pergunta")
-
-# Campo de entrada para pergunta
-user_question = st.text_area(
-    "Digite sua pergunta:",
-    placeholder="Ex: Faça um resumo sobre as participações de Sara Carolayne",
-    height=150,
-    label_visibility="collapsed"
-)
+rt_col1, rt_col2 = st.columns(2)
+with rt_col1:
+    roteamento_local = st.toggle("⚡ Responder localmente o que os dados resolvem", value=True,
+                                 help="Participação, tempo de fala, palavras, ações e decisões são calculados "
+                                      "sem enviar as transcrições à IA")
+with rt_col2:
+    frasear_local = st.checkbox("Reescrever a resposta local com a IA", value=False, disabled=not genai,
+                                help="Envia à IA só a tabela calculada (poucos KB) para redigir a resposta")
+
+# Função para responder localmente, se o roteador reconhecer a pergunta (None caso contrário)
+def resposta_local(question):
+    if not roteamento_local:
+        return None
+    local = rotear(question, output_dir)
+    if local and frasear_local and genai:
+        try:
+            local["texto"] = frasear(genai.GenerativeModel(MODELO_PADRAO), question, local)
+        except Exception as e:
+            st.warning(f"Não foi possível reescrever a resposta com a IA: {e}")
+    return local
 
-# Botão para processar pergunta
-if st.button("🔍 Buscar Resposta", type="primary", use_container_width=True):
-    if user_question and genai and documents:
-        with st.spinner("Processando sua pergunta...", show_time=True):
-            try:
-                # Configurar modelo Gemini
-                model = genai.GenerativeModel('gemini-2.5-flash')
+# Conversa com memória: as perguntas seguintes reaproveitam o contexto já recuperado
+aba_conversa, aba_pergunta = st.tabs(["💬 Conversa", "🔍 Pergunta única"])
+
+with aba_conversa:
+    if 'conversa' not in st.session_state:
+        st.session_state.conversa = Conversa(output_dir)
+    conversa = st.session_state.conversa
+    
+    st.markdown("*Cada pergunta busca só os trechos relevantes das transcrições; as perguntas seguintes "
+                "reaproveitam esses trechos e o histórico da conversa.*")
+    
+    for mensagem in conversa.mensagens:
+        with st.chat_message("user" if mensagem["papel"] == "usuario" else "assistant"):
+            st.markdown(mensagem["texto"])
+            if "metricas" in mensagem and "intencao" in mensagem["metricas"]:
+                metricas = mensagem["metricas"]
+                st.caption(f"⚡ Respondido localmente ({metricas['intencao']}) em "
+                           f"{1000 * metricas['segundos']:.0f} ms, sem chamar a IA")
+            elif "metricas" in mensagem:
+                metricas = mensagem["metricas"]
+                st.caption(f"{metricas['caracteres_prompt']:,} caracteres enviados · "
+                           f"{metricas['falas_novas']} falas novas no contexto ({metricas['falas_contexto']} no total) · "
+                           f"{metricas['chamadas']} chamada(s) · {metricas['segundos']:.1f}s")
+    
+    pergunta_conversa = st.chat_input("Pergunte sobre as reuniões...", disabled=not documents)
+    if pergunta_conversa:
+        local = resposta_local(pergunta_conversa)
+        if local:
+            conversa.registrar_resposta_local(pergunta_conversa, local)
+            st.rerun()
+        elif not genai:
+            st.error("Chave API do Gemini não configurada.")
+        else:
+            with st.spinner("Processando sua pergunta...", show_time=True):
+                try:
+                    _, metricas = conversa.perguntar(genai.GenerativeModel(MODELO_PADRAO), pergunta_conversa)
+                    ESTATISTICAS_ROTEADOR.registrar_llm(metricas["segundos"])
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Erro ao gerar resposta: {e}")
+    
+    if conversa.mensagens:
+        cv_col1, cv_col2 = st.columns([3, 1])
+        with cv_col1:
+            st.caption(f"Uma pergunta avulsa com todas as transcrições enviaria "
+                       f"{len(prompt_chat(conversa.mensagens[-2]['texto'], documents)):,} caracteres."
+                       + (" Os turnos antigos já foram resumidos." if conversa.resumo_historico else ""))
+        with cv_col2:
+            if st.button("🧹 Nova conversa", use_container_width=True):
+                st.session_state.conversa = Conversa(output_dir)
+                st.rerun()
+
+with aba_pergunta:
+    # Interface de chat simplificada
+    st.markdown("### 💬 Faça sua pergunta")
+
+    # Campo de entrada para pergunta
+    user_question = st.text_area(
+        "Digite sua pergunta:",
+        placeholder="Ex: Faça um resumo sobre as participações de Sara Carolayne",
+        height=150,
+        label_visibility="collapsed"
+    )
+
+    # Contexto enviado à IA: resumos consolidados (kilobytes) ou as transcrições completas
+    contextos = {
+        "automatico": "Automático",
+        "resumos": "Resumos consolidados (rápido)",
+        "transcricoes": "Transcrições completas"
+    }
+    contexto_escolhido = st.radio(
+        "Contexto da resposta:",
+        list(contextos),
+        format_func=contextos.get,
+        horizontal=True,
+        help="No modo automático, perguntas que comparam reuniões ou pedem uma visão do conjunto "
+             "usam a visão geral da série e os resumos de cada reunião"
+    )
+
+    # Botão para processar pergunta
+    if st.button("🔍 Buscar Resposta", type="primary", use_container_width=True):
+        local = resposta_local(user_question) if user_question and documents else None
+        if local:
+            st.markdown("---")
+            st.markdown("### 📋 Resposta")
+            st.markdown(local["texto"])
+            st.caption(f"⚡ Respondido localmente ({local['intencao']}) em {1000 * local['segundos']:.0f} ms, "
+                       "sem enviar as transcrições à IA.")
+        elif user_question and genai and documents:
+            with st.spinner("Processando sua pergunta...", show_time=True):
+                try:
+                    # Configurar modelo Gemini
+                    model = genai.GenerativeModel(MODELO_PADRAO)
+                    inicio = time.perf_counter()
                 
-                # Gerar resposta usando todos os documentos
-                response = responder_multiplos_documentos(model, user_question, documents)
+                    usar_resumos = contexto_escolhido == "resumos" or (
+                        contexto_escolhido == "automatico" and pergunta_sobre_serie(user_question))
+                    if usar_resumos:
+                        # Reuniões em andamento ainda não têm resumo: entram completas
+                        ao_vivo = {nome: doc for nome, doc in documents.items() if nome.endswith("(em andamento)")}
+                        try:
+                            response, caracteres = resumo_serie(output_dir).responder(model, user_question, ao_vivo)
+                            st.caption(f"Respondido com os resumos consolidados: {caracteres:,} caracteres enviados "
+                                       f"(as transcrições completas teriam {len(prompt_chat(user_question, documents)):,}).")
+                        except Exception as e:
+                            st.error(f"Erro ao gerar resposta: {e}")
+                            response = f"Ocorreu um erro ao processar sua pergunta: {str(e)}"
+                    else:
+                        # Gerar resposta usando todos os documentos
+                        response = responder_multiplos_documentos(model, user_question, documents)
+                    ESTATISTICAS_ROTEADOR.registrar_llm(time.perf_counter() - inicio)
                 
-                # Exibir resposta
-                st.markdown("---")
-                st.markdown("### 📋 Resposta")
-                st.markdown(response)
+                    # Exibir resposta
+                    st.markdown("---")
+                    st.markdown("### 📋 Resposta")
+                    st.markdown(response)
                 
-            except Exception as e:
-                st.error(f"Erro ao processar pergunta: {str(e)}")
-    elif not user_question:
-        st.warning("Por favor, digite uma pergunta.")
-    elif not genai:
-        st.error("Chave API do Gemini não configurada.")
-    elif not documents:
-        st.error("Nenhum documento encontrado no diretório 'saidas'.")
+                except Exception as e:
+                    st.error(f"Erro ao processar pergunta: {str(e)}")
+        elif not user_question:
+            st.warning("Por favor, digite uma pergunta.")
+        elif not genai:
+            st.error("Chave API do Gemini não configurada.")
+        elif not documents:
+            st.error("Nenhum documento encontrado no diretório 'saidas'.")
+
+# Taxa de perguntas respondidas localmente e latência de cada caminho (desde o início do servidor)
+with st.expander("📊 Roteador de perguntas"):
+    uso_roteador = ESTATISTICAS_ROTEADOR.resumo()
+    if uso_roteador["perguntas"]:
+        er_col1, er_col2, er_col3 = st.columns(3)
+        with er_col1:
+            st.metric("Respondidas localmente", f"{uso_roteador['taxa_local']:.0%}",
+                      help=f"{uso_roteador['locais']} de {uso_roteador['perguntas']} perguntas")
+        with er_col2:
+            latencia_local = uso_roteador["latencia_local_ms"]
+            st.metric("Latência local", "-" if latencia_local is None else f"{latencia_local:.0f} ms")
+        with er_col3:
+            latencia_llm = uso_roteador["latencia_llm_s"]
+            st.metric("Latência com IA", "-" if latencia_llm is None else f"{latencia_llm:.1f} s")
+        if uso_roteador["por_intencao"]:
+            st.caption("Por intenção: " + ", ".join(f"{i} {n}" for i, n in uso_roteador["por_intencao"].items()))
+    else:
+        st.caption("Nenhuma pergunta feita ainda.")
@@ -0,0 +1,92 @@
+import streamlit as st
+from nucleo.banco import CONSULTAS, LIMITE_LINHAS, consultar_sql, esquema_banco, executar_consulta, valores_distintos
+from nucleo.projetos import PROJETO_PADRAO, gerenciador_projetos
+
+# Configuração da página
+st.set_page_config(
+    page_title="Consultas SQL - Transcrições",
+    page_icon="🗄️",
+    layout="wide"
+)
+
+# Título da página
+st.title("🗄️ Consultas SQL")
+st.markdown("### Perguntas sobre todas as reuniões de uma só vez")
+
+st.markdown("""
+As falas de todas as reuniões ficam em um banco SQLite com índices por reunião, participante e tempo.
+Use uma das **consultas prontas** ou escreva a sua própria consulta (somente leitura).
+""")
+
+# Diretório de saída do projeto selecionado na barra lateral (app.py)
+output_dir = gerenciador_projetos().obter(st.session_state.get("projeto", PROJETO_PADRAO)).diretorio
+
+# Função para exibir o resultado de uma consulta
+def exibir_resultado(df, truncado, segundos, nome_arquivo):
+    st.caption(f"{len(df):,} linha(s) em {segundos * 1000:.1f} ms")
+    if truncado:
+        st.warning(f"Resultado limitado às primeiras {LIMITE_LINHAS:,} linhas.")
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.download_button(
+        label="⬇️ Baixar CSV",
+        data=df.to_csv(index=False).encode("utf-8"),
+        file_name=f"{nome_arquivo}.csv",
+        mime="text/csv"
+    )
+
+# Estrutura das tabelas
+with st.expander("📚 Tabelas disponíveis"):
+    for tabela, colunas in esquema_banco(output_dir).items():
+        st.markdown(f"**{tabela}**: " + ", ".join(f"`{coluna}` ({tipo})" for coluna, tipo in colunas))
+
+# Consultas prontas
+st.markdown("---")
+st.markdown("### 📌 Consultas Prontas")
+
+nome_consulta = st.selectbox(
+    "Consulta:",
+    list(CONSULTAS),
+    format_func=lambda nome: CONSULTAS[nome]["descricao"]
+)
+consulta = CONSULTAS[nome_consulta]
+
+# Um campo por parâmetro da consulta
+valores = {}
+if consulta["parametros"]:
+    colunas_parametros = st.columns(len(consulta["parametros"]))
+    for coluna, (parametro, tipo) in zip(colunas_parametros, consulta["parametros"].items()):
+        with coluna:
+            if parametro in ("locutor", "reuniao"):
+                valores[parametro] = st.selectbox(parametro.capitalize(), valores_distintos(parametro, output_dir))
+            elif tipo is float:
+                valores[parametro] = st.number_input(f"{parametro.capitalize()} (s)", min_value=0.0,
+                                                     value=0.0 if parametro == "inicio" else 600.0, step=30.0)
+            else:
+                valores[parametro] = st.text_input(parametro.capitalize())
+
+with st.expander("SQL da consulta"):
+    st.code(consulta["sql"], language="sql")
+
+if st.button("▶️ Executar consulta", type="primary"):
+    try:
+        df, truncado, segundos = executar_consulta(nome_consulta, valores, output_dir)
+        exibir_resultado(df, truncado, segundos, nome_consulta)
+    except Exception as e:
+        st.error(f"Erro ao executar a consulta: {e}")
+
+# Consulta livre
+st.markdown("---")
+st.markdown("### ✍️ Consulta Livre")
+
+sql_livre = st.text_area(
+    "SQL:",
+    value=CONSULTAS["minutos_por_locutor_mes"]["sql"],
+    height=180
+)
+
+if st.button("▶️ Executar SQL"):
+    try:
+        df, truncado, segundos = consultar_sql(sql_livre, diretorio=output_dir)
+        exibir_resultado(df, truncado, segundos, "consulta")
+    except Exception as e:
+        st.error(f"Erro ao executar a consulta: {e}")
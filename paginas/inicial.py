@@ -1,7 +1,8 @@
 import streamlit as st
 import os
-import zipfile
-import io
+from nucleo.downloads import link_download, publicar_download
+from nucleo.exportacao import obter_pacote_transcricoes
+from nucleo.projetos import PROJETO_PADRAO, gerenciador_projetos
 
 # Configuração da página
 st.set_page_config(
@@ -14,27 +15,11 @@ st.set_page_config(
 st.title("📋 Sara Carolayne - Entregáveis da Consultoria")
 st.markdown("### Transcrições de Reuniões - Análise e Relatórios")
 
-# Diretório de saída
-output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "saidas")
-
-# Função para criar ZIP das transcrições
-def criar_zip_transcricoes():
-    try:
-        # Criar buffer de memória para o ZIP
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Adicionar todos os arquivos do diretório saidas
-            for root, dirs, files in os.walk(output_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arc_name = os.path.relpath(file_path, output_dir)
-                    zip_file.write(file_path, arc_name)
-        
-        zip_buffer.seek(0)
-        return zip_buffer, None
-    except Exception as e:
-        return None, str(e)
+# Diretório de saída do projeto selecionado na barra lateral (app.py)
+output_dir = gerenciador_projetos().obter(st.session_state.get("projeto", PROJETO_PADRAO)).diretorio
+
+# Nome do pacote baixado
+NOME_PACOTE = "entregaveis_sara_carolayne.zip"
 
 # Contar arquivos por tipo
 def contar_arquivos():
@@ -117,18 +102,12 @@ O arquivo ZIP contém **{excel_count} arquivos Excel** e **{html_count} arquivos
 if os.path.exists(output_dir):
     files = [f for f in os.listdir(output_dir) if os.path.isfile(os.path.join(output_dir, f))]
     if files:
-        zip_buffer, error = criar_zip_transcricoes()
-        if zip_buffer:
-            st.download_button(
-                label="⬇️ BAIXAR ARQUIVOS",
-                data=zip_buffer.getvalue(),
-                file_name="entregaveis_sara_carolayne.zip",
-                mime="application/zip",
-                use_container_width=True,
-                type="primary"
-            )
-        else:
-            st.error(f"Erro ao criar ZIP: {error}")
+        # O ZIP é gravado em disco uma vez por versão e baixado por link (static/)
+        try:
+            url = publicar_download(obter_pacote_transcricoes(output_dir), NOME_PACOTE, f"{output_dir}:pacote")
+            st.markdown(link_download(url, NOME_PACOTE, "⬇️ BAIXAR ARQUIVOS"), unsafe_allow_html=True)
+        except Exception as e:
+            st.error(f"Erro ao criar ZIP: {e}")
     else:
         st.info("📁 Nenhum arquivo encontrado")
 else:
@@ -1,8 +1,13 @@
 import streamlit as st
-import pandas as pd
-import os
-import re
-import json
+import time
+from nucleo import prompts
+from nucleo.extracao import STATUS_ACAO, atualizar_status, consultar_acoes, consultar_decisoes, extrair_pendentes, reunioes_pendentes
+from nucleo.llm import MODELO_PADRAO, obter_genai
+from nucleo.pre_geracao import POLITICA_PRE_GERACAO, pre_geracao_ativa, pre_gerador
+from nucleo.projetos import PROJETO_PADRAO, gerenciador_projetos
+from nucleo.renderizacao import html_para_pdf, pdf_disponivel, renderizar_relatorio
+from nucleo.repositorio import carregar_reuniao, listar_reunioes, texto_reuniao
+from nucleo.serie import resumo_serie
 
 # Configuração da página
 st.set_page_config(
@@ -26,298 +31,39 @@ st.markdown("""
 - **✅ Pontos de Ação**: Lista organizada de tarefas, responsáveis e prazos definidos
 """)
 
-# Diretório de saída
-output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "saidas")
-
-# Função para extrair informações do nome do arquivo
-def extrair_info_arquivo(filename):
-    pattern = r"(html|excel)_(.+)\.(html|xlsx)"
-    match = re.match(pattern, filename)
-    if match:
-        file_type = match.group(1)
-        meeting_name = match.group(2)
-        return {
-            "type": file_type,
-            "meeting_name": meeting_name
-        }
-    return None
-
-# Função para formatar nome do arquivo (remover html_)
-def formatar_nome_arquivo(filename):
-    if filename.startswith('html_'):
-        return filename[5:]  # Remove "html_"
-    return filename
-
-# Função para ler arquivos HTML
-def ler_html(file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        return file.read()
-
-# Função para extrair texto limpo do HTML
-def extrair_texto_html(html_content):
-    # Remover tags HTML (implementação simplificada)
-    text = re.sub(r'<.*?>', ' ', html_content)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+# Diretório de saída do projeto selecionado na barra lateral (app.py)
+output_dir = gerenciador_projetos().obter(st.session_state.get("projeto", PROJETO_PADRAO)).diretorio
+
+# Função para obter o texto da transcrição a partir da fonte canônica
+def carregar_texto_reuniao(meeting_name):
+    return texto_reuniao(carregar_reuniao(meeting_name, output_dir))
 
 # Função para configurar a API do Gemini
 def configurar_genai(api_key):
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-        return genai
-    except ImportError:
+    genai = obter_genai(api_key)
+    if genai is None:
         st.error("Biblioteca google-generativeai não instalada. Execute: pip install google-generativeai")
-        return None
+    return genai
 
-# Função para gerar relatório com Gemini
-def gerar_relatorio(model, content, report_type):
-    # Definir prompts baseados no tipo de relatório
-    prompts = {
-        "resumo": "Crie um resumo conciso da seguinte transcrição de reunião, destacando os principais pontos discutidos, decisões tomadas e próximos passos. Responda diretamente com o conteúdo, sem introduções ou explicações:",
-        "resumo_expandido": "Crie um resumo detalhado da seguinte transcrição de reunião, incluindo todos os tópicos discutidos, decisões tomadas, responsabilidades atribuídas e prazos estabelecidos. Responda diretamente com o conteúdo, sem introduções ou explicações:",
-        "insights": "Analise a seguinte transcrição de reunião e identifique insights importantes, padrões de comunicação, pontos de tensão, oportunidades de melhoria e recomendações. Responda diretamente com o conteúdo, sem introduções ou explicações:",
-        "ata": "Crie uma ata formal da seguinte reunião, incluindo data, participantes, pauta, discussões, decisões e encaminhamentos. Responda diretamente com o conteúdo, sem introduções ou explicações:",
-        "pontos_acao": "Extraia da seguinte transcrição de reunião todos os pontos de ação, tarefas atribuídas, responsáveis e prazos mencionados. Responda diretamente com o conteúdo, sem introduções ou explicações:"
-    }
-    
-    # Construir o prompt completo
-    prompt = prompts.get(report_type, prompts["resumo"])
-    full_prompt = f"{prompt}\n\nTranscrição:\n{content[:15000]}\n\nForneça uma resposta estruturada e detalhada em português, começando diretamente com o conteúdo solicitado."
-    
+# Função para gerar relatório com Gemini (cache em disco e pré-geração em nucleo/pre_geracao.py)
+def gerar_relatorio(model, content, report_type, meeting_name):
     try:
-        # Gerar resposta com o modelo Gemini
-        response = model.generate_content(full_prompt)
-        report_text = response.text
-        
-        # Remover linhas introdutórias comuns
-        lines_to_remove = [
-            "Aqui está um resumo detalhado da transcrição da reunião, estruturado conforme solicitado:",
-            "Aqui está um resumo conciso da transcrição da reunião:",
-            "Aqui está a análise da transcrição da reunião:",
-            "Aqui está a ata formal da reunião:",
-            "Aqui estão os pontos de ação extraídos da transcrição:",
-            "Com base na transcrição fornecida, aqui está o resumo:",
-            "Analisando a transcrição da reunião, identifiquei os seguintes pontos:",
-            "Segue o resumo estruturado da reunião:",
-            "Aqui está o relatório solicitado:",
-            "Com base na transcrição, aqui estão os insights:",
-            "Aqui está a ata estruturada:",
-            "Segue a análise detalhada:",
-            "Aqui estão os principais pontos identificados:",
-            "Com base na transcrição da reunião:",
-            "Aqui está o resumo estruturado:",
-            "Segue o relatório solicitado:",
-            "Aqui está a análise completa:",
-            "Com base na transcrição fornecida:",
-            "Aqui está o conteúdo estruturado:",
-            "Segue a análise da reunião:"
-        ]
-        
-        # Remover linhas introdutórias
-        for line in lines_to_remove:
-            report_text = report_text.replace(line, "").replace(line.replace(":", ""), "")
-        
-        # Limpar espaços extras e quebras de linha no início
-        report_text = report_text.strip()
-        
-        return report_text
+        report, origem = pre_gerador(output_dir).obter_relatorio(model, content, report_type, meeting_name)
+        st.session_state.current_report_origem = origem
+        return report
     except Exception as e:
         st.error(f"Erro ao gerar relatório: {e}")
         return None
 
-# Função para criar HTML formatado
+# Função para criar HTML formatado (modelo compilado e CSS compartilhado em modelos/)
+@st.cache_data(max_entries=50)
 def criar_html_formatado(report_content, report_type, meeting_name):
-    # Definir títulos baseados no tipo de relatório
-    titles = {
-        "resumo": "Resumo Conciso",
-        "resumo_expandido": "Resumo Expandido",
-        "insights": "Insights e Recomendações",
-        "ata": "Ata Formal",
-        "pontos_acao": "Pontos de Ação"
-    }
-    
-    title = titles.get(report_type, "Relatório")
-    
-    # Usar biblioteca markdown para conversão automática
-    try:
-        import markdown
-        # Configurar extensões para melhor conversão
-        md = markdown.Markdown(extensions=['extra', 'nl2br'])
-        html_content = md.convert(report_content)
-    except ImportError:
-        # Fallback simples se markdown não estiver disponível
-        html_content = f'<div style="white-space: pre-wrap;">{report_content}</div>'
-    
-    html_template = f"""
-    <!DOCTYPE html>
-    <html lang="pt-BR">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{title} - {meeting_name}</title>
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-            
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                line-height: 1.6;
-                color: #2c3e50;
-                background-color: #f8f9fa;
-                padding: 20px;
-            }}
-            
-            .container {{
-                max-width: 800px;
-                margin: 0 auto;
-                background-color: white;
-                border-radius: 12px;
-                box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-                overflow: hidden;
-            }}
-            
-            .header {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 40px 30px;
-                text-align: center;
-            }}
-            
-            .header h1 {{
-                font-size: 2.5em;
-                font-weight: 300;
-                margin-bottom: 10px;
-                letter-spacing: 1px;
-            }}
-            
-            .header .meta {{
-                font-size: 1.1em;
-                opacity: 0.9;
-                margin-top: 15px;
-            }}
-            
-            .content {{
-                padding: 40px 30px;
-                font-size: 1.1em;
-                line-height: 1.8;
-            }}
-            
-            h2 {{
-                color: #34495e;
-                font-size: 1.8em;
-                margin: 30px 0 20px 0;
-                padding-bottom: 10px;
-                border-bottom: 3px solid #3498db;
-                font-weight: 600;
-            }}
-            
-            h3 {{
-                color: #2980b9;
-                font-size: 1.4em;
-                margin: 25px 0 15px 0;
-                font-weight: 600;
-            }}
-            
-            h4 {{
-                color: #2980b9;
-                font-size: 1.2em;
-                margin: 20px 0 10px 0;
-                font-weight: 600;
-            }}
-            
-            p {{
-                margin-bottom: 20px;
-                text-align: justify;
-                color: #2c3e50;
-            }}
-            
-            ul, ol {{
-                margin: 20px 0;
-                padding-left: 30px;
-            }}
-            
-            li {{
-                margin-bottom: 12px;
-                line-height: 1.7;
-                color: #2c3e50;
-            }}
-            
-            strong {{
-                color: #2c3e50;
-                font-weight: 700;
-                background-color: #f8f9fa;
-                padding: 2px 6px;
-                border-radius: 4px;
-            }}
-            
-            em {{
-                color: #7f8c8d;
-                font-style: italic;
-                font-weight: 500;
-            }}
-            
-            .footer {{
-                background-color: #ecf0f1;
-                padding: 30px;
-                text-align: center;
-                border-top: 1px solid #ddd;
-            }}
-            
-            .footer p {{
-                margin: 5px 0;
-                color: #7f8c8d;
-                font-size: 0.95em;
-            }}
-            
-            .highlight {{
-                background-color: #fff3cd;
-                border-left: 4px solid #ffc107;
-                padding: 20px;
-                margin: 20px 0;
-                border-radius: 4px;
-            }}
-            
-            @media print {{
-                body {{
-                    background-color: white;
-                    padding: 0;
-                }}
-                .container {{
-                    box-shadow: none;
-                    border-radius: 0;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>{title}</h1>
-                <div class="meta">
-                    <div><strong>Reunião:</strong> {meeting_name}</div>
-                    <div><strong>Data de geração:</strong> {pd.Timestamp.now().strftime('%d/%m/%Y às %H:%M')}</div>
-                </div>
-            </div>
-            
-            <div class="content">
-                {html_content}
-            </div>
-            
-            <div class="footer">
-                <p><strong>Relatório gerado automaticamente</strong></p>
-                <p>Sistema de Análise de Transcrições</p>
-                <p>Sara Carolayne - Entregáveis da Consultoria</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-    
-    return html_template
+    return renderizar_relatorio(report_content, report_type, meeting_name)
+
+# Função para criar o PDF do relatório (geração local, sem serviços externos)
+@st.cache_data(max_entries=20)
+def criar_pdf(html_content):
+    return html_para_pdf(html_content)
 
 # Interface principal
 
@@ -342,9 +88,8 @@ except Exception as e:
     else:
         genai = None
 
-# Listar arquivos HTML
-html_files = [f for f in os.listdir(output_dir) if f.endswith('.html')]
-html_files.sort()
+# Listar reuniões disponíveis
+html_files = list(listar_reunioes(output_dir))
 
 # Gerador de Relatórios Rápidos
 st.markdown("---")
@@ -358,7 +103,6 @@ with col1:
     selected_file = st.selectbox(
         "Selecione a transcrição:",
         html_files,
-        format_func=formatar_nome_arquivo,
         label_visibility="collapsed"
     )
 
@@ -369,25 +113,25 @@ if 'current_report_type' not in st.session_state:
     st.session_state.current_report_type = None
 if 'current_meeting_name' not in st.session_state:
     st.session_state.current_meeting_name = None
+if 'current_report_origem' not in st.session_state:
+    st.session_state.current_report_origem = None
 
 with col2:
     # Botão Resumo Conciso
     if st.button("📝 Resumo Conciso", use_container_width=True, type="primary"):
         if selected_file and genai:
             with st.spinner("Gerando resumo conciso...", show_time=True):
-                file_path = os.path.join(output_dir, selected_file)
-                content = ler_html(file_path)
-                text_content = extrair_texto_html(content)
-                model = genai.GenerativeModel('gemini-2.5-flash')
-                report = gerar_relatorio(model, text_content, "resumo")
+                text_content = carregar_texto_reuniao(selected_file)
+                model = genai.GenerativeModel(MODELO_PADRAO)
+                report = gerar_relatorio(model, text_content, "resumo", selected_file)
                 
                 if report:
-                    file_info = extrair_info_arquivo(selected_file)
-                    meeting_name = file_info["meeting_name"] if file_info else selected_file
+                    meeting_name = selected_file
                     
                     st.session_state.current_report = report
                     st.session_state.current_report_type = "resumo"
                     st.session_state.current_meeting_name = meeting_name
+                    st.session_state.relatorios_combinados = None
                     st.rerun()
 
 with col3:
@@ -395,19 +139,17 @@ with col3:
     if st.button("📄 Resumo Expandido", use_container_width=True, type="primary"):
         if selected_file and genai:
             with st.spinner("Gerando resumo expandido...", show_time=True):
-                file_path = os.path.join(output_dir, selected_file)
-                content = ler_html(file_path)
-                text_content = extrair_texto_html(content)
-                model = genai.GenerativeModel('gemini-2.5-flash')
-                report = gerar_relatorio(model, text_content, "resumo_expandido")
+                text_content = carregar_texto_reuniao(selected_file)
+                model = genai.GenerativeModel(MODELO_PADRAO)
+                report = gerar_relatorio(model, text_content, "resumo_expandido", selected_file)
                 
                 if report:
-                    file_info = extrair_info_arquivo(selected_file)
-                    meeting_name = file_info["meeting_name"] if file_info else selected_file
+                    meeting_name = selected_file
                     
                     st.session_state.current_report = report
                     st.session_state.current_report_type = "resumo_expandido"
                     st.session_state.current_meeting_name = meeting_name
+                    st.session_state.relatorios_combinados = None
                     st.rerun()
 
 with col4:
@@ -415,19 +157,17 @@ with col4:
     if st.button("💡 Insights", use_container_width=True, type="primary"):
         if selected_file and genai:
             with st.spinner("Gerando insights...", show_time=True):
-                file_path = os.path.join(output_dir, selected_file)
-                content = ler_html(file_path)
-                text_content = extrair_texto_html(content)
-                model = genai.GenerativeModel('gemini-2.5-flash')
-                report = gerar_relatorio(model, text_content, "insights")
+                text_content = carregar_texto_reuniao(selected_file)
+                model = genai.GenerativeModel(MODELO_PADRAO)
+                report = gerar_relatorio(model, text_content, "insights", selected_file)
                 
                 if report:
-                    file_info = extrair_info_arquivo(selected_file)
-                    meeting_name = file_info["meeting_name"] if file_info else selected_file
+                    meeting_name = selected_file
                     
                     st.session_state.current_report = report
                     st.session_state.current_report_type = "insights"
                     st.session_state.current_meeting_name = meeting_name
+                    st.session_state.relatorios_combinados = None
                     st.rerun()
 
 with col5:
@@ -435,19 +175,17 @@ with col5:
     if st.button("📋 Ata Formal", use_container_width=True, type="primary"):
         if selected_file and genai:
             with st.spinner("Gerando ata formal...", show_time=True):
-                file_path = os.path.join(output_dir, selected_file)
-                content = ler_html(file_path)
-                text_content = extrair_texto_html(content)
-                model = genai.GenerativeModel('gemini-2.5-flash')
-                report = gerar_relatorio(model, text_content, "ata")
+                text_content = carregar_texto_reuniao(selected_file)
+                model = genai.GenerativeModel(MODELO_PADRAO)
+                report = gerar_relatorio(model, text_content, "ata", selected_file)
                 
                 if report:
-                    file_info = extrair_info_arquivo(selected_file)
-                    meeting_name = file_info["meeting_name"] if file_info else selected_file
+                    meeting_name = selected_file
                     
                     st.session_state.current_report = report
                     st.session_state.current_report_type = "ata"
                     st.session_state.current_meeting_name = meeting_name
+                    st.session_state.relatorios_combinados = None
                     st.rerun()
 
 with col6:
@@ -455,21 +193,140 @@ with col6:
     if st.button("✅ Pontos de Ação", use_container_width=True, type="primary"):
         if selected_file and genai:
             with st.spinner("Extraindo pontos de ação...", show_time=True):
-                file_path = os.path.join(output_dir, selected_file)
-                content = ler_html(file_path)
-                text_content = extrair_texto_html(content)
-                model = genai.GenerativeModel('gemini-2.5-flash')
-                report = gerar_relatorio(model, text_content, "pontos_acao")
+                text_content = carregar_texto_reuniao(selected_file)
+                model = genai.GenerativeModel(MODELO_PADRAO)
+                report = gerar_relatorio(model, text_content, "pontos_acao", selected_file)
                 
                 if report:
-                    file_info = extrair_info_arquivo(selected_file)
-                    meeting_name = file_info["meeting_name"] if file_info else selected_file
+                    meeting_name = selected_file
                     
                     st.session_state.current_report = report
                     st.session_state.current_report_type = "pontos_acao"
                     st.session_state.current_meeting_name = meeting_name
+                    st.session_state.relatorios_combinados = None
                     st.rerun()
 
+# Pré-geração especulativa: os tipos mais usados são gerados em segundo plano
+pre_geracao = pre_gerador(output_dir)
+with st.expander("⚡ Pré-geração em segundo plano"):
+    pre_gerar = st.toggle(
+        "Pré-gerar os relatórios mais usados ao selecionar uma reunião ou quando uma nova chegar em saidas/",
+        value=pre_geracao_ativa(),
+        key="pre_geracao",
+        disabled=not genai
+    )
+    resumo_uso = pre_geracao.resumo()
+    if pre_gerar and genai and selected_file:
+        model_pre = genai.GenerativeModel(MODELO_PADRAO)
+        agendados = pre_geracao.agendar(model_pre, selected_file, output_dir)
+        novas = pre_geracao.agendar_novas(model_pre, output_dir)
+        if agendados:
+            st.caption(f"Pré-gerando {', '.join(agendados)} de {selected_file}.")
+        if novas:
+            st.caption(f"Reuniões novas na fila: {', '.join(novas)}.")
+
+    politica = POLITICA_PRE_GERACAO
+    gasto = resumo_uso["gasto_hoje"]
+    pg_col1, pg_col2, pg_col3, pg_col4 = st.columns(4)
+    with pg_col1:
+        st.metric("Tipos pré-gerados", ", ".join(resumo_uso["tipos_pre_gerados"]) or "nenhum",
+                  help=f"Os {politica['tipos_por_reuniao']} tipos mais usados, com pelo menos "
+                       f"{politica['uso_minimo']} cliques")
+    with pg_col2:
+        taxa = resumo_uso["taxa_acertos"]
+        st.metric("Cliques atendidos pelo cache", "-" if taxa is None else f"{taxa:.0%}",
+                  help=f"{resumo_uso['acertos_pre_geracao']} vindos da pré-geração")
+    with pg_col3:
+        st.metric("Chamadas especulativas hoje", f"{gasto['chamadas']}/{politica['chamadas_por_dia']}")
+    with pg_col4:
+        st.metric("Entrada especulativa hoje", f"{gasto['caracteres'] / 1000:.0f}k/"
+                                               f"{politica['caracteres_por_dia'] / 1000:.0f}k car.")
+    if resumo_uso["usos"]:
+        st.caption("Cliques por tipo: " + ", ".join(f"{tipo} {n}" for tipo, n in resumo_uso["usos"].items()))
+    if resumo_uso["ultimo_erro"]:
+        st.caption(f"Último erro da pré-geração: {resumo_uso['ultimo_erro']}")
+
+# Vários relatórios em uma única chamada (a transcrição é enviada uma só vez)
+titulos_tipos = {
+    "resumo": "📝 Resumo Conciso",
+    "resumo_expandido": "📄 Resumo Expandido",
+    "insights": "💡 Insights e Recomendações",
+    "ata": "📋 Ata Formal",
+    "pontos_acao": "✅ Pontos de Ação"
+}
+
+if 'relatorios_combinados' not in st.session_state:
+    st.session_state.relatorios_combinados = None
+
+cb_col1, cb_col2 = st.columns([5, 1])
+with cb_col1:
+    tipos_combinados = st.multiselect(
+        "Gerar vários relatórios de uma vez:",
+        list(titulos_tipos),
+        default=list(titulos_tipos),
+        format_func=titulos_tipos.get
+    )
+with cb_col2:
+    st.markdown(" ")
+    if st.button("🧩 Gerar em uma chamada", use_container_width=True,
+                 disabled=not (genai and selected_file and tipos_combinados)):
+        with st.spinner(f"Gerando {len(tipos_combinados)} relatório(s) em uma chamada...", show_time=True):
+            text_content = carregar_texto_reuniao(selected_file)
+            model = genai.GenerativeModel(MODELO_PADRAO)
+            inicio = time.perf_counter()
+            try:
+                relatorios, _, chamadas = pre_geracao.obter_relatorios(model, text_content, tipos_combinados,
+                                                                       selected_file)
+                st.session_state.relatorios_combinados = {
+                    "reuniao": selected_file,
+                    "relatorios": relatorios,
+                    "chamadas": chamadas,
+                    "segundos": time.perf_counter() - inicio,
+                    # Caracteres enviados: uma chamada por tipo × chamada combinada
+                    "entrada_separados": sum(len(prompts.prompt_relatorio(text_content, t)) for t in tipos_combinados),
+                    "entrada_combinado": len(prompts.prompt_relatorios_combinados(text_content, tipos_combinados))
+                }
+                st.session_state.current_report = None
+                st.rerun()
+            except Exception as e:
+                st.error(f"Erro ao gerar relatórios: {e}")
+
+combinados = st.session_state.relatorios_combinados
+if combinados:
+    st.markdown("---")
+    st.markdown(f"## 🧩 Relatórios de **{combinados['reuniao']}**")
+    st.caption(f"{len(combinados['relatorios'])} relatório(s) em {combinados['chamadas']} chamada(s), "
+               f"{combinados['segundos']:.1f}s. Entrada enviada: {combinados['entrada_combinado']:,} caracteres "
+               f"(seriam {combinados['entrada_separados']:,} com uma chamada por relatório).")
+    abas = st.tabs([titulos_tipos[tipo] for tipo in combinados["relatorios"]])
+    for aba, (tipo, relatorio) in zip(abas, combinados["relatorios"].items()):
+        with aba:
+            st.markdown(relatorio)
+            html_relatorio = criar_html_formatado(relatorio, tipo, combinados["reuniao"])
+            dl_col1, dl_col2 = st.columns(2)
+            with dl_col1:
+                st.download_button(
+                    label="⬇️ Baixar Relatório (HTML)",
+                    data=html_relatorio,
+                    file_name=f"{tipo}_{combinados['reuniao']}.html",
+                    mime="text/html",
+                    use_container_width=True,
+                    key=f"html_combinado_{tipo}"
+                )
+            with dl_col2:
+                if pdf_disponivel():
+                    st.download_button(
+                        label="⬇️ Baixar Relatório (PDF)",
+                        data=criar_pdf(html_relatorio),
+                        file_name=f"{tipo}_{combinados['reuniao']}.pdf",
+                        mime="application/pdf",
+                        use_container_width=True,
+                        key=f"pdf_combinado_{tipo}"
+                    )
+                else:
+                    st.button("⬇️ PDF indisponível", disabled=True, use_container_width=True,
+                              help="Instale a biblioteca weasyprint para gerar PDF", key=f"pdf_combinado_{tipo}")
+
 # Exibir relatório fora das colunas
 if st.session_state.current_report:
     st.markdown("---")
@@ -486,6 +343,10 @@ if st.session_state.current_report:
     title = titles.get(st.session_state.current_report_type, "Relatório")
     st.markdown(f"## {title}")
     st.markdown(f"**Reunião:** {st.session_state.current_meeting_name}")
+    if st.session_state.current_report_origem == "pre_geracao":
+        st.caption("⚡ Pré-gerado em segundo plano")
+    elif st.session_state.current_report_origem:
+        st.caption("⚡ Do cache de relatórios")
     
     # Exibir o relatório
     st.markdown(st.session_state.current_report)
@@ -497,16 +358,147 @@ if st.session_state.current_report:
         st.session_state.current_meeting_name
     )
     
-    st.download_button(
-        label="⬇️ Baixar Relatório (HTML)",
-        data=html_content,
-        file_name=f"{st.session_state.current_report_type}_{st.session_state.current_meeting_name}.html",
-        mime="text/html",
-        use_container_width=True
-    )
+    download_col1, download_col2 = st.columns(2)
+    
+    with download_col1:
+        st.download_button(
+            label="⬇️ Baixar Relatório (HTML)",
+            data=html_content,
+            file_name=f"{st.session_state.current_report_type}_{st.session_state.current_meeting_name}.html",
+            mime="text/html",
+            use_container_width=True
+        )
+    
+    with download_col2:
+        if pdf_disponivel():
+            st.download_button(
+                label="⬇️ Baixar Relatório (PDF)",
+                data=criar_pdf(html_content),
+                file_name=f"{st.session_state.current_report_type}_{st.session_state.current_meeting_name}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+        else:
+            st.button("⬇️ PDF indisponível", disabled=True, use_container_width=True,
+                      help="Instale a biblioteca weasyprint para gerar PDF")
 
 elif not genai:
     st.info("Por favor, insira sua chave API do Google AI (Gemini) para gerar relatórios.")
 
 elif not selected_file:
     st.info("Selecione uma transcrição para começar.")
+
+# Visão geral da série, atualizada incorporando só as reuniões novas
+st.markdown("---")
+st.markdown("### 📚 Visão Geral da Série")
+st.markdown("*Consolidada a partir do resumo de cada reunião; uma reunião nova acrescenta só o resumo dela.*")
+
+if genai:
+    serie = resumo_serie(output_dir)
+    model_serie = genai.GenerativeModel(MODELO_PADRAO)
+    faltando, refazer = serie.pendentes(model_serie)
+    estado_serie = serie.estado(model_serie)
+    vg_col1, vg_col2 = st.columns([3, 1])
+    with vg_col1:
+        if refazer and estado_serie["reunioes"]:
+            st.info("Uma reunião já incorporada mudou ou foi removida: a visão geral será refeita a partir dos resumos.")
+        elif faltando:
+            st.info(f"{len(faltando)} reunião(ões) a incorporar: {', '.join(faltando)}")
+        else:
+            st.caption(f"Atualizada em {estado_serie['atualizado_em']} com {len(estado_serie['reunioes'])} reunião(ões).")
+    with vg_col2:
+        if st.button("🔄 Atualizar visão geral", use_container_width=True, disabled=not faltando):
+            progresso = st.progress(0.0, text="Incorporando reuniões...")
+            incorporadas = []
+            
+            def ao_incorporar(nome):
+                incorporadas.append(nome)
+                progresso.progress(len(incorporadas) / len(faltando), text=f"Incorporada: {nome}")
+            
+            try:
+                serie.atualizar(model_serie, ao_incorporar=ao_incorporar)
+                st.rerun()
+            except Exception as e:
+                st.error(f"Erro ao atualizar a visão geral: {e}")
+    
+    if estado_serie["resumo"]:
+        with st.expander("Visão geral", expanded=not faltando):
+            st.markdown(estado_serie["resumo"])
+            st.download_button(
+                label="⬇️ Baixar Visão Geral (HTML)",
+                data=criar_html_formatado(estado_serie["resumo"], "visao_geral", "Série de reuniões"),
+                file_name="visao_geral_serie.html",
+                mime="text/html",
+                use_container_width=True
+            )
+else:
+    st.caption("Configure a chave API do Gemini para consolidar a visão geral.")
+
+# Ações e decisões extraídas uma vez por reunião e guardadas no banco local
+st.markdown("---")
+st.markdown("### 🗂️ Ações e Decisões de Todas as Reuniões")
+st.markdown("*Extraídas pela IA uma única vez por reunião; as consultas abaixo são locais e instantâneas.*")
+
+pendentes = reunioes_pendentes(output_dir)
+if pendentes:
+    ex_col1, ex_col2 = st.columns([3, 1])
+    with ex_col1:
+        st.info(f"{len(pendentes)} reunião(ões) ainda sem extração (novas ou alteradas): "
+                + ", ".join(nome for nome, _, _ in pendentes))
+    with ex_col2:
+        if st.button("🔎 Extrair pendentes", use_container_width=True, disabled=not genai):
+            model = genai.GenerativeModel(MODELO_PADRAO)
+            progresso = st.progress(0.0, text="Extraindo ações e decisões...")
+            concluidas = []
+            
+            def ao_concluir(nome, erro):
+                concluidas.append(nome)
+                progresso.progress(len(concluidas) / len(pendentes), text=f"{nome}: {erro or 'ok'}")
+            
+            resultado = extrair_pendentes(model, output_dir, ao_concluir=ao_concluir)
+            for nome, erro in resultado["erros"].items():
+                st.error(f"Erro ao extrair {nome}: {erro}")
+            if resultado["extraidas"]:
+                st.rerun()
+
+ac_col1, ac_col2 = st.columns(2)
+with ac_col1:
+    filtro_pessoa = st.text_input("Responsável (nome ou parte do nome):", placeholder="Ex: Sara")
+with ac_col2:
+    filtro_status = st.selectbox("Status:", ["aberta", "concluida", "todos"],
+                                 format_func=lambda s: {"aberta": "Em aberto", "concluida": "Concluídas",
+                                                        "todos": "Todos"}[s])
+
+acoes = consultar_acoes(filtro_pessoa.strip() or None, None if filtro_status == "todos" else filtro_status,
+                        diretorio=output_dir)
+if len(acoes) > 0:
+    editadas = st.data_editor(
+        acoes,
+        column_config={
+            "id": None,
+            "reuniao": "Reunião", "acao": "Ação", "responsavel": "Responsável (como dito)",
+            "locutor": "Participante", "prazo": "Prazo", "contexto": "Contexto",
+            "status": st.column_config.SelectboxColumn("Status", options=list(STATUS_ACAO), required=True)
+        },
+        disabled=[c for c in acoes.columns if c != "status"],
+        hide_index=True,
+        use_container_width=True,
+        key="editor_acoes"
+    )
+    alteradas = editadas[editadas["status"] != acoes["status"]]
+    if len(alteradas) > 0:
+        for id_acao, status in zip(alteradas["id"], alteradas["status"]):
+            atualizar_status(id_acao, status, output_dir)
+        # As edições pendentes se referem às linhas antigas da tabela
+        st.session_state.pop("editor_acoes", None)
+        st.rerun()
+else:
+    st.caption("Nenhuma ação encontrada com esses filtros.")
+
+with st.expander("📌 Decisões registradas"):
+    decisoes = consultar_decisoes(diretorio=output_dir)
+    if len(decisoes) > 0:
+        st.dataframe(decisoes.rename(columns={"reuniao": "Reunião", "decisao": "Decisão", "contexto": "Contexto"}),
+                     use_container_width=True, hide_index=True)
+    else:
+        st.caption("Nenhuma decisão extraída ainda.")
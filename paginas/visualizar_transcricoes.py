@@ -1,6 +1,12 @@
 import streamlit as st
 import os
 import re
+from nucleo.dados import carregar_falas
+from nucleo.downloads import link_download, publicar_download
+from nucleo.exportacao import obter_exportacao
+from nucleo.intervalos import indice_intervalos, interpretar_horario
+from nucleo.projetos import PROJETO_PADRAO, gerenciador_projetos
+from nucleo.repositorio import caminho_fonte, formatar_hms, listar_reunioes, textos_falas
 
 # Configuração da página
 st.set_page_config(
@@ -13,8 +19,8 @@ st.set_page_config(
 st.title("📄 Visualizar Transcrições")
 st.markdown("### Acesse as transcrições completas das reuniões")
 
-# Diretório de saída
-output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "saidas")
+# Diretório de saída do projeto selecionado na barra lateral (app.py)
+output_dir = gerenciador_projetos().obter(st.session_state.get("projeto", PROJETO_PADRAO)).diretorio
 
 # Função para extrair informações do nome do arquivo
 def extrair_info_arquivo(filename):
@@ -40,44 +46,86 @@ def destacar_nomes(html_content):
     # Esta é uma abordagem mais conservadora para não quebrar o HTML
     return html_content
 
-# Listar arquivos HTML
-html_files = [f for f in os.listdir(output_dir) if f.endswith('.html')]
-html_files.sort()
+# Função para rolar a transcrição até uma fala e destacá-la (posição na ordem do arquivo)
+def marcar_fala(html_content, posicao):
+    script = (
+        "<script>"
+        f"const fala = document.querySelectorAll('span.timestamp')[{int(posicao)}];"
+        "if (fala) { const p = fala.closest('p') || fala.parentElement;"
+        "p.style.background = '#fff3b0'; p.scrollIntoView({block: 'center'}); }"
+        "</script>"
+    )
+    if "</body>" in html_content:
+        return html_content.replace("</body>", script + "</body>", 1)
+    return html_content + script
 
-if not html_files:
-    st.warning("📁 Nenhum arquivo HTML encontrado no diretório 'saidas'")
+# Função para mostrar quem falava em um instante ou as falas de uma janela (retorna a fala para marcar)
+def secao_horario(fonte):
+    col_de, col_ate = st.columns(2)
+    with col_de:
+        de = st.text_input("Horário (hh:mm:ss, mm:ss ou minutos):", key="horario_de")
+    with col_ate:
+        ate = st.text_input("Até (opcional, para ver uma janela):", key="horario_ate")
+    if not de.strip():
+        return None
+    try:
+        inicio = interpretar_horario(de)
+        fim = interpretar_horario(ate) if ate.strip() else None
+    except ValueError as e:
+        st.error(str(e))
+        return None
+
+    df = carregar_falas(fonte)
+    indice = indice_intervalos(fonte)
+    if fim is None:
+        falas = df.iloc[indice.no_instante(inicio)]
+        if len(falas):
+            nomes = ", ".join(dict.fromkeys(falas['locutor'].astype(str)))
+            st.success(f"🗣️ Às {formatar_hms(inicio)}: **{nomes}**")
+        else:
+            st.info(f"Ninguém estava falando às {formatar_hms(inicio)}; a transcrição vai para a fala mais próxima.")
+        return indice.mais_proxima(inicio)
+
+    inicio, fim = sorted((inicio, fim))
+    posicoes = indice.na_janela(inicio, fim)
+    falas = df.iloc[posicoes]
+    st.caption(f"{len(falas)} fala(s) entre {formatar_hms(inicio)} e {formatar_hms(fim)}")
+    if len(falas):
+        st.dataframe({
+            "Participante": falas['locutor'].astype(str).to_numpy(),
+            "Início": [formatar_hms(v) for v in falas['inicio']],
+            "Fim": [formatar_hms(v) for v in falas['fim']],
+            "Fala": textos_falas(falas).to_numpy()
+        }, use_container_width=True, hide_index=True)
+        return int(posicoes.min())
+    return indice.mais_proxima(inicio)
+
+# Listar reuniões (o HTML é gerado a partir da planilha quando não existe em saidas/)
+reunioes = listar_reunioes(output_dir)
+
+if not reunioes:
+    st.warning("📁 Nenhuma transcrição encontrada no diretório 'saidas'")
 else:
     # Duas colunas no início
     col1, col2 = st.columns([2, 1])
     
     with col1:
         # Seleção de arquivo
-        selected_file = st.selectbox(
+        selected_meeting = st.selectbox(
             "Selecione uma transcrição:",
-            html_files,
-            format_func=lambda x: extrair_info_arquivo(x)["meeting_name"] if extrair_info_arquivo(x) else x,
+            list(reunioes),
             label_visibility="collapsed"
         )
+        file_path = obter_exportacao(selected_meeting, "html", output_dir) if selected_meeting else None
+        selected_file = os.path.basename(file_path) if file_path else None
     
     with col2:
         if selected_file:
-            file_path = os.path.join(output_dir, selected_file)
-            
-            # Botão para baixar o arquivo
-            with open(file_path, 'r', encoding='utf-8') as file:
-                file_content = file.read()
-                
-            st.download_button(
-                label="⬇️ Baixar",
-                data=file_content,
-                file_name=selected_file,
-                mime="text/html",
-                use_container_width=True
-            )
+            # Link para baixar o arquivo (servido de static/, sem passar pela sessão)
+            url = publicar_download(file_path, chave=f"{output_dir}:{selected_meeting}:html")
+            st.markdown(link_download(url, selected_file), unsafe_allow_html=True)
     
     if selected_file:
-        file_path = os.path.join(output_dir, selected_file)
-        
         # Extrair informações do nome do arquivo
         file_info = extrair_info_arquivo(selected_file)
         if file_info:
@@ -93,18 +141,20 @@ else:
         # Destacar nomes em azul escuro e negrito
         processed_content = destacar_nomes(file_content)
         
+        # Ir para um horário: o índice de intervalos da reunião localiza as falas
+        with st.expander("⏱️ Ir para um horário"):
+            posicao = secao_horario(caminho_fonte(reunioes[selected_meeting]))
+        if posicao is not None:
+            processed_content = marcar_fala(processed_content, posicao)
+        
         # Sempre mostrar HTML renderizado
         st.components.v1.html(processed_content, height=600, scrolling=True)
 
 # Lista de arquivos disponíveis
 st.sidebar.markdown("### 📁 Transcrições Disponíveis")
 
-if html_files:
-    for file in html_files:
-        file_info = extrair_info_arquivo(file)
-        if file_info:
-            st.sidebar.markdown(f"• **{file_info['meeting_name']}**")
-        else:
-            st.sidebar.markdown(f"• {file}")
+if reunioes:
+    for meeting_name in reunioes:
+        st.sidebar.markdown(f"• **{meeting_name}**")
 else:
     st.sidebar.warning("Nenhum arquivo encontrado")